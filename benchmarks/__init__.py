@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of EventGhost.
+# Copyright © 2005-2019 EventGhost Project <http://www.eventghost.org/>
+#
+# EventGhost is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 2 of the License, or (at your option)
+# any later version.
+#
+# EventGhost is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with EventGhost. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This file is part of the **pyWinMCERemote**
+project https://github.com/kdschlosser/pyWinMCERemote
+
+:platform: any
+:license: GPL version 2 or newer
+:synopsis: benchmarks
+
+.. moduleauthor:: Kevin Schlosser @kdschlosser <kevin.g.schlosser@gmail.com>
+
+None of the benchmarks need a device attached. Run them from the root of
+the source tree::
+
+    python -m benchmarks.import_time
+
+:mod:`benchmarks.suite` times the whole receive path and checks it
+against a stored baseline::
+
+    python -m benchmarks.suite --save
+    python -m benchmarks.suite
+"""
@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of EventGhost.
+# Copyright © 2005-2019 EventGhost Project <http://www.eventghost.org/>
+#
+# EventGhost is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 2 of the License, or (at your option)
+# any later version.
+#
+# EventGhost is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with EventGhost. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This file is part of the **pyWinMCERemote**
+project https://github.com/kdschlosser/pyWinMCERemote
+
+:platform: any
+:license: GPL version 2 or newer
+:synopsis: batch.clean_codes benchmark
+
+.. moduleauthor:: Kevin Schlosser @kdschlosser <kevin.g.schlosser@gmail.com>
+
+Cleans a packed buffer of frames with and without numpy, checks the two
+agree and reports frames per second.
+"""
+
+from __future__ import print_function
+
+import sys
+import time
+import array
+import random
+
+from pyWinMCERemote import batch
+from .clean_code import build_vectors
+
+
+def main(frame_count=20000):
+    rnd = random.Random(0)
+    vectors = build_vectors(rnd)
+
+    timings = array.array('i')
+    offsets = array.array('l', [0])
+
+    for i in range(frame_count):
+        timings.extend(vectors[i % len(vectors)])
+        offsets.append(len(timings))
+
+    print('{0} frames, {1} timings'.format(frame_count, len(timings)))
+
+    start = time.time()
+    expected = batch.clean_codes(timings, offsets, use_numpy=False)
+    duration = time.time() - start
+    print('python: {0:10.0f} frames/sec'.format(frame_count / duration))
+
+    if batch.numpy is None:
+        print('numpy:  not installed')
+        return 0
+
+    start = time.time()
+    result = batch.clean_codes(timings, offsets, use_numpy=True)
+    duration = time.time() - start
+    print('numpy:  {0:10.0f} frames/sec'.format(frame_count / duration))
+
+    if result.tolist() != expected.tolist():
+        print('FAILED: numpy and python results differ')
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of EventGhost.
+# Copyright © 2005-2019 EventGhost Project <http://www.eventghost.org/>
+#
+# EventGhost is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 2 of the License, or (at your option)
+# any later version.
+#
+# EventGhost is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with EventGhost. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This file is part of the **pyWinMCERemote**
+project https://github.com/kdschlosser/pyWinMCERemote
+
+:platform: any
+:license: GPL version 2 or newer
+:synopsis: decode cache hit rate and speed benchmark
+
+.. moduleauthor:: Kevin Schlosser @kdschlosser <kevin.g.schlosser@gmail.com>
+
+Replays RC6, NEC and Sony held button streams the way a receiver hands them over, every
+timing sampled to 50us with a few microseconds of jitter. Decodes them
+with and without a DecodeCache, checks the names (held frames included)
+are the same and reports the hit rate and the time per frame.
+"""
+
+from __future__ import print_function
+
+import sys
+import timeit
+import random
+
+from pyWinMCERemote import decoder
+from pyWinMCERemote import hold
+from pyWinMCERemote import pronto
+from .hold import FakeClock, nec_frame, sony_frame, NEC_REPEAT
+
+
+def sample(code, rnd, resolution=50, jitter=10):
+    res = []
+    for timing in code:
+        timing += rnd.randint(-jitter, jitter)
+        res.append(int(round(float(timing) / resolution)) * resolution)
+
+    return res
+
+
+def mce_frame(command):
+    code = pronto.pronto_rc6a_to_ir(
+        [0x6001, 0x73, 0, 2, decoder.MCE_CODE, command >> 8, command & 0xFF, 0],
+        0
+    )[1]
+    # the RC6A encoder uses a 7 half bit leader, MCE remotes send 6
+    code[0] = decoder.HEADER_MARK
+    return code
+
+
+def build_stream(rnd):
+    # (delay in seconds, timings) pairs for 6 buttons on 3 remotes, each
+    # one pressed 10 times and held for 9 frames
+    buttons = [
+        (mce_frame(0x800F), None, 0.12),
+        (mce_frame(0x8010), None, 0.12),
+        (nec_frame(0x04, 0x08), NEC_REPEAT, 0.108),
+        (nec_frame(0x04, 0x09), NEC_REPEAT, 0.108),
+        (sony_frame(0x01, 0x15), None, 0.045),
+        (sony_frame(0x01, 0x16), None, 0.045)
+    ]
+    stream = []
+
+    for _ in range(10):
+        for frame, repeat, period in buttons:
+            stream.append((1.0, sample(frame, rnd)))
+            for _ in range(9):
+                stream.append((period, sample(repeat or frame, rnd)))
+
+    return stream
+
+
+def run(stream, cache=None):
+    res = []
+    clock = FakeClock()
+    tracker = hold.HoldTracker(clock)
+
+    for delay, code in stream:
+        clock.now += delay
+        res.append(str(decoder.decode(0, code, tracker=tracker, cache=cache)))
+
+    return res
+
+
+def main():
+    stream = build_stream(random.Random(0))
+
+    expected = run(stream)
+    cache = decoder.DecodeCache()
+    result = run(stream, cache)
+
+    mismatches = sum(1 for a, b in zip(expected, result) if a != b)
+
+    print('{0} frames, {1} mismatches'.format(len(stream), mismatches))
+    print(
+        'hit rate: {0:.1%} ({1} hits, {2} misses, {3} entries)'.format(
+            cache.hit_rate,
+            cache.hits,
+            cache.misses,
+            len(cache)
+        )
+    )
+
+    number = 20
+    uncached = min(timeit.repeat(
+        lambda: run(stream),
+        number=number,
+        repeat=3
+    )) / (number * len(stream))
+
+    # warm cache, the way it is after the first few presses
+    cached = min(timeit.repeat(
+        lambda: run(stream, cache),
+        number=number,
+        repeat=3
+    )) / (number * len(stream))
+
+    print('uncached: {0:8.1f} us/frame'.format(uncached * 1000000))
+    print('cached:   {0:8.1f} us/frame'.format(cached * 1000000))
+    print('speedup: {0:.1f}x'.format(uncached / cached))
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of EventGhost.
+# Copyright © 2005-2019 EventGhost Project <http://www.eventghost.org/>
+#
+# EventGhost is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 2 of the License, or (at your option)
+# any later version.
+#
+# EventGhost is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with EventGhost. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This file is part of the **pyWinMCERemote**
+project https://github.com/kdschlosser/pyWinMCERemote
+
+:platform: any
+:license: GPL version 2 or newer
+:synopsis: utils.clean_code benchmark
+
+.. moduleauthor:: Kevin Schlosser @kdschlosser <kevin.g.schlosser@gmail.com>
+
+Checks that utils.clean_code gives the same result as the old clustering
+for RC5, RC6 and RC6A frames with up to 30us of jitter and then times both
+of them as the frame length grows.
+"""
+
+from __future__ import print_function
+
+import sys
+import timeit
+import random
+
+from pyWinMCERemote import pronto
+from pyWinMCERemote import utils
+from . import legacy
+
+
+THRESHOLD = 12.0
+
+
+def jitter(code, amount, rnd):
+    res = []
+    for timing in code:
+        offset = rnd.randint(-amount, amount)
+        if timing < 0:
+            res.append(timing - offset)
+        else:
+            res.append(timing + offset)
+    return res
+
+
+def build_vectors(rnd, max_jitter=30):
+    vectors = []
+
+    for system in range(0, 32, 3):
+        for command in range(0, 128, 7):
+            vectors.append(
+                pronto.pronto_rc5_to_ir([0x5000, 0x73, 0, 1, system, command])[1]
+            )
+            vectors.append(
+                pronto.pronto_rc6_to_ir([0x6000, 0x73, 0, 1, system, command], 0)[1]
+            )
+            vectors.append(
+                pronto.pronto_rc6a_to_ir(
+                    [0x6001, 0x73, 0, 2, 0x800F, system, command, 0],
+                    0
+                )[1]
+            )
+
+    return [
+        jitter(vector, amount, rnd)
+        for vector in vectors
+        for amount in range(0, max_jitter + 1, 10)
+    ]
+
+
+def check(vectors):
+    mismatches = 0
+
+    for vector in vectors:
+        expected = legacy.clean_code(vector, THRESHOLD)
+        if utils.clean_code(vector, THRESHOLD) != expected:
+            mismatches += 1
+
+    return mismatches
+
+
+def main():
+    rnd = random.Random(0)
+    vectors = build_vectors(rnd)
+
+    mismatches = check(vectors)
+    print('{0} vectors, {1} mismatches'.format(len(vectors), mismatches))
+
+    frame = pronto.pronto_rc6a_to_ir([0x6001, 0x73, 0, 2, 0x800F, 4, 0x0C, 0], 0)[1]
+
+    print()
+    print('{0:>8} {1:>12} {2:>12} {3:>8}'.format('timings', 'legacy us', 'new us', 'speedup'))
+
+    for count in (1, 2, 4, 8, 16):
+        code = jitter(frame * count, 30, rnd)
+        number = max(1, 400 // count)
+
+        old = min(timeit.repeat(
+            lambda: legacy.clean_code(code, THRESHOLD),
+            number=number,
+            repeat=3
+        )) / number
+        new = min(timeit.repeat(
+            lambda: utils.clean_code(code, THRESHOLD),
+            number=number,
+            repeat=3
+        )) / number
+
+        print('{0:>8} {1:>12.1f} {2:>12.1f} {3:>7.1f}x'.format(
+            len(code),
+            old * 1000000,
+            new * 1000000,
+            old / new
+        ))
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
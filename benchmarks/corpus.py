@@ -0,0 +1,121 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of EventGhost.
+# Copyright © 2005-2019 EventGhost Project <http://www.eventghost.org/>
+#
+# EventGhost is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 2 of the License, or (at your option)
+# any later version.
+#
+# EventGhost is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with EventGhost. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This file is part of the **pyWinMCERemote**
+project https://github.com/kdschlosser/pyWinMCERemote
+
+:platform: any
+:license: GPL version 2 or newer
+:synopsis: synthetic benchmark corpus
+
+.. moduleauthor:: Kevin Schlosser @kdschlosser <kevin.g.schlosser@gmail.com>
+
+Frames made with the pronto RC5, RC6 and RC6A encoders, with jitter added
+to every timing and, if asked for, the odd glitch a receiver picks up. The
+same seed always gives the same corpus.
+"""
+
+import random
+
+from pyWinMCERemote import pronto
+
+
+def build_templates():
+    """
+    Returns ``(kind, frequency, timings)`` for every encoded frame.
+    """
+    templates = []
+
+    for system in range(0, 32, 3):
+        for command in range(0, 128, 7):
+            templates.append(
+                ('rc5',) +
+                pronto.pronto_rc5_to_ir([0x5000, 0x73, 0, 1, system, command])
+            )
+            templates.append(
+                ('rc6',) +
+                pronto.pronto_rc6_to_ir(
+                    [0x6000, 0x73, 0, 1, system, command],
+                    0
+                )
+            )
+            templates.append(
+                ('rc6a',) +
+                pronto.pronto_rc6a_to_ir(
+                    [0x6001, 0x73, 0, 2, 0x800F, system, command, 0],
+                    0
+                )
+            )
+
+    return templates
+
+
+def add_jitter(code, amount, rnd):
+    res = []
+    for timing in code:
+        offset = rnd.randint(-amount, amount)
+        if timing < 0:
+            res.append(timing - offset)
+        else:
+            res.append(timing + offset)
+
+    return res
+
+
+def add_glitch(code, rnd):
+    # splits a timing in two with a short pulse of the other kind, the
+    # way a fluorescent light or a weak signal shows up
+    candidates = [i for i, timing in enumerate(code) if abs(timing) > 400]
+    if not candidates:
+        return code
+
+    i = rnd.choice(candidates)
+    timing = code[i]
+    glitch = rnd.randint(50, 150)
+    sign = 1 if timing > 0 else -1
+    first = rnd.randint(100, abs(timing) - glitch - 100)
+
+    return (
+        code[:i] +
+        [sign * first, -sign * glitch, timing - (sign * (first + glitch))] +
+        code[i + 1:]
+    )
+
+
+def build_corpus(count=2000, seed=0, jitter=30, noise=0.0):
+    """
+    Returns a list of ``(kind, frequency, timings)``.
+
+    `jitter` is the most a timing is off in microseconds and `noise` the
+    fraction of frames that get a glitch.
+    """
+    rnd = random.Random(seed)
+    templates = build_templates()
+    corpus = []
+
+    for _ in range(count):
+        kind, frequency, code = rnd.choice(templates)
+        code = add_jitter(code, jitter, rnd)
+
+        if noise and rnd.random() < noise:
+            code = add_glitch(code, rnd)
+
+        corpus.append((kind, frequency, code))
+
+    return corpus
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of EventGhost.
+# Copyright © 2005-2019 EventGhost Project <http://www.eventghost.org/>
+#
+# EventGhost is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 2 of the License, or (at your option)
+# any later version.
+#
+# EventGhost is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with EventGhost. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This file is part of the **pyWinMCERemote**
+project https://github.com/kdschlosser/pyWinMCERemote
+
+:platform: any
+:license: GPL version 2 or newer
+:synopsis: RC5 and RC6 pronto encoder benchmark
+
+.. moduleauthor:: Kevin Schlosser @kdschlosser <kevin.g.schlosser@gmail.com>
+
+Encodes RC5, RC5X, RC6 and RC6A pronto codes with the old string based
+encoders and the current ones, checks the timings are the same when the
+code is sent once and reports the time per code.
+"""
+
+from __future__ import print_function
+
+import sys
+import timeit
+
+from pyWinMCERemote import pronto
+from . import legacy
+
+
+def build_codes():
+    codes = []
+
+    for system in range(0, 32, 3):
+        for command in range(0, 128, 5):
+            codes.append(('rc5', [0x5000, 0x73, 0, 1, system, command]))
+            codes.append(
+                ('rc5x', [0x5001, 0x73, 0, 2, system, command, command ^ 0x2A])
+            )
+            codes.append(('rc6', [0x6000, 0x73, 0, 1, system * 8, command * 2]))
+
+            for customer in (system * 4, 0x800F, 0x8000 | (system * 1000)):
+                codes.append(
+                    (
+                        'rc6a',
+                        [0x6001, 0x73, 0, 2, customer, system * 8, command * 2, 0]
+                    )
+                )
+
+    return codes
+
+
+ENCODERS = {
+    'rc5': (legacy.pronto_rc5_to_ir, pronto.pronto_rc5_to_ir),
+    'rc5x': (legacy.pronto_rc5x_to_ir, pronto.pronto_rc5x_to_ir),
+    'rc6': (legacy.pronto_rc6_to_ir, pronto.pronto_rc6_to_ir),
+    'rc6a': (legacy.pronto_rc6a_to_ir, pronto.pronto_rc6a_to_ir),
+}
+
+
+def main():
+    codes = build_codes()
+    mismatches = 0
+
+    for kind, pronto_data in codes:
+        old, new = ENCODERS[kind]
+        freq, timings = new(pronto_data, 0)
+        if (freq, list(timings)) != old(pronto_data, 0):
+            mismatches += 1
+
+    print('{0} codes, {1} mismatches'.format(len(codes), mismatches))
+    print()
+    print('{0:6s} {1:>10s} {2:>10s} {3:>8s}'.format(
+        '', 'legacy us', 'new us', 'speedup'
+    ))
+
+    number = 20
+    for kind in sorted(ENCODERS):
+        old, new = ENCODERS[kind]
+        items = [pronto_data for k, pronto_data in codes if k == kind]
+
+        times = [
+            min(timeit.repeat(
+                lambda: [func(pronto_data, 0) for pronto_data in items],
+                number=number,
+                repeat=3
+            )) / (number * len(items))
+            for func in (old, new)
+        ]
+
+        print('{0:6s} {1:10.1f} {2:10.1f} {3:7.1f}x'.format(
+            kind,
+            times[0] * 1000000,
+            times[1] * 1000000,
+            times[0] / times[1]
+        ))
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of EventGhost.
+# Copyright © 2005-2019 EventGhost Project <http://www.eventghost.org/>
+#
+# EventGhost is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 2 of the License, or (at your option)
+# any later version.
+#
+# EventGhost is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with EventGhost. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This file is part of the **pyWinMCERemote**
+project https://github.com/kdschlosser/pyWinMCERemote
+
+:platform: any
+:license: GPL version 2 or newer
+:synopsis: per frame memory benchmark
+
+.. moduleauthor:: Kevin Schlosser @kdschlosser <kevin.g.schlosser@gmail.com>
+
+Measures with tracemalloc what decoding an MCE remote frame allocates,
+for the old RC6IRCode (list copies and CodeWrapper) and for
+decoder.decode. Reports the memory every kept result holds on to and the
+peak while decoding.
+"""
+
+from __future__ import print_function
+
+import sys
+import random
+import tracemalloc
+
+from pyWinMCERemote import decoder
+from pyWinMCERemote import hold
+from . import legacy
+from .rc6 import build_frames
+
+
+def measure(func, frames):
+    # the results are kept, the way a callback queue holds on to them
+    tracemalloc.start()
+    start = tracemalloc.take_snapshot()
+
+    results = [func(code) for code in frames]
+
+    end = tracemalloc.take_snapshot()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    stats = end.compare_to(start, 'filename')
+    size = sum(stat.size_diff for stat in stats)
+    count = sum(stat.count_diff for stat in stats)
+
+    del results
+    return float(size) / len(frames), float(count) / len(frames), peak
+
+
+def main():
+    frames = build_frames(random.Random(0))
+    # only the frames the old decoder can decode
+    frames = [code for code in frames if (len(code) - 3) // 2 in (31, 32)]
+    tracker = hold.HoldTracker()
+
+    def old(code):
+        legacy.RC6IRCode.lastCode = None
+        return legacy.RC6IRCode(code[:])
+
+    def new(code):
+        tracker.reset()
+        return decoder.decode(0, code[:], tracker=tracker)
+
+    for name, func in (('legacy', old), ('new', new)):
+        # the first decode builds the decoder index and the lookup tables,
+        # that is not memory a frame holds on to
+        func(frames[0])
+
+        size, count, peak = measure(func, frames)
+        print(
+            '{0:8s} kept: {1:8.0f} bytes {2:6.1f} blocks per frame, '
+            'peak: {3} bytes'.format(name, size, count, peak)
+        )
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of EventGhost.
+# Copyright © 2005-2019 EventGhost Project <http://www.eventghost.org/>
+#
+# EventGhost is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 2 of the License, or (at your option)
+# any later version.
+#
+# EventGhost is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with EventGhost. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This file is part of the **pyWinMCERemote**
+project https://github.com/kdschlosser/pyWinMCERemote
+
+:platform: any
+:license: GPL version 2 or newer
+:synopsis: held button tracking benchmark
+
+.. moduleauthor:: Kevin Schlosser @kdschlosser <kevin.g.schlosser@gmail.com>
+
+Replays NEC and Sony held button streams from two remotes at the same
+time, each through its own HoldTracker driven by a fake clock. Checks the
+presses, held frames and dropped frames come out the same every run and
+reports the time per frame.
+"""
+
+from __future__ import print_function
+
+import sys
+import timeit
+
+from pyWinMCERemote import decoder
+from pyWinMCERemote import hold
+
+
+class FakeClock(object):
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def nec_frame(address, command):
+    value = (
+        address |
+        ((address ^ 0xFF) << 8) |
+        (command << 16) |
+        ((command ^ 0xFF) << 24)
+    )
+    code = [9000, -4500]
+
+    for i in range(32):
+        code.append(562)
+        code.append(-1687 if (value >> i) & 1 else -562)
+
+    code.extend([562, -40000])
+    return code
+
+
+def sony_frame(device, command):
+    value = command | (device << 7)
+    code = [2400, -600]
+
+    for i in range(12):
+        code.append(1200 if (value >> i) & 1 else 600)
+        code.append(-600)
+
+    code[-1] = -20000
+    return code
+
+
+NEC_REPEAT = [9000, -2250, 562, -96000]
+
+
+def build_stream(frame, period, held, presses):
+    # (delay in seconds, timings) pairs, the button is pressed `presses`
+    # times and held for `held` frames each time
+    stream = []
+
+    for _ in range(presses):
+        stream.append((1.0, frame[0]))
+        for _ in range(held):
+            stream.append((period, frame[1]))
+
+    return stream
+
+
+def run(streams):
+    res = []
+    clocks = [FakeClock() for _ in streams]
+    trackers = [hold.HoldTracker(clock) for clock in clocks]
+
+    # frames of both streams interleaved, the way two receivers would
+    # hand them to a shared decode worker
+    for items in zip(*streams):
+        for clock, tracker, (delay, code) in zip(clocks, trackers, items):
+            clock.now += delay
+            res.append(str(decoder.decode(0, code, tracker=tracker)))
+
+    return res
+
+
+def main():
+    nec = nec_frame(0x04, 0x08)
+    sony = sony_frame(0x01, 0x15)
+
+    streams = [
+        build_stream((nec, NEC_REPEAT), 0.108, 9, 20),
+        build_stream((sony, sony), 0.045, 9, 20)
+    ]
+
+    res = run(streams)
+    counts = {}
+    for name in res:
+        counts[name] = counts.get(name, 0) + 1
+
+    expected = {
+        'NEC.04.08': 20,
+        'NEC.04.08.Held': 180,
+        'Sony12.01.15': 20,
+        'Sony12.01.15.Held': 140,
+        'None': 40
+    }
+
+    for name in sorted(counts):
+        print('{0:20s} {1}'.format(name, counts[name]))
+
+    mismatches = 0
+    if counts != expected:
+        print('expected', expected)
+        mismatches = 1
+
+    if run(streams) != res:
+        print('second run gave different results')
+        mismatches = 1
+
+    number = 20
+    duration = min(timeit.repeat(
+        lambda: run(streams),
+        number=number,
+        repeat=3
+    )) / (number * len(res))
+
+    print('decode: {0:8.1f} us/frame'.format(duration * 1000000))
+
+    return mismatches
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,113 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of EventGhost.
+# Copyright © 2005-2019 EventGhost Project <http://www.eventghost.org/>
+#
+# EventGhost is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 2 of the License, or (at your option)
+# any later version.
+#
+# EventGhost is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with EventGhost. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This file is part of the **pyWinMCERemote**
+project https://github.com/kdschlosser/pyWinMCERemote
+
+:platform: any
+:license: GPL version 2 or newer
+:synopsis: import time of the codec layer
+
+.. moduleauthor:: Kevin Schlosser @kdschlosser <kevin.g.schlosser@gmail.com>
+
+Imports the codec modules in a fresh interpreter a number of times and
+reports how long it took. The run fails if the import pulled in ctypes or
+any part of the device layer.
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import json
+import subprocess
+
+
+BASE_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CODEC_MODULES = (
+    'pyWinMCERemote',
+    'pyWinMCERemote.decoder',
+    'pyWinMCERemote.pronto',
+    'pyWinMCERemote.utils',
+)
+
+FORBIDDEN_MODULES = (
+    'ctypes',
+    'pyWinMCERemote.ioctl',
+    'pyWinMCERemote.setupapi_h',
+    'pyWinMCERemote.synchapi_h',
+    'pyWinMCERemote.irclass_ioctl_h',
+)
+
+SCRIPT = '''
+import sys
+import json
+import time
+
+start = time.time()
+{imports}
+duration = time.time() - start
+
+print(json.dumps(dict(
+    duration=duration,
+    loaded=[name for name in {forbidden!r} if name in sys.modules]
+)))
+'''
+
+
+def measure(modules=CODEC_MODULES, runs=20):
+    script = SCRIPT.format(
+        imports='\n'.join('import ' + name for name in modules),
+        forbidden=FORBIDDEN_MODULES
+    )
+
+    durations = []
+    loaded = set()
+
+    for _ in range(runs):
+        output = subprocess.check_output(
+            [sys.executable, '-c', script],
+            cwd=BASE_PATH
+        )
+        result = json.loads(output.decode('utf-8'))
+        durations.append(result['duration'])
+        loaded.update(result['loaded'])
+
+    durations.sort()
+    return durations, sorted(loaded)
+
+
+def main():
+    durations, loaded = measure()
+
+    print('codec import, {0} runs'.format(len(durations)))
+    print('  min:    {0:8.3f} ms'.format(durations[0] * 1000))
+    print('  median: {0:8.3f} ms'.format(durations[len(durations) // 2] * 1000))
+    print('  max:    {0:8.3f} ms'.format(durations[-1] * 1000))
+
+    if loaded:
+        print('FAILED: importing the codec layer loaded', ', '.join(loaded))
+        return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of EventGhost.
+# Copyright © 2005-2019 EventGhost Project <http://www.eventghost.org/>
+#
+# EventGhost is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 2 of the License, or (at your option)
+# any later version.
+#
+# EventGhost is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with EventGhost. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This file is part of the **pyWinMCERemote**
+project https://github.com/kdschlosser/pyWinMCERemote
+
+:platform: any
+:license: GPL version 2 or newer
+:synopsis: IrCode name benchmark
+
+.. moduleauthor:: Kevin Schlosser @kdschlosser <kevin.g.schlosser@gmail.com>
+
+Names unknown codes of growing length with the old IrCode, the new one in
+legacy mode (checking the names are the same) and the new one with the
+default fingerprint. Every code gets str() called on it a few times, the
+way logging and event dispatch do.
+"""
+
+from __future__ import print_function
+
+import sys
+import timeit
+import random
+
+from pyWinMCERemote import decoder
+from pyWinMCERemote import utils
+from . import legacy
+
+
+CALLS = 4
+
+
+def build_code(rnd, length):
+    code = []
+
+    for i in range(length):
+        timing = rnd.choice((450, 900, 1350, 2250))
+        if i % 2:
+            timing = -timing
+
+        code.append(timing)
+
+    return utils.clean_code(code, decoder.TIMING_TOLERANCE)
+
+
+def run(factory, codes):
+    for code in codes:
+        ir_code = factory(code)
+
+        for _ in range(CALLS):
+            str(ir_code)
+
+
+def main():
+    rnd = random.Random(0)
+    mismatches = 0
+
+    for length in (25, 50, 100, 200, 400):
+        codes = [build_code(rnd, length) for _ in range(50)]
+
+        for code in codes:
+            if str(legacy.IrCode(code)) != str(decoder.IrCode(code, legacy=True)):
+                mismatches += 1
+
+        results = []
+        for factory in (
+            legacy.IrCode,
+            lambda c: decoder.IrCode(c, legacy=True),
+            decoder.IrCode
+        ):
+            duration = min(timeit.repeat(
+                lambda: run(factory, codes),
+                number=10,
+                repeat=3
+            )) / (10 * len(codes))
+            results.append(duration * 1000000)
+
+        print(
+            '{0:4d} timings  old: {1:8.1f} us  legacy mode: {2:8.1f} us  '
+            'fingerprint: {3:8.1f} us'.format(length, *results)
+        )
+
+    print('{0} mismatches'.format(mismatches))
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,848 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of EventGhost.
+# Copyright © 2005-2019 EventGhost Project <http://www.eventghost.org/>
+#
+# EventGhost is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 2 of the License, or (at your option)
+# any later version.
+#
+# EventGhost is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with EventGhost. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This file is part of the **pyWinMCERemote**
+project https://github.com/kdschlosser/pyWinMCERemote
+
+:platform: any
+:license: GPL version 2 or newer
+:synopsis: reference copies of replaced code
+
+.. moduleauthor:: Kevin Schlosser @kdschlosser <kevin.g.schlosser@gmail.com>
+
+The implementations the library used before the current ones. They are
+only kept here so the benchmarks have something to compare against and to
+check the new code produces the same output.
+
+The only changes made to them are the ones needed to run on Python 3:
+integer division in RC6IRCode.GetSample, time.clock (removed in Python
+3.8), CodeWrapper.__getitem__ which recursed on slices and the str the
+packed timings were added to in round_and_pack_timings. IrCode only
+takes timings, the pronto conversion has been left out. The RC5 and RC6
+pronto encoders are the string based ones, with the toggle bit worked out
+from repeat_count.
+"""
+
+import math
+import time
+import struct
+
+from pyWinMCERemote import pronto
+
+from pyWinMCERemote.decoder import (
+    DecodeError,
+    RepeatExpired,
+    MCE_CODE,
+    MCE_COMMANDS,
+    XBOX360_COMMANDS,
+    COMMANDS,
+    TIMING_TOLERANCE,
+    HEADER_MARK,
+    HEADER_SPACE,
+    LOGICAL_0_MARK,
+    LOGICAL_0_SPACE,
+    LOGICAL_1_MARK,
+    LOGICAL_1_SPACE,
+    TRAILER_LOGIC_0_MARK,
+    TRAILER_LOGIC_0_SPACE,
+    TRAILER_LOGIC_1_MARK,
+    TRAILER_LOGIC_1_SPACE
+)
+
+_clock = getattr(time, 'clock', time.time)
+
+
+def clean_code(ir_code, threshold):
+    low_threshold = 1.0 - (threshold / 100.0)
+    high_threshold = 1.0 + (threshold / 100.0)
+    marks = []
+    spaces = []
+    cleaned_code = []
+
+    for timing in ir_code:
+        if timing < 0:
+            for space in spaces:
+                avg = sum(space) / len(space)
+
+                low = int(avg * high_threshold)
+                high = int(avg * low_threshold)
+                if low <= timing <= high:
+                    space += [timing]
+                    break
+            else:
+                spaces += [[timing]]
+        else:
+            for mark in marks:
+                avg = sum(mark) / len(mark)
+
+                high = int(avg * high_threshold)
+                low = int(avg * low_threshold)
+
+                if low <= timing <= high:
+                    mark += [timing]
+                    break
+            else:
+                marks += [[timing]]
+                
+    marks2 = []
+    spaces2 = []
+
+    # double check the groups for any possible straglers
+    while marks:
+        mark = marks.pop(0)
+        avg_mark = sum(mark) / len(mark)
+        for m in marks:
+            avg = sum(m) / len(m)
+            high = int(avg * high_threshold)
+            low = int(avg * low_threshold)
+            if low <= avg_mark <= high:
+                m.extend(mark[:])
+                break
+        else:
+            for m in marks2:
+                avg = sum(m) / len(m)
+                high = int(avg * high_threshold)
+                low = int(avg * low_threshold)
+
+                if low <= avg_mark <= high:
+
+                    m.extend(mark[:])
+                    break
+            else:
+                marks2 += [mark[:]]
+
+    while spaces:
+        space = spaces.pop(0)
+        avg_space = sum(space) / len(space)
+        for s in spaces:
+            avg = sum(s) / len(s)
+            high = int(avg * high_threshold)
+            low = int(avg * low_threshold)
+
+            if low <= avg_space <= high:
+                s.extend(space[:])
+                break
+        else:
+            for s in spaces2:
+                avg = sum(s) / len(s)
+                high = int(avg * high_threshold)
+                low = int(avg * low_threshold)
+
+                if low <= avg_space <= high:
+                    s.extend(space[:])
+                    break
+            else:
+                spaces2 += [space[:]]
+
+    del marks[:]
+    del spaces[:]
+
+    # normalize the marks and spaces to a 50us tolerance
+    for mark in marks2:
+        mark = sum(mark) / len(mark)
+
+        dif = mark % 50
+
+        # print dif, mark
+        if dif < 25:
+            dif = -dif
+        else:
+            dif = 50 - dif
+
+        mark += dif
+        marks += [mark]
+
+    for space in spaces2:
+        space = sum(space) / len(space)
+
+        dif = space % 50
+
+        if dif > 25:
+            dif = 50 - dif
+        else:
+            dif = -dif
+
+        space += dif
+        spaces += [space]
+
+    for timing in ir_code:
+        for mark in marks:
+            low = int(mark * low_threshold)
+            high = int(mark * high_threshold)
+            if low <= timing <= high:
+                cleaned_code += [mark]
+                break
+        else:
+            for space in spaces:
+                high = int(space * low_threshold)
+                low = int(space * high_threshold)
+                if low <= timing <= high:
+                    cleaned_code += [space]
+                    break
+            else:
+                cleaned_code += [timing]
+
+    return cleaned_code
+
+
+class CodeWrapper(list):
+
+    @property
+    def header(self):
+        return self[0], self[1]
+
+    @header.setter
+    def header(self, value):
+        mark, space = value
+        self[0] = mark
+        self[1] = space
+
+    @property
+    def header_mark(self):
+        return self[0]
+
+    @header_mark.setter
+    def header_mark(self, value):
+        self[0] = value
+
+    @property
+    def header_space(self):
+        return self[1]
+
+    @header_space.setter
+    def header_space(self, value):
+        self[1] = value
+
+    @property
+    def footer(self):
+        return self[-2:]
+
+    @property
+    def footer_space(self):
+        return self[-1]
+
+    @property
+    def footer_mark(self):
+        return self[-2]
+
+    @footer_mark.setter
+    def footer_mark(self, value):
+        self[len(self) - 2] = value
+
+    @property
+    def bits(self):
+        code = self[2:-2]
+        pairs = [[code[i], code[i + 1]] for i in range(0, len(code), 2)]
+        return len(pairs)
+
+    def get_burst_pair(self, index):
+        # trim off the header and the footer value
+        code = self[2:-2]
+        pairs = [[code[i], code[i + 1]] for i in range(0, len(code), 2)]
+
+        try:
+            mark, space = pairs[index]
+        except IndexError:
+            raise IndexError('Invalid burst pair')
+
+        return mark, space
+
+    def set_burst_pair(self, index, mark, space):
+        index = (index * 2) + 2
+        self[index] = mark
+        self[index + 1] = space
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return CodeWrapper(list.__getitem__(self, item))
+
+        return list.__getitem__(self, item)
+
+
+class RC6IRCode(object):
+    """
+    IR decoder for the Philips RC-6 protocol.
+    """
+
+    lastCode = None
+    lastTime = 0
+
+    def __init__(self, code):
+
+        self.timeout = 130
+        self.halfBitTime = 444
+        self.pos = 0
+        self.data = None
+        self.bitState = 0
+        self.bufferLen = 0
+        self.frequency = 36000
+        self.rlc_code = code[:]
+        self.code = CodeWrapper(code[:])
+        self._decoded = self._decode()
+
+        # try:
+        #     self.code = normalize_raw_code(code)
+        # except ValueError:
+        #     raise DecodeError('Invalid Code')
+
+    @property
+    def pronto(self):
+        return pronto.ir_to_pronto_raw(self.frequency, self.rlc_code)
+
+    @property
+    def is_button_held(self):
+        if RC6IRCode.lastCode is None:
+            return False
+
+        return (_clock() - RC6IRCode.lastTime) * 1000 < self.timeout
+
+    def __str__(self):
+        return self._decoded
+
+    def _decode(self):
+        code = self.code
+
+        # we have to subtract off the start, mode and trailer bits
+        if code.bits not in (31, 32):
+            raise DecodeError('Incorrect number of bits')
+
+        data = list(abs(item) for item in code)
+
+        self.SetData(data, 2)
+
+        # Get the start bit
+        if self.GetBit() != 1:
+            raise DecodeError("missing start bit")
+
+        mode = self.GetBitsLsbLast(3)
+        trailerBit = self.GetTrailerBit()
+
+        # Check for MCE remote
+        if mode == 6:
+            device = self.GetBitsLsbLast(16)
+            command = self.GetBitsLsbLast(16)
+
+            if device == MCE_CODE:
+                if command & 0x7FFF != command:
+                    trailerBit = 1
+                    command &= 0x7FFF
+                else:
+                    trailerBit = 0
+
+                if command in MCE_COMMANDS:
+                    device = 'MCE.'
+                    decoded = MCE_COMMANDS[command]
+                elif command in XBOX360_COMMANDS:
+                    device = 'XBox360.'
+                    decoded = XBOX360_COMMANDS[command]
+                else:
+                    device = 'MCE.'
+                    decoded = '%04X' % (command,)
+            else:
+                decoded = '%04X.%04X' % (device, command)
+                device = 'RC6.06.'
+
+            decoded = device + decoded
+
+        else:
+            device = self.GetBitsLsbLast(8)
+            command = self.GetBitsLsbLast(8)
+
+            decoded = '%02X.' % (device,)
+            if command in COMMANDS:
+                decoded += COMMANDS[command]
+            else:
+                decoded += '%02X.' % (command,)
+
+            if mode != 0:
+                decoded = '%02X.'.format(mode) + decoded
+
+        if trailerBit == 1:
+            if RC6IRCode.lastCode is None:
+                RC6IRCode.lastTime = _clock()
+                RC6IRCode.lastCode = decoded
+            elif RC6IRCode.lastCode == decoded:
+                if (_clock() - RC6IRCode.lastTime) * 1000 < self.timeout:
+                    RC6IRCode.lastTime = _clock()
+                    decoded += '.Held'
+                else:
+                    RC6IRCode.lastTime = 0
+                    RC6IRCode.lastCode = None
+                    raise RepeatExpired()
+            else:
+                RC6IRCode.lastTime = _clock()
+                RC6IRCode.lastCode = decoded
+
+        else:
+            RC6IRCode.lastCode = None
+            RC6IRCode.lastTime = 0
+
+        return decoded
+
+    def GetTrailerBit(self):
+        sample = (
+                self.GetSample() * 8 +
+                self.GetSample() * 4 +
+                self.GetSample() * 2 +
+                self.GetSample()
+        )
+        if sample == 3:  # binary 0011
+            return 0
+        elif sample == 12:  # binary 1100
+            return 1
+        else:
+            raise DecodeError("wrong trailer bit transition")
+
+    def GetBit(self):
+        sample = self.GetSample() * 2 + self.GetSample()
+        if sample == 1:  # binary 01
+            return 0
+        elif sample == 2:  # binary 10
+            return 1
+        else:
+            raise DecodeError("wrong bit transition")
+
+    def GetBitsLsbFirst(self, numBits=8):
+        """
+        Returns numBits count manchester bits with LSB last order.
+        """
+        data = 0
+        mask = 1
+        for dummyCounter in range(numBits):
+            data |= mask * self.GetBit()
+            mask <<= 1
+        return data
+
+    def GetBitsLsbLast(self, numBits=8):
+        """
+        Returns numBits count manchester bits with LSB last order.
+        """
+        data = 0
+        for dummyCounter in range(numBits):
+            data <<= 1
+            data |= self.GetBit()
+        return data
+
+    def GetSample(self):
+        if self.bufferLen == 0:
+            if self.pos >= len(self.data):
+                raise DecodeError("not enough timings")
+            self.bufferLen = (
+                    (self.data[self.pos] + 2 * self.halfBitTime // 3) // self.halfBitTime
+            )
+            if self.bufferLen == 0:
+                raise DecodeError("duration too short")
+            self.pos += 1
+            self.bitState = self.pos % 2
+        self.bufferLen -= 1
+        return self.bitState
+
+    def SetData(self, data, pos=0):
+        self.data = data
+        self.pos = pos
+        self.bufferLen = 0
+        self.bitState = 0
+
+
+class IrCode(object):
+    """
+    IR decoder for unknown protocols.
+    """
+
+    def __init__(self, code, frequency=0):
+        self.diffTime = 3.0
+        self.rlc_code = code[:]
+        self.code = CodeWrapper(code[:])
+        self.frequency = frequency
+
+    def __str__(self):
+        # print data
+        lastPause = 0
+        lastPulse = 0
+        code = 0
+        mask = 1
+        for i, x in enumerate(self.code):
+            if i % 2:
+                diff = max(self.diffTime, lastPause * 0.2)
+                if -diff < x - lastPause < diff:
+                    code |= mask
+                lastPause = x
+            else:
+                diff = max(self.diffTime, lastPulse * 0.2)
+                if -diff < x - lastPulse < diff:
+                    code |= mask
+                lastPulse = x
+            mask <<= 1
+        code |= mask
+
+        return "Unknown.%X" % code
+
+
+def TIMING_MATCH(value, expected_timing_value):
+    high = math.floor(expected_timing_value + ((expected_timing_value * TIMING_TOLERANCE) / 100.0))
+    low = math.floor(expected_timing_value - ((expected_timing_value * TIMING_TOLERANCE) / 100.0))
+
+    # do a flip flop of the high and low so the same expression can
+    # be used when evaluating a raw timing
+    if expected_timing_value < 0:
+        low, high = high, low
+
+    return low <= value <= high
+
+
+def normalize_raw_code(code):
+    code = CodeWrapper(code[:])
+
+    if TIMING_MATCH(code.header_mark, HEADER_MARK):
+        code.header_mark = HEADER_MARK
+    else:
+        raise ValueError('Invalid header mark')
+
+    if TIMING_MATCH(code.header_space, HEADER_SPACE):
+        code.header_space = HEADER_SPACE
+    else:
+        raise ValueError('Invalid header space')
+
+    if code.footer_space >= -HEADER_MARK:
+        raise ValueError('Invalid footer space')
+
+    for i in range(code.bits):
+        mark, space = code.get_burst_pair(i)
+
+        if (
+                TIMING_MATCH(mark, LOGICAL_0_MARK) and
+                TIMING_MATCH(space, LOGICAL_0_SPACE)
+        ):
+            code.set_burst_pair(i, LOGICAL_0_MARK, LOGICAL_0_SPACE)
+
+        elif (
+                TIMING_MATCH(mark, LOGICAL_1_MARK) and
+                TIMING_MATCH(space, LOGICAL_1_SPACE)
+        ):
+            code.set_burst_pair(i, LOGICAL_1_MARK, LOGICAL_1_SPACE)
+
+        elif (
+                TIMING_MATCH(mark, TRAILER_LOGIC_0_MARK) and
+                TIMING_MATCH(space, TRAILER_LOGIC_0_SPACE)
+        ):
+            code.set_burst_pair(i, TRAILER_LOGIC_0_MARK, TRAILER_LOGIC_0_SPACE)
+
+        elif (
+                TIMING_MATCH(mark, TRAILER_LOGIC_1_MARK) and
+                TIMING_MATCH(space, TRAILER_LOGIC_1_SPACE)
+        ):
+            code.set_burst_pair(i, TRAILER_LOGIC_1_MARK, TRAILER_LOGIC_1_SPACE)
+
+        else:
+            raise ValueError('Invalid code')
+
+    return code
+
+
+def ir_to_pronto_raw(freq, data):
+    if freq <= 0:
+        freq = 36000
+
+    pronto_carrier = int(1000000 / (freq * pronto.pronto_clock))
+    carrier = pronto_carrier * pronto.pronto_clock
+
+    pronto_data = [0x0000, pronto_carrier, 0x0000, 0x0000]
+
+    for val in data:
+        duration = abs(val)
+        pronto_data.append(round(duration / carrier))
+
+    if len(pronto_data) % 2 != 0:
+        pronto_data.append(pronto.SignalFree)
+
+    pronto_data[3] = (len(pronto_data) - 4) / 2
+
+    out = '%04X' % int(pronto_data[0])
+
+    for v in pronto_data[1:]:
+        out += ' %04X' % int(v)
+
+    return out
+
+
+def pronto_to_mce(pronto_code, repeat_count=0):
+    pronto_data = list(int(v, 16) for v in pronto_code.split(" "))
+    try:
+        handler = handlers[pronto_data[0]]
+    except:
+        raise Exception(
+            "Don't have a decoder for pronto format %s" % hex(pronto_data[0])[2:].upper()
+        )
+
+    freq, timings = handler(pronto_data, repeat_count)
+
+    return freq, timings
+
+
+def encode_bits(data, start, stop, s_false, s_true):
+    out = ""
+
+    for i in range(start, stop - 1, -1):
+        if data & (1 << i) > 0:
+            out = out + s_true
+        else:
+            out = out + s_false
+
+    return out
+
+
+def zero_one_sequences(String, Delay):
+    final_data = []
+    ind = 0
+    n = len(String)
+
+    while True:
+        countUp = 0
+        countDown = 0
+        while ind < n and String[ind] == "0":
+            ind += 1
+
+        while ind < n and String[ind] == "1":
+            countUp += 1
+            ind += 1
+
+        while ind < n and String[ind] == "0":
+            countDown += 1
+            ind += 1
+
+        final_data.extend([Delay * countUp, -Delay * countDown])
+
+        if ind >= n:
+            break
+
+    if final_data[-1] == 0:
+        final_data[-1] = -10000
+    else:
+        final_data[-1] -= 10000
+
+    return final_data
+
+
+def pronto_rc5_to_ir(pronto_data, repeat_count=0):
+    if len(pronto_data) != 6 or pronto_data[0] != 0x5000:  # CodeType RC5
+        raise Exception("Invalid RC5 data %s" % str(pronto_data))
+
+    pronto_carrier = pronto_data[1]
+    if pronto_carrier == 0x0000:
+        pronto_carrier = int(1000000 / (36000 * pronto.pronto_clock))
+
+    rc5_string = ''
+
+    for j in range(repeat_count + 1):
+        toggle = repeat_count % 2 == 0
+        if pronto_data[5] > 63:
+            rc5_string += encode_bits(2, 1, 0, '10', '01')
+        else:
+            rc5_string += encode_bits(3, 1, 0, '10', '01')
+        if toggle:
+            rc5_string += encode_bits(1, 0, 0, '10', '01')
+        else:
+            rc5_string += encode_bits(0, 0, 0, '10', '01')
+
+        rc5_string += encode_bits(pronto_data[4], 4, 0, '10', '01')
+        rc5_string += encode_bits(pronto_data[5], 5, 0, '10', '01')
+
+    final_data = zero_one_sequences(rc5_string, 900)
+
+    freq = int(1000000 / (pronto_carrier * pronto.pronto_clock))
+    return freq, final_data
+
+
+def pronto_rc5x_to_ir(pronto_data, repeat_count):
+    if not (
+            len(pronto_data) == 7 or
+            (len(pronto_data) == 8 and pronto_data[7] == 0x0000)
+    ) or pronto_data[0] != 0x5001:  # CodeType RC5X
+
+        raise Exception("Invalid RC5X data %s" % str(pronto_data))
+
+    pronto_carrier = pronto_data[1]
+    if pronto_carrier == 0x0000:
+        pronto_carrier = int(1000000 / (36000 * pronto.pronto_clock))
+
+    if pronto_data[2] + pronto_data[3] != 2:
+        raise Exception("Invalid RC5X data %s" % str(pronto_data))
+
+    rc5x_string = ''
+
+    for j in range(repeat_count + 1):
+        toggle = repeat_count % 2 == 0
+        if pronto_data[5] > 63:
+            rc5x_string += encode_bits(2, 1, 0, '10', '01')
+        else:
+            rc5x_string += encode_bits(3, 1, 0, '10', '01')
+        if toggle:
+            rc5x_string += encode_bits(1, 0, 0, '10', '01')
+        else:
+            rc5x_string += encode_bits(0, 0, 0, '10', '01')
+            
+        rc5x_string += encode_bits(pronto_data[4], 4, 0, '10', '01')
+        rc5x_string += '0000'
+        rc5x_string += encode_bits(pronto_data[5], 5, 0, '10', '01')
+        rc5x_string += encode_bits(pronto_data[6], 5, 0, '10', '01')
+
+    final_data = zero_one_sequences(rc5x_string, 900)
+
+    freq = int(1000000 / (pronto_carrier * pronto.pronto_clock))
+    return freq, final_data
+
+
+def pronto_rc6_to_ir(pronto_data, repeat_count):
+    if len(pronto_data) != 6 or pronto_data[0] != 0x6000:  # CodeType RC6
+        raise Exception("Invalid RC6 data %s" % str(pronto_data))
+
+    pronto_carrier = pronto_data[1]
+    if pronto_carrier == 0x0000:
+        pronto_carrier = int(1000000 / (36000 * pronto.pronto_clock))
+
+    if pronto_data[2] + pronto_data[3] != 1:
+        raise Exception("Invalid RC6 data %s" % str(pronto_data))
+
+    rc6_string = ""
+    for j in range(repeat_count + 1):
+        toggle = repeat_count % 2 == 0
+        rc6_string += '1111110010010101'
+        if toggle:
+            rc6_string += '1100'
+        else:
+            rc6_string += '0011'
+            
+        rc6_string += encode_bits(pronto_data[4], 7, 0, '01', '10')
+        rc6_string += encode_bits(pronto_data[5], 7, 0, '01', '10')
+
+    final_data = zero_one_sequences(rc6_string, 450)
+
+    freq = int(1000000 / (pronto_carrier * pronto.pronto_clock))
+    return freq, final_data
+
+
+def pronto_rc6a_to_ir(pronto_data, repeat_count):
+    if len(pronto_data) != 8 or pronto_data[0] != 0x6001:  # CodeType RC6A
+        raise Exception("Invalid RC6A data %s" % str(pronto_data))
+
+    pronto_carrier = pronto_data[1]
+    if pronto_carrier == 0x0000:
+        pronto_carrier = int(1000000 / (36000 * pronto.pronto_clock))
+
+    if pronto_data[2] + pronto_data[3] != 2:
+        raise Exception("Invalid RC6A data %s" % str(pronto_data))
+
+    rc6a_string = ""
+    for j in range(repeat_count + 1):
+        toggle = repeat_count % 2 == 0
+        rc6a_string += '11111110010101001'
+        if toggle:
+            rc6a_string += '1100'
+        else:
+            rc6a_string += '0011'
+            
+        if pronto_data[4] > 127:
+            rc6a_string += encode_bits(1, 0, 0, '01', '10')
+            rc6a_string += encode_bits(pronto_data[4], 14, 0, '01', '10')
+        else:
+            rc6a_string += encode_bits(0, 0, 0, '01', '10')
+            rc6a_string += encode_bits(pronto_data[4], 6, 0, '01', '10')
+        rc6a_string += encode_bits(pronto_data[5], 7, 0, '01', '10')
+        rc6a_string += encode_bits(pronto_data[6], 7, 0, '01', '10')
+
+    final_data = zero_one_sequences(rc6a_string, 450)
+
+    freq = int(1000000 / (pronto_carrier * pronto.pronto_clock))
+    return freq, final_data
+
+
+def pronto_raw_to_ir(pronto_data, repeat_count):  # repeat_count is ignored for Raw
+    if len(pronto_data) < 6 or pronto_data[0] not in (0x0000, 0x0100):
+        raise Exception("Invalid Raw data %s" % str(pronto_data))
+
+    pronto_carrier = pronto_data[1]
+    if pronto_carrier == 0:
+        pronto_carrier = int(1000000 / (36000 * pronto.pronto_clock))
+
+    pw = pronto_carrier * pronto.pronto_clock
+    firstSeq = 2 * pronto_data[2]
+    repeatSeq = 2 * pronto_data[3]
+    pulse = True
+    repeatCount = 0
+    start = 4
+    done = False
+    index = start
+    sequence = firstSeq
+
+    if firstSeq == 0:
+        if repeatSeq == 0:
+            return None
+
+        sequence = repeatSeq
+        repeatCount = 1
+
+    timingData = []
+    while not done:
+        time = int(pronto_data[index] * pw)
+
+        if pulse:
+            timingData.append(time)
+        else:
+            timingData.append(-time)
+        index += 1
+        pulse = not pulse
+
+        if index == start + sequence:
+            if repeatCount == 0:
+                if repeatSeq != 0:
+                    start += firstSeq
+                    sequence = repeatSeq
+                    index = start
+                    pulse = True
+                    repeatCount += 1
+                else:
+                    done = True
+            elif repeatCount == 1:
+                done = True
+            else:
+                index = start
+                pulse = True
+                repeatCount += 1
+
+    freq = int(1000000 / (pronto_carrier * pronto.pronto_clock))
+    return freq, timingData
+
+
+handlers = {
+    0x0: pronto_raw_to_ir,
+    0x0100: pronto_raw_to_ir,
+    0x5000: pronto_rc5_to_ir,
+    0x5001: pronto_rc5x_to_ir,
+    0x6000: pronto_rc6_to_ir,
+    0x6001: pronto_rc6a_to_ir,
+}
+
+
+def round_and_pack_timings(timing_data):
+    out = b""
+    for v in timing_data:
+        newVal = 50 * int(round(v / 50))
+        out += struct.pack("i", newVal)
+
+    return out
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of EventGhost.
+# Copyright © 2005-2019 EventGhost Project <http://www.eventghost.org/>
+#
+# EventGhost is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 2 of the License, or (at your option)
+# any later version.
+#
+# EventGhost is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with EventGhost. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This file is part of the **pyWinMCERemote**
+project https://github.com/kdschlosser/pyWinMCERemote
+
+:platform: any
+:license: GPL version 2 or newer
+:synopsis: learned code library lookup benchmark
+
+.. moduleauthor:: Kevin Schlosser @kdschlosser <kevin.g.schlosser@gmail.com>
+
+Fills a CodeLibrary with random learned pulse distance codes, then looks
+up fresh captures of them (sampled to 50us with jitter) with the library
+and with a linear scan of every learned code. Checks both find the same
+codes, at 10us jitter up to the 80us a worn remote or a poor receiver
+gives, and reports the time per lookup as the library grows.
+"""
+
+from __future__ import print_function
+
+import sys
+import timeit
+import random
+
+from pyWinMCERemote import library
+from .cache import sample
+
+HEADERS = ((9000, -4500), (4500, -4500), (3456, -1728), (2400, -600))
+
+JITTERS = (10, 40, 80)
+
+# jitter of the captures the lookups are timed with
+TIMING_JITTER = 40
+
+
+def random_code(rnd):
+    header = rnd.choice(HEADERS)
+    num_bits = rnd.choice((16, 24, 32, 48))
+    code = list(header)
+
+    for _ in range(num_bits):
+        code.append(562)
+        code.append(rnd.choice((-562, -1687)))
+
+    code.extend([562, -40000])
+    return code, rnd.choice((36000, 38000, 40000))
+
+
+def linear_find(lib, learned, code, frequency):
+    # what matching against a library looked like before, one code at a
+    # time
+    timings, frequency = library._get_timings(code, frequency)
+    best = None
+    best_distance = -1
+
+    for learned_timings, learned_frequency, value, _ in learned:
+        if len(learned_timings) != len(timings):
+            continue
+        if abs(learned_frequency - frequency) > lib.frequency_tolerance:
+            continue
+
+        distance = lib.get_distance(timings, learned_timings)
+        if distance != -1 and (best_distance == -1 or distance < best_distance):
+            best = value
+            best_distance = distance
+
+    return best
+
+
+def fill(rnd, size, jitter):
+    lib = library.CodeLibrary()
+    learned = []
+    codes = []
+
+    for i in range(size):
+        code, frequency = random_code(rnd)
+        learned_code = sample(code, rnd, jitter=jitter)
+        lib.add(learned_code, i, frequency)
+        learned.append(
+            library._get_timings(learned_code, frequency) + (i, i)
+        )
+        codes.append((code, frequency, i))
+
+    return lib, learned, codes
+
+
+def main():
+    rnd = random.Random(0)
+    mismatches = 0
+
+    for jitter in JITTERS:
+        lib, learned, codes = fill(rnd, 2500, jitter)
+
+        found = 0
+        exhaustive = 0
+        for code, frequency, i in rnd.sample(codes, 500):
+            code = sample(code, rnd, jitter=jitter)
+            value = lib.find(code, frequency)
+
+            if value != linear_find(lib, learned, code, frequency):
+                mismatches += 1
+            if value == i:
+                found += 1
+            if lib.find(code, frequency, exhaustive=True) == i:
+                exhaustive += 1
+
+        print(
+            '+-{0:2d} us jitter  found: {1}/500  exhaustive: {2}/500'.format(
+                jitter,
+                found,
+                exhaustive
+            )
+        )
+
+    for size in (250, 2500, 25000):
+        lib, learned, codes = fill(rnd, size, TIMING_JITTER)
+
+        queries = [
+            (sample(code, rnd, jitter=TIMING_JITTER), frequency, i)
+            for code, frequency, i in rnd.sample(codes, 200)
+        ]
+
+        found = 0
+        for code, frequency, i in queries:
+            value = lib.find(code, frequency)
+            if value != linear_find(lib, learned, code, frequency):
+                mismatches += 1
+            if value == i:
+                found += 1
+
+        number = 3
+        linear = min(timeit.repeat(
+            lambda: [linear_find(lib, learned, c, f) for c, f, _ in queries],
+            number=number,
+            repeat=3
+        )) / (number * len(queries))
+
+        indexed = min(timeit.repeat(
+            lambda: [lib.find(c, f) for c, f, _ in queries],
+            number=number,
+            repeat=3
+        )) / (number * len(queries))
+
+        print(
+            '{0:6d} codes  found: {1}/{2}  linear: {3:9.1f} us  '
+            'index: {4:7.1f} us'.format(
+                size,
+                found,
+                len(queries),
+                linear * 1000000,
+                indexed * 1000000
+            )
+        )
+
+    print('{0} mismatches'.format(mismatches))
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of EventGhost.
+# Copyright © 2005-2019 EventGhost Project <http://www.eventghost.org/>
+#
+# EventGhost is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 2 of the License, or (at your option)
+# any later version.
+#
+# EventGhost is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with EventGhost. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This file is part of the **pyWinMCERemote**
+project https://github.com/kdschlosser/pyWinMCERemote
+
+:platform: any
+:license: GPL version 2 or newer
+:synopsis: normalize_raw_code benchmark
+
+.. moduleauthor:: Kevin Schlosser @kdschlosser <kevin.g.schlosser@gmail.com>
+
+Normalizes jittered RC6 burst pair frames with the current
+normalize_raw_code and the old one, checks they agree (including which frames get rejected)
+and reports the time per frame.
+"""
+
+from __future__ import print_function
+
+import sys
+import timeit
+import random
+
+from pyWinMCERemote import decoder
+from . import legacy
+from .clean_code import jitter
+
+
+def build_frames(rnd):
+    frames = []
+
+    for _ in range(50):
+        code = [decoder.HEADER_MARK, decoder.HEADER_SPACE]
+
+        for _ in range(32):
+            if rnd.randint(0, 1):
+                code.extend([decoder.LOGICAL_1_MARK, decoder.LOGICAL_1_SPACE])
+            else:
+                code.extend([decoder.LOGICAL_0_MARK, decoder.LOGICAL_0_SPACE])
+
+        code.extend([decoder.LOGICAL_0_MARK, -10000])
+
+        # the larger amounts push timings out of the windows
+        for amount in (0, 25, 50, 75):
+            frames.append(jitter(code, amount, rnd))
+
+    return frames
+
+
+def run(func, frames):
+    res = []
+
+    for code in frames:
+        try:
+            res.append(list(func(code)))
+        except ValueError:
+            res.append(None)
+
+    return res
+
+
+def main():
+    frames = build_frames(random.Random(0))
+
+    expected = run(legacy.normalize_raw_code, frames)
+    result = run(decoder.normalize_raw_code, frames)
+    mismatches = sum(1 for a, b in zip(expected, result) if a != b)
+
+    print('{0} frames, {1} normalized, {2} mismatches'.format(
+        len(frames),
+        len([item for item in result if item is not None]),
+        mismatches
+    ))
+
+    number = 10
+    old = min(timeit.repeat(
+        lambda: run(legacy.normalize_raw_code, frames),
+        number=number,
+        repeat=3
+    )) / (number * len(frames))
+    new = min(timeit.repeat(
+        lambda: run(decoder.normalize_raw_code, frames),
+        number=number,
+        repeat=3
+    )) / (number * len(frames))
+
+    print('legacy: {0:8.1f} us/frame'.format(old * 1000000))
+    print('new:    {0:8.1f} us/frame'.format(new * 1000000))
+    print('speedup: {0:.1f}x'.format(old / new))
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
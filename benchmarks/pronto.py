@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of EventGhost.
+# Copyright © 2005-2019 EventGhost Project <http://www.eventghost.org/>
+#
+# EventGhost is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 2 of the License, or (at your option)
+# any later version.
+#
+# EventGhost is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with EventGhost. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This file is part of the **pyWinMCERemote**
+project https://github.com/kdschlosser/pyWinMCERemote
+
+:platform: any
+:license: GPL version 2 or newer
+:synopsis: pronto codec benchmark
+
+.. moduleauthor:: Kevin Schlosser @kdschlosser <kevin.g.schlosser@gmail.com>
+
+Converts the frames of the benchmark corpus to pronto and back with the
+old functions and the current ones, checks they give the same results and
+times them. The cold column is every code converted once on an empty
+cache, taking turns with the old functions. The cached column is a
+library of codes converted over and over.
+"""
+
+from __future__ import print_function
+
+import sys
+import timeit
+
+from pyWinMCERemote import pronto
+from . import legacy
+from .corpus import build_corpus
+
+
+def time_it(func, items, number=5):
+    return min(timeit.repeat(
+        lambda: [func(*item) for item in items],
+        number=number,
+        repeat=3
+    )) / (number * len(items))
+
+
+def time_cold(old, new, items, repeat=15):
+    """
+    Times the old and the new function on a cold cache.
+
+    The items are all different and the cache is emptied before every run
+    (outside of the timing), so every call is a cache miss. The two take
+    turns so they both see the same machine.
+    """
+    timers = [
+        timeit.Timer(
+            lambda func=func: [func(*item) for item in items],
+            setup=pronto.clear_cache
+        )
+        for func in (old, new)
+    ]
+    times = [[], []]
+
+    for _ in range(repeat):
+        for i, timer in enumerate(timers):
+            times[i].append(timer.timeit(number=1))
+
+    return [min(values) / len(items) for values in times]
+
+
+def main():
+    # a library of 300 codes, every one converted 10 times
+    codes = [(f, code) for _, f, code in build_corpus(300, jitter=30)]
+    encode_items = codes * 10
+
+    strings = [legacy.ir_to_pronto_raw(f, code) for f, code in codes]
+    decode_items = [(s,) for s in strings] * 10
+
+    mismatches = 0
+
+    pronto.clear_cache()
+    for (f, code), expected in zip(codes, strings):
+        if pronto.ir_to_pronto_raw(f, code) != expected:
+            mismatches += 1
+        if pronto.pronto_to_mce(expected) != legacy.pronto_to_mce(expected):
+            mismatches += 1
+
+    # long frames, where the string concatenation hurts
+    long_code = codes[0][1] * 20
+    if pronto.ir_to_pronto_raw(36000, long_code) != legacy.ir_to_pronto_raw(36000, long_code):
+        mismatches += 1
+
+    print('{0} codes, {1} mismatches'.format(len(codes), mismatches))
+    print()
+
+    # different lengths of the long frame, so they are all cache misses
+    long_items = [(36000, long_code[:-i or None]) for i in range(50)]
+
+    rows = [
+        (
+            'to pronto',
+            time_cold(legacy.ir_to_pronto_raw, pronto.ir_to_pronto_raw, codes),
+            time_it(pronto.ir_to_pronto_raw, encode_items)
+        ),
+        (
+            'to timings',
+            time_cold(
+                legacy.pronto_to_mce,
+                pronto.pronto_to_mce,
+                [(s,) for s in strings]
+            ),
+            time_it(pronto.pronto_to_mce, decode_items)
+        ),
+        (
+            'long frame',
+            time_cold(legacy.ir_to_pronto_raw, pronto.ir_to_pronto_raw, long_items),
+            time_it(pronto.ir_to_pronto_raw, long_items, 20)
+        ),
+    ]
+
+    print('{0:12s} {1:>10s} {2:>10s} {3:>10s}'.format(
+        '', 'legacy us', 'cold us', 'cached us'
+    ))
+    for name, (old, new), cached in rows:
+        print('{0:12s} {1:10.1f} {2:10.1f} {3:10.1f}'.format(
+            name,
+            old * 1000000,
+            new * 1000000,
+            cached * 1000000
+        ))
+
+    pronto.clear_cache()
+    for item in encode_items:
+        pronto.ir_to_pronto_raw(*item)
+    for item in decode_items:
+        pronto.pronto_to_mce(*item)
+
+    print()
+    print('cache hit rate: {0:.1%} to timings, {1:.1%} to pronto'.format(
+        pronto.to_ir_cache.hit_rate,
+        pronto.to_pronto_cache.hit_rate
+    ))
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
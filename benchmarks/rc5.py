@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of EventGhost.
+# Copyright © 2005-2019 EventGhost Project <http://www.eventghost.org/>
+#
+# EventGhost is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 2 of the License, or (at your option)
+# any later version.
+#
+# EventGhost is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with EventGhost. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This file is part of the **pyWinMCERemote**
+project https://github.com/kdschlosser/pyWinMCERemote
+
+:platform: any
+:license: GPL version 2 or newer
+:synopsis: RC5/RC5X round trip benchmark
+
+.. moduleauthor:: Kevin Schlosser @kdschlosser <kevin.g.schlosser@gmail.com>
+
+Encodes every RC5 and a spread of RC5X codes through the pronto handlers,
+adds jitter, decodes them back with decoder.decode and checks the fields
+come back unchanged. Reports the decode throughput.
+"""
+
+from __future__ import print_function
+
+import sys
+import timeit
+import random
+
+from pyWinMCERemote import decoder
+from pyWinMCERemote import hold
+from pyWinMCERemote import pronto
+from .clean_code import jitter
+
+
+def build_frames(rnd):
+    frames = []
+
+    for system in range(32):
+        for command in range(128):
+            code = '5000 0073 0000 0001 %04X %04X' % (system, command)
+            frequency, timings = pronto.pronto_to_mce(code)
+            frames.append(
+                ((system, command, None), frequency, jitter(timings, 60, rnd))
+            )
+
+            if command % 9 == 0:
+                data = (system + command) & 0x3F
+                code = '5001 0073 0000 0002 %04X %04X %04X' % (system, command, data)
+                frequency, timings = pronto.pronto_to_mce(code)
+                frames.append(
+                    ((system, command, data), frequency, jitter(timings, 60, rnd))
+                )
+
+    return frames
+
+
+def run(frames):
+    res = []
+    tracker = hold.HoldTracker()
+
+    for _, frequency, code in frames:
+        tracker.reset()
+        res.append(decoder.decode(frequency, code, tracker=tracker))
+
+    return res
+
+
+def main():
+    frames = build_frames(random.Random(0))
+
+    mismatches = 0
+    for (expected, _, _), ir_code in zip(frames, run(frames)):
+        if not isinstance(ir_code, decoder.RC5IRCode):
+            mismatches += 1
+        elif (ir_code.system, ir_code.command, ir_code.data) != expected:
+            mismatches += 1
+
+    print('{0} frames, {1} mismatches'.format(len(frames), mismatches))
+
+    number = 5
+    duration = min(timeit.repeat(
+        lambda: run(frames),
+        number=number,
+        repeat=3
+    )) / (number * len(frames))
+
+    print('decode: {0:8.1f} us/frame'.format(duration * 1000000))
+    print('        {0:8.0f} frames/sec'.format(1 / duration))
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
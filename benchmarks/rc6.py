@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of EventGhost.
+# Copyright © 2005-2019 EventGhost Project <http://www.eventghost.org/>
+#
+# EventGhost is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 2 of the License, or (at your option)
+# any later version.
+#
+# EventGhost is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with EventGhost. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This file is part of the **pyWinMCERemote**
+project https://github.com/kdschlosser/pyWinMCERemote
+
+:platform: any
+:license: GPL version 2 or newer
+:synopsis: RC6IRCode benchmark
+
+.. moduleauthor:: Kevin Schlosser @kdschlosser <kevin.g.schlosser@gmail.com>
+
+Decodes MCE remote frames with the current RC6IRCode and the old one,
+checks they give the same names and reports the time per frame.
+"""
+
+from __future__ import print_function
+
+import sys
+import timeit
+import random
+
+from pyWinMCERemote import decoder
+from pyWinMCERemote import pronto
+from pyWinMCERemote import utils
+from . import legacy
+from .clean_code import jitter
+
+
+def build_frames(rnd):
+    frames = []
+
+    for command in sorted(decoder.MCE_COMMANDS):
+        code = pronto.pronto_rc6a_to_ir(
+            [0x6001, 0x73, 0, 2, decoder.MCE_CODE, command >> 8, command & 0xFF, 0],
+            0
+        )[1]
+        code = utils.clean_code(jitter(code, 30, rnd), decoder.TIMING_TOLERANCE)
+        # the RC6A encoder uses a 7 half bit leader, MCE remotes send 6
+        code[0] = decoder.HEADER_MARK
+        frames.append(code)
+
+    return frames
+
+
+def run(cls, frames):
+    res = []
+
+    for code in frames:
+        cls.lastCode = None
+        decoder.default_tracker.reset()
+        try:
+            res.append(str(cls(code)))
+        except decoder.DecodeError:
+            res.append(None)
+
+    return res
+
+
+def main():
+    frames = build_frames(random.Random(0))
+
+    expected = run(legacy.RC6IRCode, frames)
+    result = run(decoder.RC6IRCode, frames)
+    # the old decoder drops frames that do not have exactly 65 or 67
+    # timings, only the ones it could decode are compared
+    mismatches = sum(
+        1 for a, b in zip(expected, result) if a is not None and a != b
+    )
+
+    print('{0} frames, {1} decoded ({2} by the old decoder), {3} mismatches'.format(
+        len(frames),
+        len([item for item in result if item is not None]),
+        len([item for item in expected if item is not None]),
+        mismatches
+    ))
+
+    number = 20
+    old = min(timeit.repeat(
+        lambda: run(legacy.RC6IRCode, frames),
+        number=number,
+        repeat=3
+    )) / (number * len(frames))
+    new = min(timeit.repeat(
+        lambda: run(decoder.RC6IRCode, frames),
+        number=number,
+        repeat=3
+    )) / (number * len(frames))
+
+    print('legacy: {0:8.1f} us/frame'.format(old * 1000000))
+    print('new:    {0:8.1f} us/frame'.format(new * 1000000))
+    print('speedup: {0:.1f}x'.format(old / new))
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of EventGhost.
+# Copyright © 2005-2019 EventGhost Project <http://www.eventghost.org/>
+#
+# EventGhost is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 2 of the License, or (at your option)
+# any later version.
+#
+# EventGhost is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with EventGhost. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This file is part of the **pyWinMCERemote**
+project https://github.com/kdschlosser/pyWinMCERemote
+
+:platform: any
+:license: GPL version 2 or newer
+:synopsis: held button transmit buffer benchmark
+
+.. moduleauthor:: Kevin Schlosser @kdschlosser <kevin.g.schlosser@gmail.com>
+
+Builds the transmit buffer of a NEC button held for 2 seconds from a raw
+pronto code with a once and a repeat sequence. The old way is a loop that
+parses the pronto code, cleans the timings and builds a ctypes buffer for
+every frame, the new one expands the code once with repeat_count.
+"""
+
+from __future__ import print_function
+
+import sys
+import ctypes
+import timeit
+
+from pyWinMCERemote import decoder
+from pyWinMCERemote import pronto
+from pyWinMCERemote import utils
+from . import legacy
+
+
+def build_code():
+    # a NEC frame as the once sequence and the NEC repeat frame as the
+    # repeat sequence
+    freq, timings = pronto.pronto_nec_to_ir([0x900A, 0x006D, 0, 1, 0x04FB, 0x08F7])
+    words = pronto.parse_pronto(pronto.ir_to_pronto_raw(freq, timings))
+    once = words[4:]
+    repeat = pronto.parse_pronto(
+        pronto.ir_to_pronto_raw(freq, pronto.NEC_REPEAT)
+    )[4:]
+
+    return pronto.format_pronto(
+        [0x0000, words[1], len(once) // 2, len(repeat) // 2] + once + repeat
+    )
+
+
+def send_loop(code, frames):
+    # what holding a button looked like, one transmit per frame
+    res = []
+    for _ in range(frames):
+        pronto_data = list(int(v, 16) for v in code.split(" "))
+        _, timings = legacy.pronto_raw_to_ir(pronto_data, 0)
+        timings = utils.clean_code(timings, decoder.TIMING_TOLERANCE)
+        res.append((ctypes.c_long * len(timings))(*timings))
+
+    return res
+
+
+def send_once(code, frames):
+    pronto.clear_cache()
+    _, timings = pronto.pronto_to_mce(code, frames - 2)
+    return (ctypes.c_long * len(timings))(*timings)
+
+
+def main():
+    code = build_code()
+    # a frame every 108ms
+    frames = 2000 // 108
+
+    _, once = legacy.pronto_raw_to_ir(pronto.parse_pronto(code), 0)
+    _, held = pronto.pronto_to_mce(code, frames - 2)
+    repeat = once[-4:]
+
+    mismatches = 0
+    if list(held) != once + repeat * (frames - 2):
+        mismatches += 1
+
+    print('{0} frames, {1} timings, {2} mismatches'.format(
+        frames,
+        len(held),
+        mismatches
+    ))
+
+    number = 200
+    old = min(timeit.repeat(
+        lambda: send_loop(code, frames),
+        number=number,
+        repeat=3
+    )) / number
+    new = min(timeit.repeat(
+        lambda: send_once(code, frames),
+        number=number,
+        repeat=3
+    )) / number
+
+    print('loop:     {0:8.1f} us per hold'.format(old * 1000000))
+    print('expanded: {0:8.1f} us per hold'.format(new * 1000000))
+    print('speedup: {0:.1f}x'.format(old / new))
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
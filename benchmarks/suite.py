@@ -0,0 +1,398 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of EventGhost.
+# Copyright © 2005-2019 EventGhost Project <http://www.eventghost.org/>
+#
+# EventGhost is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 2 of the License, or (at your option)
+# any later version.
+#
+# EventGhost is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with EventGhost. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This file is part of the **pyWinMCERemote**
+project https://github.com/kdschlosser/pyWinMCERemote
+
+:platform: any
+:license: GPL version 2 or newer
+:synopsis: decoder and codec benchmark suite
+
+.. moduleauthor:: Kevin Schlosser @kdschlosser <kevin.g.schlosser@gmail.com>
+
+Runs a corpus of synthetic frames (see :mod:`benchmarks.corpus`) through
+the receive path one stage at a time and reports frames per second, the
+latency percentiles of every stage and the memory every decoded frame
+keeps. ::
+
+    python -m benchmarks.suite --save       # store a baseline
+    python -m benchmarks.suite              # compare against it
+
+Every stage is run over the whole corpus `--repeat` times with
+:mod:`timeit`, the stages taking turns, and the best run is what gets
+gated. The percentiles come
+from a separate pass that times every frame on its own, they are only
+reported.
+
+The run fails (exit status 1) if a gated number got worse then the baseline
+by more then the threshold. It exits with status 2 if there is nothing to
+compare against: no baseline, or one made with different corpus settings,
+another Python version or without all of the gated numbers.
+"""
+
+from __future__ import print_function
+
+import os
+import sys
+import json
+import timeit
+import argparse
+import platform
+import tracemalloc
+
+from pyWinMCERemote import decoder
+from pyWinMCERemote import pronto
+from pyWinMCERemote import utils
+from pyWinMCERemote import hold
+from .corpus import build_corpus
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+STAGES = ('clean_code', 'decode', 'name', 'pronto')
+
+# plain Python work over the corpus that does not use the library. It is
+# timed along with the stages and the gated times are relative to it, that
+# takes out how fast the machine happens to be at the time.
+REFERENCE = 'reference'
+PERCENTILES = (50, 90, 99)
+
+# number of times every stage is run over the corpus, the best run counts
+REPEAT = 7
+
+# metric -> True if higher is better. Only these fail the run. A single
+# timing of a frame moves around too much from one run to the next, so
+# the percentiles are not gated.
+GATED = {
+    'clean_code.relative': False,
+    'decode.relative': False,
+    'name.relative': False,
+    'pronto.relative': False,
+    'kept_bytes': False,
+    'kept_blocks': False,
+}
+
+EXIT_REGRESSION = 1
+EXIT_NO_BASELINE = 2
+
+
+def percentile(values, percent):
+    # nearest rank, values have to be sorted
+    index = int(round(percent / 100.0 * (len(values) - 1)))
+    return values[index]
+
+
+def time_best(corpus, repeat=REPEAT):
+    """
+    Returns the best mean time per frame of every stage.
+
+    The pronto cache is emptied and the frames are decoded again before
+    every run so each one does the same work as the first.
+    """
+    tracker = hold.HoldTracker()
+    cleaned = [
+        utils.clean_code(code, decoder.TIMING_TOLERANCE)
+        for _, _, code in corpus
+    ]
+    decoded = []
+
+    def clean_code():
+        for _, _, code in corpus:
+            utils.clean_code(code, decoder.TIMING_TOLERANCE)
+
+    def decode():
+        res = []
+        for _, frequency, code in corpus:
+            tracker.reset()
+            res.append(decoder.decode(frequency, code, tracker=tracker))
+
+        return res
+
+    def setup_name():
+        decoded[:] = decode()
+
+    def name():
+        for ir_code in decoded:
+            str(ir_code)
+
+    def render():
+        for (_, frequency, _), code in zip(corpus, cleaned):
+            pronto.ir_to_pronto_raw(frequency, code)
+
+    def reference():
+        for _, _, code in corpus:
+            sorted([abs(t) for t in code])
+
+    runs = {
+        'reference': (reference, 'pass'),
+        'clean_code': (clean_code, 'pass'),
+        'decode': (decode, 'pass'),
+        'name': (name, setup_name),
+        'pronto': (render, pronto.clear_cache),
+    }
+
+    timers = dict(
+        (stage, timeit.Timer(stmt, setup=setup))
+        for stage, (stmt, setup) in runs.items()
+    )
+    times = dict((stage, []) for stage in (REFERENCE,) + STAGES)
+
+    # the stages take turns, a slow patch of the machine hits all of them
+    # and not just the one that happened to be running
+    for _ in range(repeat):
+        for stage in (REFERENCE,) + STAGES:
+            times[stage].append(timers[stage].timeit(number=1))
+
+    pronto.clear_cache()
+
+    return dict(
+        (stage, min(values) / len(corpus))
+        for stage, values in times.items()
+    )
+
+
+def time_stages(corpus):
+    clock = timeit.default_timer
+    tracker = hold.HoldTracker()
+    times = dict((stage, []) for stage in STAGES)
+    decoded = {}
+
+    for kind, frequency, code in corpus:
+        # every frame is a new press, this times the decoding and not
+        # the held button handling
+        tracker.reset()
+
+        start = clock()
+        cleaned = utils.clean_code(code, decoder.TIMING_TOLERANCE)
+        times['clean_code'].append(clock() - start)
+
+        start = clock()
+        ir_code = decoder.decode(frequency, code, tracker=tracker)
+        times['decode'].append(clock() - start)
+
+        start = clock()
+        name = str(ir_code)
+        times['name'].append(clock() - start)
+
+        start = clock()
+        pronto.ir_to_pronto_raw(frequency, cleaned)
+        times['pronto'].append(clock() - start)
+
+        total, count = decoded.get(kind, (0, 0))
+        if not name.startswith('Unknown') and name != 'None':
+            count += 1
+        decoded[kind] = (total + 1, count)
+
+    return times, decoded
+
+
+def measure_memory(corpus):
+    tracker = hold.HoldTracker()
+    res = []
+
+    tracemalloc.start()
+    try:
+        start = tracemalloc.take_snapshot()
+
+        for _, frequency, code in corpus:
+            tracker.reset()
+            ir_code = decoder.decode(frequency, code, tracker=tracker)
+            str(ir_code)
+            res.append(ir_code)
+
+        _, peak = tracemalloc.get_traced_memory()
+        stats = tracemalloc.take_snapshot().compare_to(start, 'filename')
+    finally:
+        tracemalloc.stop()
+
+    size = sum(stat.size_diff for stat in stats)
+    blocks = sum(stat.count_diff for stat in stats)
+
+    return (
+        float(size) / len(corpus),
+        float(blocks) / len(corpus),
+        float(peak) / len(corpus)
+    )
+
+
+def run(corpus, repeat=REPEAT):
+    # the first pass builds the decoder index and warms everything up
+    times, decoded = time_stages(corpus)
+    times, decoded = time_stages(corpus)
+    best = time_best(corpus, repeat)
+    metrics = {}
+
+    print('{0:12s} {1:>10s} {2:>10s} {3:>10s} {4:>10s}'.format(
+        'stage', 'best us', 'p50 us', 'p90 us', 'p99 us'
+    ))
+
+    for stage in STAGES:
+        values = sorted(times[stage])
+        row = [best[stage]] + [percentile(values, p) for p in PERCENTILES]
+
+        metrics[stage + '.best'] = best[stage] * 1000000
+        metrics[stage + '.relative'] = best[stage] / best[REFERENCE]
+
+        for percent, value in zip(PERCENTILES, row[1:]):
+            metrics['{0}.p{1}'.format(stage, percent)] = value * 1000000
+
+        print('{0:12s} {1:10.1f} {2:10.1f} {3:10.1f} {4:10.1f}'.format(
+            stage,
+            *[value * 1000000 for value in row]
+        ))
+
+    metrics[REFERENCE] = best[REFERENCE] * 1000000
+    print('{0:12s} {1:10.1f}'.format(REFERENCE, metrics[REFERENCE]))
+
+    # the receive path is the decode and naming of every frame
+    metrics['frames_per_sec'] = 1.0 / (best['decode'] + best['name'])
+    print()
+    print('frames/sec:   {0:10.0f}'.format(metrics['frames_per_sec']))
+
+    kept_bytes, kept_blocks, peak_bytes = measure_memory(corpus)
+    metrics['kept_bytes'] = kept_bytes
+    metrics['kept_blocks'] = kept_blocks
+    metrics['peak_bytes'] = peak_bytes
+    print(
+        'per frame:    {0:10.0f} bytes kept  {1:6.1f} blocks kept  '
+        '{2:8.0f} bytes peak'.format(kept_bytes, kept_blocks, peak_bytes)
+    )
+
+    for kind in sorted(decoded):
+        total, count = decoded[kind]
+        metrics['decoded.' + kind] = float(count) / total
+        print('decoded {0:5s} {1:9.1%}'.format(kind, float(count) / total))
+
+    return metrics
+
+
+def compare(metrics, baseline, threshold):
+    regressions = 0
+
+    print()
+    print('{0:20s} {1:>12s} {2:>12s} {3:>8s}'.format(
+        'metric', 'baseline', 'now', 'change'
+    ))
+
+    for name in sorted(metrics):
+        if name not in baseline:
+            continue
+
+        old = baseline[name]
+        new = metrics[name]
+        change = (new - old) / old if old else 0.0
+
+        status = ''
+        if name in GATED:
+            worse = -change if GATED[name] else change
+            if worse > threshold:
+                status = 'REGRESSION'
+                regressions += 1
+        elif name.startswith('decoded.') and new < old:
+            # a frame that no longer decodes is a bug, not noise
+            status = 'REGRESSION'
+            regressions += 1
+
+        print('{0:20s} {1:12.3f} {2:12.3f} {3:+7.1%} {4}'.format(
+            name, old, new, change, status
+        ))
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.suite')
+    parser.add_argument('--count', type=int, default=2000, help='frames in the corpus')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--jitter', type=int, default=30, help='most a timing is off in us')
+    parser.add_argument('--noise', type=float, default=0.0, help='fraction of frames with a glitch')
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--threshold', type=float, default=0.25, help='allowed regression, 0.25 is 25%%')
+    parser.add_argument('--repeat', type=int, default=REPEAT, help='runs of every stage, the best one counts')
+    parser.add_argument('--save', action='store_true', help='store the results as the baseline')
+    args = parser.parse_args(argv)
+
+    settings = {
+        'count': args.count,
+        'seed': args.seed,
+        'jitter': args.jitter,
+        'noise': args.noise,
+        'repeat': args.repeat,
+        'python': platform.python_version(),
+    }
+
+    corpus = build_corpus(args.count, args.seed, args.jitter, args.noise)
+    print('{0} frames, {1} timings'.format(
+        len(corpus),
+        sum(len(code) for _, _, code in corpus)
+    ))
+    print()
+
+    metrics = run(corpus, args.repeat)
+
+    if args.save:
+        with open(args.baseline, 'w') as f:
+            json.dump(
+                {'settings': settings, 'metrics': metrics},
+                f,
+                indent=4,
+                sort_keys=True
+            )
+        print()
+        print('baseline saved to', args.baseline)
+        return 0
+
+    if not os.path.isfile(args.baseline):
+        print()
+        print('NOT COMPARED: there is no baseline at', args.baseline)
+        print('run with --save to make one')
+        return EXIT_NO_BASELINE
+
+    with open(args.baseline, 'r') as f:
+        baseline = json.load(f)
+
+    if baseline.get('settings') != settings:
+        print()
+        print('NOT COMPARED: the baseline was made with', baseline.get('settings'))
+        print('this run used', settings)
+        return EXIT_NO_BASELINE
+
+    missing = sorted(
+        name for name in GATED if name not in baseline.get('metrics', {})
+    )
+    if missing:
+        print()
+        print('NOT COMPARED: the baseline does not have', ', '.join(missing))
+        print('run with --save to make a new one')
+        return EXIT_NO_BASELINE
+
+    regressions = compare(metrics, baseline['metrics'], args.threshold)
+
+    if regressions:
+        print()
+        print('FAILED: {0} regressions'.format(regressions))
+        return EXIT_REGRESSION
+
+    print()
+    print('OK: no regressions over {0:.0%}'.format(args.threshold))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of EventGhost.
+# Copyright © 2005-2019 EventGhost Project <http://www.eventghost.org/>
+#
+# EventGhost is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 2 of the License, or (at your option)
+# any later version.
+#
+# EventGhost is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with EventGhost. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This file is part of the **pyWinMCERemote**
+project https://github.com/kdschlosser/pyWinMCERemote
+
+:platform: any
+:license: GPL version 2 or newer
+:synopsis: transmit buffer packing benchmark
+
+.. moduleauthor:: Kevin Schlosser @kdschlosser <kevin.g.schlosser@gmail.com>
+
+Packs codes of different lengths for sending with the old
+round_and_pack_timings, with the same rounding followed by the LONG array
+IRDevice.transmit used to build and with pronto.pack_transmit_chunk
+writing into the same buffer every time. Checks the packed timings are
+the same and reports timings per second.
+"""
+
+from __future__ import print_function
+
+import sys
+import ctypes
+import random
+import timeit
+
+from pyWinMCERemote import pronto
+from . import legacy
+from .corpus import add_jitter
+
+
+def ctypes_array(timings):
+    # rounded the way round_and_pack_timings does it and copied into a
+    # LONG array, the way IRDevice.transmit built its Data field
+    timings = [50 * int(round(v / 50.0)) for v in timings]
+    return (ctypes.c_int32 * len(timings))(*timings)
+
+
+def main():
+    rnd = random.Random(0)
+
+    freq, nec = pronto.pronto_nec_to_ir([0x900A, 0x006D, 0, 1, 0x04FB, 0x08F7])
+    _, held = pronto.pronto_nec_to_ir([0x900A, 0x006D, 0, 1, 0x04FB, 0x08F7], 17)
+
+    codes = [
+        ('NEC', add_jitter(nec, 30, rnd)),
+        ('NEC held 2s', add_jitter(held, 30, rnd)),
+        ('learned 2000', add_jitter(list(nec) * 30, 30, rnd)[:2000]),
+    ]
+
+    mismatches = 0
+    buffer = None
+
+    for _, timings in codes:
+        buffer, size = pronto.pack_transmit_chunk(timings, 0, buffer)
+        header = pronto.TRANSMIT_CHUNK_HEADER
+        data = bytes(buffer[header.size:header.size + (len(timings) * 4)])
+
+        if data != legacy.round_and_pack_timings(timings):
+            mismatches += 1
+        if data != bytes(ctypes_array(timings)):
+            mismatches += 1
+        if header.unpack_from(buffer, 0) != (0, 1, len(timings) * 4):
+            mismatches += 1
+
+    print('{0} codes, {1} mismatches'.format(len(codes), mismatches))
+    print()
+    print('{0:14s} {1:>12s} {2:>12s} {3:>12s}'.format(
+        'timings/sec', 'legacy pack', 'round+ctypes', 'chunk'
+    ))
+
+    for name, timings in codes:
+        number = max(1, 20000 // len(timings))
+        rates = []
+
+        for func in (
+            legacy.round_and_pack_timings,
+            ctypes_array,
+            lambda t: pronto.pack_transmit_chunk(t, 0, buffer)
+        ):
+            duration = min(timeit.repeat(
+                lambda: func(timings),
+                number=number,
+                repeat=3
+            ))
+            rates.append(number * len(timings) / duration)
+
+        print('{0:14s} {1:12.0f} {2:12.0f} {3:12.0f}'.format(name, *rates))
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -27,15 +27,6 @@ project https://github.com/kdschlosser/pyWinMCERemote
 .. moduleauthor:: Kevin Schlosser @kdschlosser <kevin.g.schlosser@gmail.com>
 """
 
-try:
-    from . import ioctl
-    get_ir_devices = ioctl.get_ir_devices
-    IRDevice = ioctl.IRDevice
-
-except ImportError:
-    pass
-
-
 from . import version
 
 
@@ -49,3 +40,31 @@ __long_description__ = version.__long_description__
 
 __doc__ += '\n ' + __long_description__
 
+
+# The device layer (ioctl and the *_h header modules) binds kernel32 and
+# setupapi when it is imported. It is only loaded the first time a device
+# is asked for so the codec modules (decoder, pronto and utils) can be used
+# on any platform without paying for it.
+def _load_ioctl():
+    import importlib
+
+    # "from . import ioctl" would end up back in __getattr__
+    return importlib.import_module(__name__ + '.ioctl')
+
+
+def get_ir_devices():
+    return _load_ioctl().get_ir_devices()
+
+
+def __getattr__(name):
+    if name in ('IRDevice', 'ioctl'):
+        ioctl = _load_ioctl()
+
+        if name == 'ioctl':
+            return ioctl
+
+        return ioctl.IRDevice
+
+    raise AttributeError(
+        "module '{0}' has no attribute '{1}'".format(__name__, name)
+    )
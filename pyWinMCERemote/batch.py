@@ -0,0 +1,229 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of EventGhost.
+# Copyright © 2005-2019 EventGhost Project <http://www.eventghost.org/>
+#
+# EventGhost is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 2 of the License, or (at your option)
+# any later version.
+#
+# EventGhost is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with EventGhost. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This file is part of the **pyWinMCERemote**
+project https://github.com/kdschlosser/pyWinMCERemote
+
+:platform: any
+:license: GPL version 2 or newer
+:synopsis: batch cleaning and decoding of captured frames
+
+.. moduleauthor:: Kevin Schlosser @kdschlosser <kevin.g.schlosser@gmail.com>
+
+Frames are passed packed into one int32 buffer (``array('i')``, a numpy
+array or anything exposing the buffer protocol) plus an offsets array of
+``frame count + 1`` entries, frame ``n`` being
+``timings[offsets[n]:offsets[n + 1]]``.
+
+When numpy is installed the clustering and the 50us normalisation are done
+with array operations over all of the frames at once. Without numpy every
+frame goes through :func:`pyWinMCERemote.utils.clean_code`. Both give the
+same results.
+
+Only the cleaning is batched. The RC6 half bit quantisation is still done one
+frame at a time by the decoder, it is not vectorised.
+"""
+
+import array
+
+from . import decoder
+from . import hold
+from . import utils
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _to_array(timings):
+    if isinstance(timings, array.array):
+        return timings
+
+    if isinstance(timings, (bytes, bytearray, memoryview)):
+        res = array.array('i')
+        res.frombytes(bytes(timings))
+        return res
+
+    return array.array('i', timings)
+
+
+def _clean_python(timings, offsets, threshold):
+    timings = _to_array(timings)
+    res = array.array('i', timings)
+
+    for i in range(len(offsets) - 1):
+        start = offsets[i]
+        end = offsets[i + 1]
+        res[start:end] = array.array(
+            'i',
+            utils.clean_code(timings[start:end].tolist(), threshold)
+        )
+
+    return res
+
+
+def _clean_numpy(timings, offsets, threshold):
+    low_threshold = 1.0 - (threshold / 100.0)
+    high_threshold = 1.0 + (threshold / 100.0)
+
+    if isinstance(timings, (bytes, bytearray, memoryview)):
+        timings = numpy.frombuffer(timings, dtype=numpy.int32)
+
+    res = numpy.array(timings, dtype=numpy.int32)
+    offsets = numpy.asarray(offsets, dtype=numpy.int64)
+    lengths = numpy.diff(offsets)
+
+    if not lengths.sum():
+        return res
+
+    # the positions of the timings that belong to a frame. frames do not
+    # have to cover the whole buffer or be in order.
+    frames = numpy.repeat(
+        numpy.arange(len(lengths), dtype=numpy.int64),
+        lengths
+    )
+    positions = (
+        numpy.arange(len(frames), dtype=numpy.int64) -
+        numpy.repeat(numpy.cumsum(lengths) - lengths - offsets[:-1], lengths)
+    )
+    timings = res[positions].astype(numpy.int64)
+
+    negative = timings < 0
+    values = numpy.abs(timings)
+
+    # sort by frame, then marks/spaces, then duration
+    order = numpy.lexsort((values, negative, frames))
+    values = values[order]
+    frames = frames[order]
+    negative = negative[order]
+
+    # a new cluster starts where the frame changes, where the spaces start
+    # or where the gap to the previous timing is larger then the tolerance
+    split = numpy.ones(len(values), dtype=bool)
+    split[1:] = (
+        (frames[1:] != frames[:-1]) |
+        (negative[1:] != negative[:-1]) |
+        (values[1:] > (values[:-1] * high_threshold).astype(numpy.int64))
+    )
+
+    starts = numpy.flatnonzero(split)
+    sums = numpy.add.reduceat(values, starts)
+    counts = numpy.diff(numpy.append(starts, len(values)))
+    means = sums // counts
+
+    # merge neighbouring clusters that are close enough
+    merge = numpy.zeros(len(starts), dtype=bool)
+    merge[1:] = (
+        (frames[starts[1:]] == frames[starts[:-1]]) &
+        (negative[starts[1:]] == negative[starts[:-1]]) &
+        (means[:-1] >= (means[1:] * low_threshold).astype(numpy.int64))
+    )
+    merged = numpy.cumsum(~merge) - 1
+    merged_starts = numpy.flatnonzero(~merge)
+    means = (
+        numpy.add.reduceat(sums, merged_starts) //
+        numpy.add.reduceat(counts, merged_starts)
+    )
+
+    dif = means % 50
+    snapped = numpy.where(dif < 25, means - dif, means + 50 - dif)
+    low = (snapped * low_threshold).astype(numpy.int64)
+    high = (snapped * high_threshold).astype(numpy.int64)
+
+    cluster = numpy.repeat(merged, counts)
+    snapped = snapped[cluster]
+    values = numpy.where(
+        (low[cluster] <= values) & (values <= high[cluster]),
+        snapped,
+        values
+    )
+    values = numpy.where(negative, -values, values)
+
+    res[positions[order]] = values
+    return res
+
+
+def clean_codes(timings, offsets, threshold=decoder.TIMING_TOLERANCE, use_numpy=None):
+    """
+    Cleans every frame in a packed timing buffer.
+
+    Returns a copy of the buffer with the timings of every frame cleaned,
+    a numpy array when numpy was used otherwise an ``array('i')``.
+    """
+    if use_numpy is None:
+        use_numpy = numpy is not None
+
+    if use_numpy:
+        return _clean_numpy(timings, offsets, threshold)
+
+    return _clean_python(timings, offsets, threshold)
+
+
+def decode_codes(
+    timings,
+    offsets,
+    frequencies=None,
+    threshold=decoder.TIMING_TOLERANCE,
+    use_numpy=None,
+    tracker=None,
+    cache=None
+):
+    """
+    Cleans and decodes every frame in a packed timing buffer.
+
+    The frames are cleaned all at once and then handed to
+    :func:`pyWinMCERemote.decoder.decode`.
+
+    `frequencies` is either a sequence with the carrier frequency of each
+    frame, a single frequency used for all of them or ``None``.
+
+    `tracker` is the :class:`pyWinMCERemote.hold.HoldTracker` the held
+    buttons get tracked with. If it is ``None`` a new one is made for the
+    call, the frames never share state with live decoding.
+
+    `cache` is an optional :class:`pyWinMCERemote.decoder.DecodeCache`.
+
+    Returns a list with the cleaned timings and the decoded code (or
+    ``None``) for each frame.
+    """
+    cleaned = clean_codes(timings, offsets, threshold, use_numpy)
+
+    if frequencies is None or isinstance(frequencies, int):
+        frequencies = [frequencies or 0] * (len(offsets) - 1)
+
+    if tracker is None:
+        tracker = hold.HoldTracker()
+
+    res = []
+
+    for i in range(len(offsets) - 1):
+        start = int(offsets[i])
+        end = int(offsets[i + 1])
+        code = cleaned[start:end].tolist()
+        ir_code = decoder.decode(
+            frequencies[i],
+            code,
+            clean=False,
+            tracker=tracker,
+            cache=cache
+        )
+        res.append((code, ir_code))
+
+    return res
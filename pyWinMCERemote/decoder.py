@@ -17,9 +17,11 @@
 # with EventGhost. If not, see <http://www.gnu.org/licenses/>.
 
 import math
-import time
+import array
+import binascii
 from . import pronto
 from . import utils
+from . import hold
 
 
 XBOX360_COMMANDS = {
@@ -186,7 +188,21 @@ TRAILER_LOGIC_1_SPACE = -889
 TIMING_TOLERANCE = 12.0
 
 
-def TIMING_MATCH(value, expected_timing_value):
+# expected timing -> (low, high), for the tolerance in _windows_tolerance
+_windows = {}
+_windows_tolerance = [None]
+
+
+def _get_window(expected_timing_value):
+    if _windows_tolerance[0] != TIMING_TOLERANCE:
+        _windows.clear()
+        _windows_tolerance[0] = TIMING_TOLERANCE
+
+    try:
+        return _windows[expected_timing_value]
+    except KeyError:
+        pass
+
     high = math.floor(expected_timing_value + ((expected_timing_value * TIMING_TOLERANCE) / 100.0))
     low = math.floor(expected_timing_value - ((expected_timing_value * TIMING_TOLERANCE) / 100.0))
 
@@ -195,9 +211,83 @@ def TIMING_MATCH(value, expected_timing_value):
     if expected_timing_value < 0:
         low, high = high, low
 
+    window = _windows[expected_timing_value] = (int(low), int(high))
+    return window
+
+
+def TIMING_MATCH(value, expected_timing_value):
+    low, high = _get_window(expected_timing_value)
     return low <= value <= high
 
 
+def timing_window(expected_timing_value, tolerance=None):
+    """
+    Returns the (low, high) range of absolute durations that match a timing.
+    """
+    if tolerance is None:
+        tolerance = TIMING_TOLERANCE
+
+    expected_timing_value = abs(expected_timing_value)
+    low = math.floor(expected_timing_value - ((expected_timing_value * tolerance) / 100.0))
+    high = math.floor(expected_timing_value + ((expected_timing_value * tolerance) / 100.0))
+
+    return int(low), int(high)
+
+
+class TimingTable(object):
+    """
+    Snaps timings to the nominal timing whose tolerance window they are in.
+
+    Every duration inside one of the windows is put in a dict, so a timing
+    is classified with a single lookup. The table is built the first time
+    it is used and rebuilt only when the tolerance changes. If `tolerance`
+    is ``None`` the table follows :data:`TIMING_TOLERANCE`. Where windows
+    overlap the nominal timing listed first wins.
+    """
+
+    def __init__(self, timings, tolerance=None):
+        self.timings = tuple(timings)
+        self.tolerance = tolerance
+        self._table = None
+        self._table_tolerance = None
+
+    def get_table(self):
+        tolerance = self.tolerance
+        if tolerance is None:
+            tolerance = TIMING_TOLERANCE
+
+        if self._table is None or self._table_tolerance != tolerance:
+            table = {}
+
+            for timing in reversed(self.timings):
+                low, high = timing_window(timing, tolerance)
+
+                if timing < 0:
+                    low, high = -high, -low
+
+                for duration in range(low, high + 1):
+                    table[duration] = timing
+
+            self._table = table
+            self._table_tolerance = tolerance
+
+        return self._table
+
+    def snap(self, timing):
+        """
+        Returns the nominal timing or ``None`` if it is not in a window.
+        """
+        return self.get_table().get(timing)
+
+
+# status returned by ProtocolDecoder.decode
+DECODE_OK = 0
+DECODE_NO_MATCH = 1
+DECODE_REPEAT_EXPIRED = 2
+# the frame is a copy of one that has already been reported
+DECODE_DUPLICATE = 3
+
+
 class DecodeError(Exception):  # Raised if code doesn't match expectation.
     pass
 
@@ -206,7 +296,20 @@ class RepeatExpired(Exception):
     pass
 
 
-class CodeWrapper(list):
+class Frame(array.array):
+    """
+    The timings of a frame.
+
+    An ``array('i')`` so the timings take 4 bytes each and the buffer can be
+    handed to anything that takes one (struct, numpy, ctypes) without a
+    copy. The header, footer and burst pair accessors index straight into
+    the array.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls, code=()):
+        return array.array.__new__(cls, 'i', code)
 
     @property
     def header(self):
@@ -236,7 +339,7 @@ class CodeWrapper(list):
 
     @property
     def footer(self):
-        return self[-2:]
+        return self[-2], self[-1]
 
     @property
     def footer_space(self):
@@ -252,21 +355,20 @@ class CodeWrapper(list):
 
     @property
     def bits(self):
-        code = self[2:-2]
-        pairs = [[code[i], code[i + 1]] for i in range(0, len(code), 2)]
-        return len(pairs)
+        # burst pairs between the header and the footer
+        return max(0, (len(self) - 4) // 2)
 
     def get_burst_pair(self, index):
-        # trim off the header and the footer value
-        code = self[2:-2]
-        pairs = [[code[i], code[i + 1]] for i in range(0, len(code), 2)]
+        count = self.bits
+
+        if index < 0:
+            index += count
 
-        try:
-            mark, space = pairs[index]
-        except IndexError:
+        if not 0 <= index < count:
             raise IndexError('Invalid burst pair')
 
-        return mark, space
+        index = (index * 2) + 2
+        return self[index], self[index + 1]
 
     def set_burst_pair(self, index, mark, space):
         index = (index * 2) + 2
@@ -275,256 +377,1416 @@ class CodeWrapper(list):
 
     def __getitem__(self, item):
         if isinstance(item, slice):
-            return CodeWrapper(self[item])
+            return Frame(array.array.__getitem__(self, item))
 
-        return list.__getitem__(self, item)
+        return array.array.__getitem__(self, item)
 
+    def __copy__(self):
+        return Frame(self)
 
-def decode(frequency, code):
-    code = utils.clean_code(code[:], TIMING_TOLERANCE)
-    try:
-        protocol = RC6IRCode(code)
-    except DecodeError:
-        protocol = IrCode(code, frequency)
-    except RepeatExpired:
-        protocol = None
+    def __deepcopy__(self, memo):
+        return Frame(self)
+
+    def __reduce__(self):
+        return self.__class__, (self.tolist(),)
 
-    return protocol
 
+# the old name of Frame, it used to be a list
+CodeWrapper = Frame
 
-class IrCode(object):
+
+def _get_timings(code, frequency):
+    # the decoded codes can be made from a pronto code as well
+    if isinstance(code, (list, tuple, array.array)):
+        return code, frequency
+
+    frequency, code = pronto.pronto_to_mce(code)
+    return utils.clean_code(code, TIMING_TOLERANCE), frequency
+
+
+class DecodedCode(object):
     """
-    IR decoder for unknown protocols.
+    Base class of the decoded codes.
+
+    Decoding only stores the fields of a code and the timings (in a
+    :class:`Frame`, which is a lot smaller then a list). The name and the
+    pronto code get made the first time they are asked for and are kept
+    after that. A held button mostly repeats codes nobody looks at past
+    the fields.
     """
 
-    def __init__(self, code, frequency=0):
-        if not isinstance(code, (list, tuple)):
-            code = pronto.pronto_to_mce(code)
-            code = utils.clean_code(code, TIMING_TOLERANCE)
+    __slots__ = ('frequency', 'repeat', 'timeout', '_timings', '_name', '_pronto')
 
-        self.diffTime = 3.0
-        self.rlc_code = code[:]
-        self.code = CodeWrapper(code[:])
+    def __init__(self, code, frequency=0, repeat=False, timeout=0):
+        if not isinstance(code, Frame):
+            code = Frame(code)
+
+        self._timings = code
         self.frequency = frequency
+        self.repeat = repeat
+        self.timeout = timeout
+        self._name = None
+        self._pronto = None
+
+    @property
+    def code(self):
+        return self._timings
+
+    # both names are the same Frame
+    rlc_code = code
 
     @property
     def pronto(self):
-        return pronto.ir_to_pronto_raw(self.frequency, self.rlc_code)
+        if self._pronto is None:
+            self._pronto = pronto.ir_to_pronto_raw(self.frequency, self._timings)
+
+        return self._pronto
+
+    @property
+    def is_button_held(self):
+        return self.repeat
+
+    def _get_name(self):
+        raise NotImplementedError
 
     def __str__(self):
-        # print data
+        if self._name is None:
+            name = self._get_name()
+
+            if self.repeat:
+                name += '.Held'
+
+            self._name = name
+
+        return self._name
+
+
+# frames of a held button only differ by the odd microsecond, the timings
+# are rounded to this before they are looked up in a DecodeCache
+CACHE_QUANTUM = 100
+
+
+class DecodeCache(utils.LRUCache):
+    """
+    Bounded LRU cache of decoded frames.
+
+    The key is the carrier frequency and the timings rounded to `quantum`
+    microseconds, the gap at the end of the frame is left out. A frame that
+    has been seen before skips the cleaning and the protocol decoders, only
+    the held button state gets updated. Use one instance per stream, the
+    same as the :class:`pyWinMCERemote.hold.HoldTracker`. Clear it after
+    changing a tolerance, the frames in it were matched with the old
+    windows.
+    """
+
+    def __init__(self, size=256, quantum=CACHE_QUANTUM):
+        super(DecodeCache, self).__init__(size)
+        self.quantum = quantum
+
+    def get_key(self, frequency, code):
+        quantum = self.quantum
+        half = quantum // 2
+        gap = -utils.FRAME_GAP // quantum
+
+        timings = array.array('i', [(t + half) // quantum for t in code])
+
+        if timings and timings[-1] < gap:
+            timings[-1] = gap
+
+        return frequency, timings.tobytes()
+
+
+def _report(protocol_decoder, code, fields, frequency, tracker):
+    status, ir_code = protocol_decoder.report(code, fields, frequency, tracker)
+
+    if status == DECODE_OK:
+        return ir_code
+
+
+def decode(
+    frequency,
+    code,
+    clean=True,
+    normalizer=None,
+    tracker=None,
+    cache=None
+):
+    """
+    Decodes a received frame.
+
+    Only the protocol decoders whose header and frame length fit the frame
+    get a go at it. If none of them match an :class:`IrCode` is returned.
+    ``None`` is returned if the frame is a repeat that has expired or a
+    copy of a frame that has already been reported.
+
+    `tracker` is the :class:`pyWinMCERemote.hold.HoldTracker` of the
+    stream the frame came from, :data:`default_tracker` if not given.
+
+    `cache` is an optional :class:`DecodeCache`.
+    """
+    if tracker is None:
+        tracker = default_tracker
+
+    if cache is not None:
+        key = cache.get_key(frequency, code)
+        entry = cache.get(key)
+
+        if entry is not None:
+            protocol_decoder, code, fields = entry
+            if protocol_decoder is None:
+                return fields
+
+            return _report(protocol_decoder, code, fields, frequency, tracker)
+
+    raw_index, clean_index = _get_index()
+
+    # decoders that deal with the raw timings go first, that way the
+    # timings only get cleaned if they have to be.
+    for protocol_decoder in _get_candidates(raw_index, code):
+        fields = protocol_decoder.match(code)
+
+        if fields is not None:
+            if cache is not None:
+                # the caller is free to reuse the list it passed in
+                cache.put(key, (protocol_decoder, Frame(code), fields))
+
+            return _report(protocol_decoder, code, fields, frequency, tracker)
+
+    if normalizer is not None:
+        code = normalizer.normalize(code)
+    elif clean:
+        code = utils.clean_code(code, TIMING_TOLERANCE)
+
+    for protocol_decoder in _get_candidates(clean_index, code):
+        fields = protocol_decoder.match(code)
+
+        if fields is not None:
+            if cache is not None:
+                cache.put(key, (protocol_decoder, Frame(code), fields))
+
+            return _report(protocol_decoder, code, fields, frequency, tracker)
+
+    ir_code = IrCode(code, frequency)
+
+    # unknown codes carry no state, the same object is handed out again
+    if cache is not None:
+        cache.put(key, (None, None, ir_code))
+
+    return ir_code
+
+
+# width of the fingerprint unknown codes are named with
+UNKNOWN_CODE_BITS = 64
+
+# name unknown codes the way the old versions did. The names of long codes
+# get very long but key maps made with those versions keep working.
+LEGACY_UNKNOWN_CODES = False
+
+FNV_64_OFFSET = 0xCBF29CE484222325
+FNV_64_PRIME = 0x100000001B3
+FNV_64_MASK = 0xFFFFFFFFFFFFFFFF
+
+
+class IrCode(DecodedCode):
+    """
+    IR decoder for unknown protocols.
+
+    Every timing is compared to the one of the same kind (mark or space)
+    before it, and the resulting run of bits names the code. By default it
+    is hashed into a `fingerprint_bits` wide FNV-1a fingerprint, in legacy
+    mode the bits are used as is.
+    """
+
+    __slots__ = ('diffTime', 'fingerprint_bits', 'legacy', '_fingerprint')
+
+    def __init__(self, code, frequency=0, fingerprint_bits=None, legacy=None):
+        code, frequency = _get_timings(code, frequency)
+
+        if fingerprint_bits is None:
+            fingerprint_bits = UNKNOWN_CODE_BITS
+
+        if not 0 < fingerprint_bits <= 64:
+            raise ValueError('fingerprint_bits has to be between 1 and 64')
+
+        if legacy is None:
+            legacy = LEGACY_UNKNOWN_CODES
+
+        super(IrCode, self).__init__(code, frequency)
+
+        self.diffTime = 3.0
+        self.fingerprint_bits = fingerprint_bits
+        self.legacy = legacy
+        self._fingerprint = None
+
+    def _get_value(self):
+        # the bits get collected in a string and turned into an integer in
+        # one go, shifting a mask through an ever longer integer is slow
         lastPause = 0
         lastPulse = 0
-        code = 0
-        mask = 1
-        for i, x in enumerate(self.code):
+        bits = []
+
+        for i, x in enumerate(self._timings):
             if i % 2:
                 diff = max(self.diffTime, lastPause * 0.2)
-                if -diff < x - lastPause < diff:
-                    code |= mask
+                bits.append('1' if -diff < x - lastPause < diff else '0')
                 lastPause = x
             else:
                 diff = max(self.diffTime, lastPulse * 0.2)
-                if -diff < x - lastPulse < diff:
-                    code |= mask
+                bits.append('1' if -diff < x - lastPulse < diff else '0')
                 lastPulse = x
-            mask <<= 1
-        code |= mask
 
-        return "Unknown.%X" % code
+        # first timing is the least significant bit, the bit above the last
+        # timing is always set
+        bits.append('1')
+        bits.reverse()
+
+        return int(''.join(bits), 2)
+
+    @property
+    def fingerprint(self):
+        if self._fingerprint is None:
+            value = '%X' % (self._get_value(),)
+            if len(value) % 2:
+                value = '0' + value
+
+            fingerprint = FNV_64_OFFSET
+            for byte in bytearray(binascii.unhexlify(value)):
+                fingerprint = ((fingerprint ^ byte) * FNV_64_PRIME) & FNV_64_MASK
+
+            if self.fingerprint_bits < 64:
+                # xor folding
+                mask = (1 << self.fingerprint_bits) - 1
+                fingerprint = (fingerprint >> self.fingerprint_bits) ^ (fingerprint & mask)
+                fingerprint &= mask
+
+            self._fingerprint = fingerprint
+
+        return self._fingerprint
+
+    def _get_name(self):
+        if self.legacy:
+            return "Unknown.%X" % (self._get_value(),)
+
+        return "Unknown.%0*X" % ((self.fingerprint_bits + 3) // 4, self.fingerprint)
+
+
+def _build_manchester_table(one):
+    # maps a byte of half bits to the 4 bits it holds, -1 if one of the
+    # pairs is not a valid transition
+    table = []
+
+    for byte in range(256):
+        value = 0
+
+        for shift in (6, 4, 2, 0):
+            pair = (byte >> shift) & 0x3
+
+            if pair == one:
+                value = (value << 1) | 1
+            elif pair == one ^ 0x3:
+                value <<= 1
+            else:
+                value = -1
+                break
+
+        table.append(value)
+
+    return table
+
+
+# RC6 sends a 1 as mark/space (binary 10) and a 0 as space/mark (binary 01)
+RC6_BIT_TABLE = _build_manchester_table(0x2)
+
+RC6_HALF_BIT_TIME = 444
+
+# start bit + 3 mode bits + the double length trailer bit
+RC6_HEADER_HALF_BITS = 2 + 6 + 4
+
+# mode 0 has 16 bits, RC6A (mode 6) 24 or 32 and some mode 6 remotes 20
+RC6_MIN_BITS = 16
+RC6_MAX_BITS = 32
+
+# name the RC6 codes that are not MCE codes the way the old versions did.
+# Unknown commands end in a dot and the mode 1 - 5 names start with a
+# literal '%02X.' instead of the mode. Set to False for names without the
+# dot that carry the mode.
+LEGACY_RC6_NAMES = True
 
 
-class RC6IRCode(object):
+def _half_bit_stream(code, half_bit_time, start, needed, stop=None):
     """
-    IR decoder for the Philips RC-6 protocol.
+    Turns timings into a run of half bits.
+
+    The half bits are returned as a single integer (first half bit is the
+    most significant one) along with the number of half bits in it. Stops
+    once `needed` half bits have been collected or at timing `stop`.
+    Returns ``None`` if one of the timings is shorter then a half bit.
     """
+    bias = 2 * half_bit_time // 3
+    stream = 0
+    length = 0
 
-    lastCode = None
-    lastTime = 0
+    if stop is None:
+        stop = len(code)
 
-    def __init__(self, code):
+    for i in range(start, stop):
+        count = (abs(code[i]) + bias) // half_bit_time
 
-        if not isinstance(code, (list, tuple)):
-            code = pronto.pronto_to_mce(code)
-            code = utils.clean_code(code, TIMING_TOLERANCE)
+        if count == 0:
+            return None
 
-        self.timeout = 130
-        self.halfBitTime = 444
-        self.pos = 0
-        self.data = None
-        self.bitState = 0
-        self.bufferLen = 0
-        self.frequency = 36000
-        self.rlc_code = code[:]
-        self.code = CodeWrapper(code[:])
-        self._decoded = self._decode()
+        stream <<= count
+        length += count
 
-        # try:
-        #     self.code = normalize_raw_code(code)
-        # except ValueError:
-        #     raise DecodeError('Invalid Code')
+        # marks are the even timings
+        if not i % 2:
+            stream |= (1 << count) - 1
 
-    @property
-    def pronto(self):
-        return pronto.ir_to_pronto_raw(self.frequency, self.rlc_code)
+        if length >= needed:
+            break
 
-    @property
-    def is_button_held(self):
-        if RC6IRCode.lastCode is None:
-            return False
+    return stream, length
 
-        return (time.clock() - RC6IRCode.lastTime) * 1000 < self.timeout
 
-    def __str__(self):
-        return self._decoded
-
-    def _decode(self):
-        code = self.code
-
-        # we have to subtract off the start, mode and trailer bits
-        if code.bits not in (31, 32):
-            raise DecodeError('Incorrect number of bits')
-
-        data = list(abs(item) for item in code)
-
-        self.SetData(data, 2)
-
-        # Get the start bit
-        if self.GetBit() != 1:
-            raise DecodeError("missing start bit")
-
-        mode = self.GetBitsLsbLast(3)
-        trailerBit = self.GetTrailerBit()
-
-        # Check for MCE remote
-        if mode == 6:
-            device = self.GetBitsLsbLast(16)
-            command = self.GetBitsLsbLast(16)
-
-            if device == MCE_CODE:
-                if command & 0x7FFF != command:
-                    trailerBit = 1
-                    command &= 0x7FFF
-                else:
-                    trailerBit = 0
-
-                if command in MCE_COMMANDS:
-                    device = 'MCE.'
-                    decoded = MCE_COMMANDS[command]
-                elif command in XBOX360_COMMANDS:
-                    device = 'XBox360.'
-                    decoded = XBOX360_COMMANDS[command]
-                else:
-                    device = 'MCE.'
-                    decoded = '%04X' % (command,)
+def _get_bits(stream, length, pos, num_bits, table):
+    """
+    Decodes `num_bits` manchester bits starting at half bit `pos`.
+
+    Returns ``-1`` if the bits are not there or have a bad transition.
+    """
+    num_half_bits = num_bits * 2
+    shift = length - pos - num_half_bits
+
+    if shift < 0:
+        return -1
+
+    chunk = (stream >> shift) & ((1 << num_half_bits) - 1)
+
+    # pad to whole bytes with valid transitions so the table can be used
+    pad = -num_half_bits % 8
+    chunk = (chunk << pad) | (0x55 & ((1 << pad) - 1))
+
+    value = 0
+    for byte_shift in range(num_half_bits + pad - 8, -1, -8):
+        nibble = table[(chunk >> byte_shift) & 0xFF]
+        if nibble == -1:
+            return -1
+
+        value = (value << 4) | nibble
+
+    return value >> (pad // 2)
+
+
+def _rc6_field_bits(mode, num_bits):
+    # the number of device (customer for RC6A) and command bits
+    if mode == 6 and num_bits == 32:
+        return 16, 16
+
+    return 8, num_bits - 8
+
+
+def _decode_rc6(code):
+    """
+    Decodes the fields of an RC6 frame, any mode and length.
+
+    Returns a ``(mode, toggle, device, command, number of bits)`` tuple or
+    ``None`` if the timings are not RC6. The toggle is the trailer bit,
+    except for MCE remotes which use the top bit of the command instead.
+    It is taken out of the command for those.
+    """
+    # the length of the frame is what decides the number of bits so the
+    # gap at the end must not be counted.
+    if code[-1] < 0:
+        stop = len(code) - 1
+    else:
+        stop = len(code)
+
+    stream = _half_bit_stream(
+        code,
+        RC6_HALF_BIT_TIME,
+        2,
+        RC6_HEADER_HALF_BITS + (RC6_MAX_BITS * 2) + 1,
+        stop
+    )
+    if stream is None:
+        return None
+
+    stream, length = stream
+
+    # a frame ending with a 1 has its last half bit (a space) in the gap
+    if length % 2:
+        stream <<= 1
+        length += 1
+
+    num_bits = (length - RC6_HEADER_HALF_BITS) // 2
+    if not RC6_MIN_BITS <= num_bits <= RC6_MAX_BITS:
+        return None
+
+    header = _get_bits(stream, length, 0, 4, RC6_BIT_TABLE)
+
+    # missing start bit or a bad transition in the mode bits
+    if header == -1 or not header & 0x8:
+        return None
+
+    mode = header & 0x7
+
+    trailer = (stream >> (length - RC6_HEADER_HALF_BITS)) & 0xF
+    if trailer == 0xC:  # binary 1100
+        trailer_bit = 1
+    elif trailer == 0x3:  # binary 0011
+        trailer_bit = 0
+    else:
+        return None
+
+    device_bits, command_bits = _rc6_field_bits(mode, num_bits)
+
+    device = _get_bits(stream, length, RC6_HEADER_HALF_BITS, device_bits, RC6_BIT_TABLE)
+    command = _get_bits(
+        stream,
+        length,
+        RC6_HEADER_HALF_BITS + (device_bits * 2),
+        command_bits,
+        RC6_BIT_TABLE
+    )
+
+    if device == -1 or command == -1:
+        return None
+
+    if mode == 6 and device == MCE_CODE and num_bits == 32:
+        trailer_bit = command >> 15
+        command &= 0x7FFF
+
+    return mode, trailer_bit, device, command, num_bits
+
+
+def _rc6_name(mode, device, command, num_bits=32):
+    device_bits, command_bits = _rc6_field_bits(mode, num_bits)
+
+    # Check for MCE remote
+    if mode == 6:
+        if device == MCE_CODE and device_bits == 16:
+            if command in MCE_COMMANDS:
+                device = 'MCE.'
+                decoded = MCE_COMMANDS[command]
+            elif command in XBOX360_COMMANDS:
+                device = 'XBox360.'
+                decoded = XBOX360_COMMANDS[command]
             else:
-                decoded = '%04X.%04X' % (device, command)
-                device = 'RC6.06.'
+                device = 'MCE.'
+                decoded = '%04X' % (command,)
+        else:
+            decoded = '%0*X.%0*X' % (
+                device_bits // 4,
+                device,
+                (command_bits + 3) // 4,
+                command
+            )
+            device = 'RC6.06.'
 
-            decoded = device + decoded
+        decoded = device + decoded
 
+    else:
+        decoded = '%02X.' % (device,)
+        if command in COMMANDS:
+            decoded += COMMANDS[command]
+        elif LEGACY_RC6_NAMES:
+            decoded += '%0*X.' % ((command_bits + 3) // 4, command)
         else:
-            device = self.GetBitsLsbLast(8)
-            command = self.GetBitsLsbLast(8)
+            decoded += '%0*X' % ((command_bits + 3) // 4, command)
 
-            decoded = '%02X.' % (device,)
-            if command in COMMANDS:
-                decoded += COMMANDS[command]
+        if mode != 0:
+            if LEGACY_RC6_NAMES:
+                # the old versions did '%02X.'.format(mode), which puts the
+                # format string itself in front of the name
+                decoded = '%02X.' + decoded
             else:
-                decoded += '%02X.' % (command,)
-
-            if mode != 0:
-                decoded = '%02X.'.format(mode) + decoded
-
-        if trailerBit == 1:
-            if RC6IRCode.lastCode is None:
-                RC6IRCode.lastTime = time.clock()
-                RC6IRCode.lastCode = decoded
-            elif RC6IRCode.lastCode == decoded:
-                if (time.clock() - RC6IRCode.lastTime) * 1000 < self.timeout:
-                    RC6IRCode.lastTime = time.clock()
-                    decoded += '.Held'
-                else:
-                    RC6IRCode.lastTime = 0
-                    RC6IRCode.lastCode = None
-                    raise RepeatExpired()
-            else:
-                RC6IRCode.lastTime = time.clock()
-                RC6IRCode.lastCode = decoded
+                decoded = '%02X.' % (mode,) + decoded
 
-        else:
-            RC6IRCode.lastCode = None
-            RC6IRCode.lastTime = 0
+    return decoded
 
-        return decoded
 
-    def GetTrailerBit(self):
-        sample = (
-                self.GetSample() * 8 +
-                self.GetSample() * 4 +
-                self.GetSample() * 2 +
-                self.GetSample()
-        )
-        if sample == 3:  # binary 0011
-            return 0
-        elif sample == 12:  # binary 1100
-            return 1
-        else:
-            raise DecodeError("wrong trailer bit transition")
-
-    def GetBit(self):
-        sample = self.GetSample() * 2 + self.GetSample()
-        if sample == 1:  # binary 01
-            return 0
-        elif sample == 2:  # binary 10
-            return 1
-        else:
-            raise DecodeError("wrong bit transition")
+def _rc6_hold(tracker, mode, toggle, device, command, num_bits, timeout):
+    # returns True if the frame was sent because the button is held
+
+    # the toggle is set on the frames sent while a button is held
+    if toggle == 1:
+        return tracker.press('RC6', (mode, device, command, num_bits), timeout) > 0
+
+    tracker.release('RC6')
+    return False
+
+
+RC6_TIMEOUT = 130
+
+
+class RC6IRCode(DecodedCode):
+    """
+    IR decoder for the Philips RC-6 protocol.
+    """
+
+    __slots__ = ('mode', 'toggle', 'device', 'command', 'num_bits', '_tracker')
+
+    def __init__(self, code, fields=None, repeat=False, tracker=None):
+        code, _ = _get_timings(code, 36000)
+
+        if tracker is None:
+            tracker = default_tracker
+
+        if fields is None:
+            fields = _decode_rc6(code)
+            if fields is None:
+                raise DecodeError('Invalid RC6 code')
+
+            repeat = _rc6_hold(tracker, *fields, timeout=RC6_TIMEOUT)
 
-    def GetBitsLsbFirst(self, numBits=8):
+        super(RC6IRCode, self).__init__(code, 36000, repeat, RC6_TIMEOUT)
+
+        # the fields as they were received, the toggle of an MCE remote
+        # is taken out of the command
+        (
+            self.mode,
+            self.toggle,
+            self.device,
+            self.command,
+            self.num_bits
+        ) = fields
+
+        self._tracker = tracker
+
+    @property
+    def is_button_held(self):
+        return self._tracker.is_held('RC6', self.timeout)
+
+    def _get_name(self):
+        return _rc6_name(self.mode, self.device, self.command, self.num_bits)
+
+
+class ProtocolDecoder(object):
+    """
+    Base class for the protocol decoders :func:`decode` dispatches to.
+
+    A decoder declares the absolute (low, high) range of its header mark
+    and header space in microseconds and the number of timings its frames
+    have (header and the trailing gap included). :func:`decode` only hands
+    a frame to the decoders whose declaration fits it.
+
+    Decoders whose header windows come from a tolerance work them out in
+    :meth:`compile`, which gets called again when the tolerance changes.
+    """
+
+    name = None
+    header_mark = (0, 0)
+    header_space = (0, 0)
+    frame_lengths = ()
+
+    # set to False if the decoder does its own tolerance matching and can
+    # work on the timings before they are cleaned
+    needs_cleaning = True
+
+    def compile(self):
         """
-        Returns numBits count manchester bits with LSB last order.
+        Works out the header windows from the current tolerances.
+
+        It is called every time the dispatch index gets built, that is after
+        a decoder has been registered and after one of the tolerances has
+        been changed.
         """
-        data = 0
-        mask = 1
-        for dummyCounter in range(numBits):
-            data |= mask * self.GetBit()
-            mask <<= 1
-        return data
-
-    def GetBitsLsbLast(self, numBits=8):
+        pass
+
+    def match(self, code):
         """
-        Returns numBits count manchester bits with LSB last order.
+        Returns the fields of the code or ``None`` if the frame is not this
+        protocol.
+
+        The result must only depend on the timings, it gets cached.
         """
-        data = 0
-        for dummyCounter in range(numBits):
-            data <<= 1
-            data |= self.GetBit()
-        return data
-
-    def GetSample(self):
-        if self.bufferLen == 0:
-            if self.pos >= len(self.data):
-                raise DecodeError("not enough timings")
-            self.bufferLen = (
-                    (self.data[self.pos] + 2 * self.halfBitTime / 3) / self.halfBitTime
-            )
-            if self.bufferLen == 0:
-                raise DecodeError("duration too short")
-            self.pos += 1
-            self.bitState = self.pos % 2
-        self.bufferLen -= 1
-        return self.bitState
-
-    def SetData(self, data, pos=0):
+        raise NotImplementedError
+
+    def report(self, code, fields, frequency, tracker):
+        """
+        Returns a ``(status, ir_code)`` tuple for a frame :meth:`match`
+        returned the fields of.
+
+        `tracker` is the :class:`pyWinMCERemote.hold.HoldTracker` the
+        decoder keeps its held button state in.
+
+        status is one of DECODE_OK, DECODE_REPEAT_EXPIRED or DECODE_DUPLICATE
+        """
+        raise NotImplementedError
+
+    def decode(self, code, frequency, tracker):
+        """
+        Returns a ``(status, ir_code)`` tuple, status is DECODE_NO_MATCH if
+        the frame is not this protocol.
+        """
+        fields = self.match(code)
+        if fields is None:
+            return DECODE_NO_MATCH, None
+
+        return self.report(code, fields, frequency, tracker)
+
+
+class RC6Decoder(ProtocolDecoder):
+    name = 'RC6'
+    frame_lengths = range(RC6_MIN_BITS + 6, (RC6_MAX_BITS * 2) + 16)
+
+    def compile(self):
+        # the pronto RC6A encoder sends a leader that is a half bit longer
+        self.header_mark = (
+            timing_window(HEADER_MARK)[0],
+            timing_window(HEADER_MARK + RC6_HALF_BIT_TIME)[1]
+        )
+        self.header_space = timing_window(HEADER_SPACE)
+
+    def match(self, code):
+        return _decode_rc6(code)
+
+    def report(self, code, fields, frequency, tracker):
+        repeat = _rc6_hold(tracker, *fields, timeout=RC6_TIMEOUT)
+
+        return DECODE_OK, RC6IRCode(code, fields, repeat, tracker)
+
+
+NEC_HEADER_MARK = 9000
+NEC_HEADER_SPACE = -4500
+NEC_REPEAT_SPACE = -2250
+NEC_BIT_MARK = 562
+NEC_LOGICAL_0_SPACE = -562
+NEC_LOGICAL_1_SPACE = -1687
+SAMSUNG_HEADER_MARK = 4500
+SAMSUNG_HEADER_SPACE = -4500
+
+# receivers are a lot less accurate with the short NEC pulses then they
+# are with RC6, and the raw timings get matched.
+NEC_TOLERANCE = 35.0
+NEC_TIMEOUT = 150
+
+# NEC_MARK_LOW, NEC_MARK_HIGH, NEC_0_LOW, NEC_0_HIGH, NEC_1_LOW,
+# NEC_1_HIGH and NEC_WINDOWS (mark, logical 0 space and logical 1 space
+# windows) are set by _compile_windows()
+
+
+def _decode_pulse_distance(code, num_bits, windows=None):
+    """
+    Decodes LSB first pulse distance bits (NEC and friends).
+
+    Returns ``-1`` if a mark or a space is out of range.
+    """
+    if windows is None:
+        windows = NEC_WINDOWS
+
+    (
+        (mark_low, mark_high),
+        (zero_low, zero_high),
+        (one_low, one_high)
+    ) = windows
+
+    marks = code[2:3 + (num_bits * 2):2]
+    spaces = code[3:3 + (num_bits * 2):2]
+
+    for mark in marks:
+        if not mark_low <= mark <= mark_high:
+            return -1
+
+    value = 0
+    for i, space in enumerate(spaces):
+        space = -space
+
+        if one_low <= space <= one_high:
+            value |= 1 << i
+        elif not zero_low <= space <= zero_high:
+            return -1
+
+    return value
+
+
+class NECIRCode(DecodedCode):
+    """
+    Decoded NEC, NEC extended or Samsung32 code.
+    """
+
+    __slots__ = ('protocol', 'address', 'command')
+
+    def __init__(self, code, protocol, address, command, repeat=False, frequency=0):
+        super(NECIRCode, self).__init__(code, frequency or 38000, repeat, NEC_TIMEOUT)
+        self.protocol = protocol
+        self.address = address
+        self.command = command
+
+    def _get_name(self):
+        if self.address > 0xFF:
+            return '%s.%04X.%02X' % (self.protocol, self.address, self.command)
+
+        return '%s.%02X.%02X' % (self.protocol, self.address, self.command)
+
+
+class NECDecoder(ProtocolDecoder):
+    name = 'NEC'
+    frame_lengths = (67, 68)
+    needs_cleaning = False
+
+    def compile(self):
+        self.header_mark = timing_window(NEC_HEADER_MARK)
+        self.header_space = timing_window(NEC_HEADER_SPACE)
+
+    def match(self, code):
+        value = _decode_pulse_distance(code, 32)
+        if value == -1:
+            return None
+
+        address = value & 0xFF
+        address_inverted = (value >> 8) & 0xFF
+        command = (value >> 16) & 0xFF
+
+        if command ^ (value >> 24) != 0xFF:
+            return None
+
+        if address ^ address_inverted == 0xFF:
+            protocol = self.name
+        else:
+            # NEC extended uses the whole 16 bits for the address
+            protocol = self.name + 'x'
+            address = value & 0xFFFF
+
+        return protocol, address, command
+
+    def report(self, code, fields, frequency, tracker):
+        protocol, address, command = fields
+
+        # the frames sent while the button is held are repeat frames
+        tracker.release(self.name)
+        tracker.press(self.name, fields, NEC_TIMEOUT)
+
+        return DECODE_OK, NECIRCode(code, protocol, address, command, frequency=frequency)
+
+
+class NECRepeatDecoder(ProtocolDecoder):
+    """
+    The NEC repeat frame, 9ms mark, 2.25ms space and a bit mark.
+
+    It is sent every 108ms for as long as a button is held and gets
+    matched on the header alone.
+    """
+    name = 'NEC'
+    frame_lengths = (3, 4)
+    needs_cleaning = False
+
+    def compile(self):
+        self.header_mark = timing_window(NEC_HEADER_MARK)
+        self.header_space = timing_window(NEC_REPEAT_SPACE)
+
+    def match(self, code):
+        if not NEC_MARK_LOW <= code[2] <= NEC_MARK_HIGH:
+            return None
+
+        # the code comes from the frame before it
+        return ()
+
+    def report(self, code, fields, frequency, tracker):
+        key = tracker.repeat(self.name, NEC_TIMEOUT)
+        if key is None:
+            return DECODE_REPEAT_EXPIRED, None
+
+        protocol, address, command = key
+
+        return DECODE_OK, NECIRCode(
+            code,
+            protocol,
+            address,
+            command,
+            repeat=True,
+            frequency=frequency
+        )
+
+
+class Samsung32Decoder(ProtocolDecoder):
+    name = 'Samsung'
+    frame_lengths = (67, 68)
+    needs_cleaning = False
+
+    def compile(self):
+        self.header_mark = timing_window(SAMSUNG_HEADER_MARK)
+        self.header_space = timing_window(SAMSUNG_HEADER_SPACE)
+
+    def match(self, code):
+        value = _decode_pulse_distance(code, 32)
+        if value == -1:
+            return None
+
+        command = (value >> 16) & 0xFF
+
+        if command ^ (value >> 24) != 0xFF:
+            return None
+
+        # the address byte is sent twice
+        if value & 0xFF == (value >> 8) & 0xFF:
+            address = value & 0xFF
+        else:
+            address = value & 0xFFFF
+
+        return address, command
+
+    def report(self, code, fields, frequency, tracker):
+        address, command = fields
+
+        # samsung remotes repeat the whole frame while a button is held
+        repeat = tracker.press(self.name, fields, NEC_TIMEOUT) > 0
+
+        return DECODE_OK, NECIRCode(
+            code,
+            self.name,
+            address,
+            command,
+            repeat,
+            frequency
+        )
+
+
+# RC5 sends a 1 as space/mark (binary 01) and a 0 as mark/space (binary 10)
+RC5_BIT_TABLE = _build_manchester_table(0x1)
+
+RC5_HALF_BIT_TIME = 889
+RC5_TOLERANCE = 25.0
+RC5_TIMEOUT = 150
+
+# start bit, field bit, toggle bit and 5 system bits
+RC5_HEADER_HALF_BITS = 16
+# RC5X puts a 2 bit long space between the system and the command bits
+RC5X_PAUSE_HALF_BITS = 4
+
+
+def _decode_rc5(code):
+    """
+    Decodes the fields of an RC5 or RC5X frame.
+
+    Returns a ``(protocol, system, command, data, toggle)`` tuple or
+    ``None`` if the timings are not RC5. data is ``None`` for RC5.
+    """
+    needed = RC5_HEADER_HALF_BITS + RC5X_PAUSE_HALF_BITS + 24
+    stream = _half_bit_stream(code, RC5_HALF_BIT_TIME, 0, needed)
+    if stream is None:
+        return None
+
+    stream, length = stream
+
+    # the first half of the start bit is a space, the receiver never sees it
+    length += 1
+
+    header = _get_bits(stream, length, 0, 8, RC5_BIT_TABLE)
+    if header == -1 or not header & 0x80:
+        return None
+
+    # the field bit is the inverted 7th command bit
+    command = ~header & 0x40
+    toggle = (header >> 5) & 0x1
+    system = header & 0x1F
+
+    pause_shift = length - RC5_HEADER_HALF_BITS - RC5X_PAUSE_HALF_BITS
+    if pause_shift >= 0 and not (stream >> pause_shift) & 0xF:
+        protocol = 'RC5X'
+        value = _get_bits(
+            stream,
+            length,
+            RC5_HEADER_HALF_BITS + RC5X_PAUSE_HALF_BITS,
+            12,
+            RC5_BIT_TABLE
+        )
+        if value == -1:
+            return None
+
+        command |= value >> 6
+        data = value & 0x3F
+    else:
+        protocol = 'RC5'
+        value = _get_bits(stream, length, RC5_HEADER_HALF_BITS, 6, RC5_BIT_TABLE)
+        if value == -1:
+            return None
+
+        command |= value
+        data = None
+
+    return protocol, system, command, data, toggle
+
+
+class RC5IRCode(DecodedCode):
+    """
+    Decoded RC5 or RC5X code.
+
+    A remote flips the toggle bit every time a button is pressed and keeps
+    it while the button is held, that is how a held button is told apart
+    from a new press.
+    """
+
+    __slots__ = ('protocol', 'system', 'command', 'data', 'toggle')
+
+    def __init__(self, code, protocol, system, command, data=None, toggle=0, repeat=False, frequency=0):
+        super(RC5IRCode, self).__init__(code, frequency or 36000, repeat, RC5_TIMEOUT)
+        self.protocol = protocol
+        self.system = system
+        self.command = command
         self.data = data
-        self.pos = pos
-        self.bufferLen = 0
-        self.bitState = 0
+        self.toggle = toggle
+
+    def _get_name(self):
+        if self.data is None:
+            return '%s.%02X.%02X' % (self.protocol, self.system, self.command)
+
+        return '%s.%02X.%02X.%02X' % (
+            self.protocol,
+            self.system,
+            self.command,
+            self.data
+        )
+
+
+class RC5Decoder(ProtocolDecoder):
+    """
+    RC5 and RC5X.
+
+    The timings get turned into half bits which already takes care of the
+    tolerance, so the frames are decoded before they are cleaned. The first
+    mark and space are one or two half bits long depending on the field bit.
+    """
+    name = 'RC5'
+    frame_lengths = range(12, 46)
+    needs_cleaning = False
+
+    def compile(self):
+        self.header_mark = (
+            timing_window(RC5_HALF_BIT_TIME, RC5_TOLERANCE)[0],
+            timing_window(RC5_HALF_BIT_TIME * 2, RC5_TOLERANCE)[1]
+        )
+        self.header_space = self.header_mark
+
+    def match(self, code):
+        return _decode_rc5(code)
+
+    def report(self, code, fields, frequency, tracker):
+        protocol, system, command, data, toggle = fields
+        key = (protocol, system, command, data)
+        repeat = tracker.press(self.name, key, RC5_TIMEOUT, toggle) > 0
+
+        return DECODE_OK, RC5IRCode(
+            code,
+            protocol,
+            system,
+            command,
+            data,
+            toggle,
+            repeat,
+            frequency
+        )
+
+
+SONY_HEADER_MARK = 2400
+SONY_HEADER_SPACE = -600
+SONY_LOGICAL_0_MARK = 600
+SONY_LOGICAL_1_MARK = 1200
+SONY_BIT_SPACE = -600
+SONY_TOLERANCE = 25.0
+SONY_TIMEOUT = 100
+
+# a sony remote sends every code at least 3 times
+SONY_MIN_FRAMES = 3
+
+# number of timings (header and gap included) -> number of bits
+SONY_FRAME_BITS = {
+    25: 12,
+    26: 12,
+    31: 15,
+    32: 15,
+    41: 20,
+    42: 20
+}
+
+# SONY_0_LOW, SONY_0_HIGH, SONY_1_LOW, SONY_1_HIGH, SONY_SPACE_LOW and
+# SONY_SPACE_HIGH are set by _compile_windows()
+
+
+def _decode_pulse_width(code, num_bits):
+    """
+    Decodes LSB first pulse width bits (Sony SIRC).
+
+    Returns ``-1`` if a mark or a space is out of range.
+    """
+    marks = code[2:2 + (num_bits * 2):2]
+    # the space after the last bit is the gap
+    spaces = code[3:1 + (num_bits * 2):2]
+
+    for space in spaces:
+        if not SONY_SPACE_LOW <= -space <= SONY_SPACE_HIGH:
+            return -1
+
+    value = 0
+    for i, mark in enumerate(marks):
+        if SONY_1_LOW <= mark <= SONY_1_HIGH:
+            value |= 1 << i
+        elif not SONY_0_LOW <= mark <= SONY_0_HIGH:
+            return -1
+
+    return value
+
+
+class SonyIRCode(DecodedCode):
+    """
+    Decoded Sony SIRC 12, 15 or 20 bit code.
+    """
+
+    __slots__ = ('protocol', 'device', 'command', 'extended')
+
+    def __init__(self, code, protocol, device, command, extended=None, repeat=False, frequency=0):
+        super(SonyIRCode, self).__init__(code, frequency or 40000, repeat, SONY_TIMEOUT)
+        self.protocol = protocol
+        self.device = device
+        self.command = command
+        self.extended = extended
+
+    def _get_name(self):
+        if self.extended is None:
+            return '%s.%02X.%02X' % (self.protocol, self.device, self.command)
+
+        return '%s.%02X.%02X.%02X' % (
+            self.protocol,
+            self.device,
+            self.extended,
+            self.command
+        )
+
+
+class SonyDecoder(ProtocolDecoder):
+    """
+    Sony SIRC.
+
+    The number of bits is known from the frame length before a single bit
+    is looked at. The first frames of the burst a remote always sends are
+    dropped, only the first one and the frames after them (the button is
+    being held) are reported.
+    """
+    name = 'Sony'
+    frame_lengths = tuple(sorted(SONY_FRAME_BITS))
+    needs_cleaning = False
+
+    def compile(self):
+        self.header_mark = timing_window(SONY_HEADER_MARK, SONY_TOLERANCE)
+        self.header_space = timing_window(SONY_HEADER_SPACE, SONY_TOLERANCE)
+
+    def match(self, code):
+        num_bits = SONY_FRAME_BITS.get(len(code))
+        if num_bits is None:
+            return None
+
+        value = _decode_pulse_width(code, num_bits)
+        if value == -1:
+            return None
+
+        command = value & 0x7F
+        extended = None
+
+        if num_bits == 20:
+            device = (value >> 7) & 0x1F
+            extended = value >> 12
+        else:
+            device = value >> 7
+
+        return self.name + str(num_bits), device, extended, command
+
+    def report(self, code, fields, frequency, tracker):
+        protocol, device, extended, command = fields
+        count = tracker.press(self.name, fields, SONY_TIMEOUT)
+
+        if 0 < count < SONY_MIN_FRAMES:
+            return DECODE_DUPLICATE, None
+
+        repeat = count > 0
+
+        return DECODE_OK, SonyIRCode(
+            code,
+            protocol,
+            device,
+            command,
+            extended,
+            repeat,
+            frequency
+        )
+
+
+KASEIKYO_HEADER_MARK = 3456
+KASEIKYO_HEADER_SPACE = -1728
+KASEIKYO_BIT_MARK = 432
+KASEIKYO_LOGICAL_0_SPACE = -432
+KASEIKYO_LOGICAL_1_SPACE = -1296
+KASEIKYO_TOLERANCE = 35.0
+KASEIKYO_TIMEOUT = 150
+
+# KASEIKYO_WINDOWS is set by _compile_windows()
+
+KASEIKYO_VENDORS = {
+    0x2002: 'Panasonic',
+    0x3254: 'Denon',
+    0x0103: 'JVC',
+    0xCB23: 'Mitsubishi',
+    0x5AAA: 'Sharp'
+}
+
+# xor of the 2 nibbles of a byte
+NIBBLE_PARITY = [(byte >> 4) ^ (byte & 0xF) for byte in range(256)]
+
+
+class KaseikyoIRCode(DecodedCode):
+    """
+    Decoded Kaseikyo (Panasonic, Denon, JVC, Mitsubishi, Sharp) code.
+    """
+
+    __slots__ = ('vendor', 'device', 'subdevice', 'function')
+
+    def __init__(self, code, vendor, device, subdevice, function, repeat=False, frequency=0):
+        super(KaseikyoIRCode, self).__init__(code, frequency or 37000, repeat, KASEIKYO_TIMEOUT)
+        self.vendor = vendor
+        self.device = device
+        self.subdevice = subdevice
+        self.function = function
+
+    @property
+    def vendor_name(self):
+        return KASEIKYO_VENDORS.get(self.vendor, None)
+
+    def _get_name(self):
+        vendor = self.vendor_name
+        if vendor is None:
+            vendor = 'Kaseikyo.%04X' % (self.vendor,)
+
+        return '%s.%02X.%02X.%02X' % (
+            vendor,
+            self.device,
+            self.subdevice,
+            self.function
+        )
+
+
+class KaseikyoDecoder(ProtocolDecoder):
+    """
+    48 bit Kaseikyo.
+
+    16 bit vendor id, 4 bit vendor id parity, 4 bit device, 8 bit sub
+    device, 8 bit function and a parity byte, all LSB first.
+    """
+    name = 'Kaseikyo'
+    frame_lengths = (99, 100)
+    needs_cleaning = False
+
+    def compile(self):
+        self.header_mark = timing_window(KASEIKYO_HEADER_MARK, KASEIKYO_TOLERANCE)
+        self.header_space = timing_window(KASEIKYO_HEADER_SPACE, KASEIKYO_TOLERANCE)
+
+    def match(self, code):
+        value = _decode_pulse_distance(code, 48, KASEIKYO_WINDOWS)
+        if value == -1:
+            return None
+
+        vendor = value & 0xFFFF
+        parity = NIBBLE_PARITY[vendor & 0xFF] ^ NIBBLE_PARITY[vendor >> 8]
+
+        if (value >> 16) & 0xF != parity:
+            return None
+
+        # the last byte is the xor of the 3 before it
+        if (
+            ((value >> 16) ^ (value >> 24) ^ (value >> 32)) & 0xFF !=
+            (value >> 40) & 0xFF
+        ):
+            return None
+
+        device = (value >> 20) & 0xF
+        subdevice = (value >> 24) & 0xFF
+        function = (value >> 32) & 0xFF
+
+        return vendor, device, subdevice, function
+
+    def report(self, code, fields, frequency, tracker):
+        vendor, device, subdevice, function = fields
+        repeat = tracker.press(self.name, fields, KASEIKYO_TIMEOUT) > 0
+
+        return DECODE_OK, KaseikyoIRCode(
+            code,
+            vendor,
+            device,
+            subdevice,
+            function,
+            repeat,
+            frequency
+        )
+
+
+# used by the streams that do not have a tracker of their own
+default_tracker = hold.HoldTracker()
+
+
+# width of the buckets the header durations get quantised into
+HEADER_QUANTUM = 100
+
+_decoders = []
+
+# (raw index, clean index). Built by the first decode() after a decoder
+# has been registered or unregistered or a tolerance has changed.
+_index = None
+
+# the tolerances the windows and the index were built with
+_index_tolerances = None
+
+
+def _get_tolerances():
+    return (
+        TIMING_TOLERANCE,
+        NEC_TOLERANCE,
+        RC5_TOLERANCE,
+        SONY_TOLERANCE,
+        KASEIKYO_TOLERANCE
+    )
+
+
+def _compile_windows():
+    """
+    Works out the bit timing windows from the current tolerances.
+    """
+    global NEC_MARK_LOW, NEC_MARK_HIGH, NEC_0_LOW, NEC_0_HIGH
+    global NEC_1_LOW, NEC_1_HIGH, NEC_WINDOWS
+    global SONY_0_LOW, SONY_0_HIGH, SONY_1_LOW, SONY_1_HIGH
+    global SONY_SPACE_LOW, SONY_SPACE_HIGH
+    global KASEIKYO_WINDOWS
+
+    NEC_MARK_LOW, NEC_MARK_HIGH = timing_window(NEC_BIT_MARK, NEC_TOLERANCE)
+    NEC_0_LOW, NEC_0_HIGH = timing_window(NEC_LOGICAL_0_SPACE, NEC_TOLERANCE)
+    NEC_1_LOW, NEC_1_HIGH = timing_window(NEC_LOGICAL_1_SPACE, NEC_TOLERANCE)
+
+    NEC_WINDOWS = (
+        (NEC_MARK_LOW, NEC_MARK_HIGH),
+        (NEC_0_LOW, NEC_0_HIGH),
+        (NEC_1_LOW, NEC_1_HIGH)
+    )
+
+    SONY_0_LOW, SONY_0_HIGH = timing_window(SONY_LOGICAL_0_MARK, SONY_TOLERANCE)
+    SONY_1_LOW, SONY_1_HIGH = timing_window(SONY_LOGICAL_1_MARK, SONY_TOLERANCE)
+    SONY_SPACE_LOW, SONY_SPACE_HIGH = timing_window(SONY_BIT_SPACE, SONY_TOLERANCE)
+
+    KASEIKYO_WINDOWS = (
+        timing_window(KASEIKYO_BIT_MARK, KASEIKYO_TOLERANCE),
+        timing_window(KASEIKYO_LOGICAL_0_SPACE, KASEIKYO_TOLERANCE),
+        timing_window(KASEIKYO_LOGICAL_1_SPACE, KASEIKYO_TOLERANCE)
+    )
+
+
+_compile_windows()
+
+
+def _build_index():
+    raw_index = {}
+    clean_index = {}
+
+    _compile_windows()
+
+    for protocol_decoder in _decoders:
+        protocol_decoder.compile()
+
+        if protocol_decoder.needs_cleaning:
+            index = clean_index
+        else:
+            index = raw_index
+
+        mark_low, mark_high = protocol_decoder.header_mark
+        space_low, space_high = protocol_decoder.header_space
+
+        for mark in range(mark_low // HEADER_QUANTUM, (mark_high // HEADER_QUANTUM) + 1):
+            for space in range(space_low // HEADER_QUANTUM, (space_high // HEADER_QUANTUM) + 1):
+                for length in protocol_decoder.frame_lengths:
+                    key = (mark, space, length)
+                    index.setdefault(key, []).append(protocol_decoder)
+
+    return raw_index, clean_index
+
+
+def _get_index():
+    global _index
+    global _index_tolerances
+
+    index = _index
+    tolerances = _get_tolerances()
+
+    if index is None or tolerances != _index_tolerances:
+        index = _index = _build_index()
+        _index_tolerances = tolerances
+
+    return index
+
+
+def _get_candidates(index, code):
+    if len(code) < 2:
+        return ()
+
+    return index.get(
+        (
+            abs(code[0]) // HEADER_QUANTUM,
+            abs(code[1]) // HEADER_QUANTUM,
+            len(code)
+        ),
+        ()
+    )
+
+
+def register_decoder(protocol_decoder):
+    """
+    Adds a :class:`ProtocolDecoder` instance to the ones :func:`decode` uses.
+    """
+    global _index
+
+    if protocol_decoder not in _decoders:
+        _decoders.append(protocol_decoder)
+        _index = None
+
+
+def unregister_decoder(protocol_decoder):
+    global _index
+
+    if protocol_decoder in _decoders:
+        _decoders.remove(protocol_decoder)
+        _index = None
+
+
+def get_decoders():
+    return _decoders[:]
+
+
+register_decoder(RC6Decoder())
+register_decoder(NECDecoder())
+register_decoder(NECRepeatDecoder())
+register_decoder(Samsung32Decoder())
+register_decoder(RC5Decoder())
+register_decoder(SonyDecoder())
+register_decoder(KaseikyoDecoder())
+
+
+RC6_BIT_TIMINGS = TimingTable(
+    (
+        LOGICAL_0_MARK,
+        LOGICAL_0_SPACE,
+        LOGICAL_1_MARK,
+        LOGICAL_1_SPACE,
+        TRAILER_LOGIC_0_MARK,
+        TRAILER_LOGIC_0_SPACE,
+        TRAILER_LOGIC_1_MARK,
+        TRAILER_LOGIC_1_SPACE
+    )
+)
+
+RC6_BURST_PAIRS = frozenset((
+    (LOGICAL_0_MARK, LOGICAL_0_SPACE),
+    (LOGICAL_1_MARK, LOGICAL_1_SPACE),
+    (TRAILER_LOGIC_0_MARK, TRAILER_LOGIC_0_SPACE),
+    (TRAILER_LOGIC_1_MARK, TRAILER_LOGIC_1_SPACE)
+))
 
 
 def normalize_raw_code(code):
-    code = CodeWrapper(code[:])
+    code = Frame(code)
 
     if TIMING_MATCH(code.header_mark, HEADER_MARK):
         code.header_mark = HEADER_MARK
@@ -539,36 +1801,16 @@ def normalize_raw_code(code):
     if code.footer_space >= -HEADER_MARK:
         raise ValueError('Invalid footer space')
 
-    for i in range(code.bits):
-        mark, space = code.get_burst_pair(i)
-
-        if (
-                TIMING_MATCH(mark, LOGICAL_0_MARK) and
-                TIMING_MATCH(space, LOGICAL_0_SPACE)
-        ):
-            code.set_burst_pair(i, LOGICAL_0_MARK, LOGICAL_0_SPACE)
+    end = 2 + (code.bits * 2)
 
-        elif (
-                TIMING_MATCH(mark, LOGICAL_1_MARK) and
-                TIMING_MATCH(space, LOGICAL_1_SPACE)
-        ):
-            code.set_burst_pair(i, LOGICAL_1_MARK, LOGICAL_1_SPACE)
-
-        elif (
-                TIMING_MATCH(mark, TRAILER_LOGIC_0_MARK) and
-                TIMING_MATCH(space, TRAILER_LOGIC_0_SPACE)
-        ):
-            code.set_burst_pair(i, TRAILER_LOGIC_0_MARK, TRAILER_LOGIC_0_SPACE)
+    # snap every burst pair timing in one go and then check the pairs
+    get = RC6_BIT_TIMINGS.get_table().get
+    snapped = [get(timing) for timing in code[2:end]]
 
-        elif (
-                TIMING_MATCH(mark, TRAILER_LOGIC_1_MARK) and
-                TIMING_MATCH(space, TRAILER_LOGIC_1_SPACE)
-        ):
-            code.set_burst_pair(i, TRAILER_LOGIC_1_MARK, TRAILER_LOGIC_1_SPACE)
-
-        else:
+    for pair in zip(snapped[0::2], snapped[1::2]):
+        if pair not in RC6_BURST_PAIRS:
             raise ValueError('Invalid code')
 
-    return code
-
+    code[2:end] = array.array('i', snapped)
 
+    return code
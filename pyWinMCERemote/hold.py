@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of EventGhost.
+# Copyright © 2005-2019 EventGhost Project <http://www.eventghost.org/>
+#
+# EventGhost is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 2 of the License, or (at your option)
+# any later version.
+#
+# EventGhost is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with EventGhost. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This file is part of the **pyWinMCERemote**
+project https://github.com/kdschlosser/pyWinMCERemote
+
+:platform: any
+:license: GPL version 2 or newer
+:synopsis: held button/repeat tracking
+
+.. moduleauthor:: Kevin Schlosser @kdschlosser <kevin.g.schlosser@gmail.com>
+"""
+
+import time
+
+# time.clock was removed in Python 3.8
+try:
+    default_clock = time.perf_counter
+except AttributeError:
+    default_clock = time.clock
+
+
+class HoldTracker(object):
+    """
+    Keeps track of the last code seen for each protocol.
+
+    This is what tells a held button apart from a new press. Use one
+    instance per receive stream (an IRDevice, a capture being replayed).
+    There is no locking, an instance must only be used by one thread at a
+    time.
+
+    `clock` is a function returning seconds as a float, it can be swapped
+    out to replay captures or benchmark with a known timeline.
+    """
+
+    def __init__(self, clock=None):
+        if clock is None:
+            clock = default_clock
+
+        self.clock = clock
+        # protocol -> [key, toggle, time, count]
+        self._states = {}
+
+    def reset(self):
+        self._states.clear()
+
+    def press(self, protocol, key, timeout, toggle=None):
+        """
+        Records a frame that carries a code.
+
+        Returns the number of frames in a row before this one with the same
+        key and toggle that each came within `timeout` milliseconds of the
+        one before it. ``0`` is a new press.
+        """
+        now = self.clock()
+        state = self._states.get(protocol)
+
+        if (
+            state is not None and
+            state[0] == key and
+            state[1] == toggle and
+            (now - state[2]) * 1000 < timeout
+        ):
+            state[2] = now
+            state[3] += 1
+            return state[3]
+
+        self._states[protocol] = [key, toggle, now, 0]
+        return 0
+
+    def repeat(self, protocol, timeout):
+        """
+        Records a repeat frame (a frame that carries no code).
+
+        Returns the key of the code being repeated or ``None`` if there is
+        none or it is older then `timeout` milliseconds.
+        """
+        now = self.clock()
+        state = self._states.get(protocol)
+
+        if state is None:
+            return None
+
+        if (now - state[2]) * 1000 >= timeout:
+            del self._states[protocol]
+            return None
+
+        state[2] = now
+        state[3] += 1
+        return state[0]
+
+    def release(self, protocol):
+        """
+        Forgets the last code of a protocol, the next one is a new press.
+        """
+        self._states.pop(protocol, None)
+
+    def is_held(self, protocol, timeout):
+        state = self._states.get(protocol)
+
+        if state is None:
+            return False
+
+        return (self.clock() - state[2]) * 1000 < timeout
@@ -47,13 +47,19 @@ from .handleapi_h import *
 from . import pronto
 from . import utils
 from . import decoder
+from . import usb_ids
+from . import hold
 
 import os
 import ctypes
 import threading
 import six
-import _winreg
-import requests
+
+try:
+    import _winreg
+except ImportError:
+    import winreg as _winreg
+
 from ctypes.wintypes import (
     LPVOID,
     BOOL,
@@ -64,44 +70,6 @@ from ctypes.wintypes import (
 )
 
 
-response = requests.get('http://www.linux-usb.org/usb.ids')
-ids = response.content
-
-DEVICE_MAPPING = {}
-
-current_vendor = {}
-
-for line in ids.split('\n'):
-    if not line.strip():
-        continue
-
-    if line.startswith('#'):
-        continue
-
-    if not line.startswith('\t'):
-        vid, mfg_name = list(item.strip() for item in line.split(' ', 1))
-        try:
-            vid = int('0x' + vid, 16)
-        except ValueError:
-            current_vendor = None
-            continue
-
-        current_vendor = {}
-        DEVICE_MAPPING[vid] = dict(
-            name=mfg_name,
-            devices=current_vendor
-        )
-    elif current_vendor is not None:
-        line = line.strip()
-        pid, product_name = list(item.strip() for item in line.split(' ', 1))
-        try:
-            pid = int('0x' + pid, 16)
-        except ValueError:
-            continue
-
-        current_vendor[pid] = product_name
-
-
 BASE_PATH = os.path.dirname(__file__)
 
 os.environ['PATH'] = ';'.join([item for item in os.environ['PATH'].split(';') if item.strip()] + [BASE_PATH])
@@ -694,27 +662,36 @@ class IRDevice(object):
         self._process_thread = None
         self._callbacks = []
         self._process_queue = []
+        self._normalizer = utils.TimingNormalizer(decoder.TIMING_TOLERANCE)
+        self._tracker = hold.HoldTracker()
+        self._cache = decoder.DecodeCache()
+        self._transmit_buffer = None
+        self._transmit_lock = threading.Lock()
         self.use_alternate_receive = True
         self.packet_size = 100
         self.hEvent = None
 
+    @property
+    def decode_cache(self):
+        """
+        The :class:`pyWinMCERemote.decoder.DecodeCache` of the received
+        frames, it has the hit counters.
+        """
+        return self._cache
+
     @property
     def manufacturer(self):
-        vid = int(self.vid, 16)
-        if vid in DEVICE_MAPPING:
-            return DEVICE_MAPPING[vid]['name']
+        name = usb_ids.get_vendor_name(int(self.vid, 16))
+        if name is not None:
+            return name
 
         return self._manufacturer
 
     @property
     def model(self):
-        vid = int(self.vid, 16)
-        pid = int(self.pid, 16)
-
-        if vid in DEVICE_MAPPING:
-            vendor = DEVICE_MAPPING[vid]
-            if pid in vendor['devices']:
-                return vendor['devices'][pid]
+        name = usb_ids.get_product_name(int(self.vid, 16), int(self.pid, 16))
+        if name is not None:
+            return name
 
         return self._model
 
@@ -787,12 +764,19 @@ class IRDevice(object):
 
                     if item < -6500:
                         if len(result) > 5:
-                            code = decoder.decode(frequency, result[:])
+                            code = decoder.decode(
+                                frequency,
+                                result,
+                                normalizer=self._normalizer,
+                                tracker=self._tracker,
+                                cache=self._cache
+                            )
                             if code is not None:
                                 for callback in self._callbacks[:]:
                                     callback(code)
 
-                        del result[:]
+                        # the decoded code can hold on to the list
+                        result = []
                         frequency = 0
 
             self._process_event.wait()
@@ -1137,7 +1121,15 @@ class IRDevice(object):
 
                     if item < -6500:
                         if len(result) > 5:
-                            code = decoder.decode(frequency, result[:])
+                            # a learned code is a one off, it gets a tracker
+                            # of its own so the held button state of the
+                            # receive loop and of other devices is left alone
+                            code = decoder.decode(
+                                frequency,
+                                result[:],
+                                normalizer=self._normalizer,
+                                tracker=hold.HoldTracker()
+                            )
                             exit_learn()
                             return code
                             
@@ -1181,27 +1173,36 @@ class IRDevice(object):
         inBuffer.Flags = IR_ULONG_PTR(0)
         inBuffer.PulseSize = IR_ULONG_PTR(0)
 
-        outBuffer = IR_TRANSMIT_CHUNK()
-        outBuffer.OffsetToNextChunk = IR_ULONG_PTR(0)
-        outBuffer.RepeatCount = IR_ULONG_PTR(1)
-        outBuffer.ByteCount = IR_ULONG_PTR(len(rlc))
-        outBuffer.Data = (LONG * len(rlc))(*rlc)
+        buffer, size = pronto.pack_transmit_chunk(rlc)
+        outBuffer = (ctypes.c_char * size).from_buffer(buffer)
 
         ports = {}
         for port in self.tx_ports:
             inBuffer.TransmitPortMask = IR_ULONG_PTR(0 | (1 << port))
 
             with self.handle as hDevice:
-                ports[port] = _io_control(IOCTL_IR_TRANSMIT, hDevice, ctypes.byref(inBuffer), ctypes.byref(outBuffer))
+                ports[port] = _io_control(IOCTL_IR_TRANSMIT, hDevice, inBuffer, outBuffer)
 
         return ports
 
-    def transmit(self, rlc, frequency=0, port=-1):
+    def transmit(self, rlc, frequency=0, port=-1, repeat_count=0):
+        """
+        Sends a code, `repeat_count` is the number of extra times it is
+        sent, which is how a held button is sent.
+
+        A pronto code is expanded with its repeat sequence, anything else
+        is handed to the driver once along with the repeat count. Either
+        way it is one buffer and one call to the driver.
+        """
         if isinstance(rlc, (list, tuple)):
             rlc = utils.clean_code(rlc, decoder.TIMING_TOLERANCE)
-        elif isinstance(rlc, (decoder.RC6IRCode, decoder.IrCode)):
+        elif isinstance(rlc, decoder.DecodedCode):
             frequency = rlc.frequency
             rlc = rlc.rlc_code
+        elif isinstance(rlc, six.string_types):
+            # compact pronto codes only get expanded when they are sent
+            frequency, rlc = pronto.pronto_to_mce(rlc, repeat_count)
+            repeat_count = 0
 
         inBuffer = IR_TRANSMIT_PARAMS()
         inBuffer.TransmitPortMask = IR_ULONG_PTR(0)
@@ -1209,12 +1210,6 @@ class IRDevice(object):
         inBuffer.Flags = IR_ULONG_PTR(0)
         inBuffer.PulseSize = IR_ULONG_PTR(0)
 
-        outBuffer = IR_TRANSMIT_CHUNK()
-        outBuffer.OffsetToNextChunk = IR_ULONG_PTR(0)
-        outBuffer.RepeatCount = IR_ULONG_PTR(0)
-        outBuffer.ByteCount = IR_ULONG_PTR(len(rlc))
-        outBuffer.Data = (LONG * len(rlc))(*rlc)
-
         if port == -1:
             ports = 0
 
@@ -1229,8 +1224,21 @@ class IRDevice(object):
         else:
             return False
 
-        with self.handle as hDevice:
-            _io_control(IOCTL_IR_TRANSMIT, hDevice, ctypes.byref(inBuffer), ctypes.byref(outBuffer))
+        # the chunk is packed straight into a buffer that gets used again
+        # for the next code, the driver gets handed that same memory.
+        with self._transmit_lock:
+            self._transmit_buffer, size = pronto.pack_transmit_chunk(
+                rlc,
+                repeat_count,
+                self._transmit_buffer
+            )
+            outBuffer = (ctypes.c_char * size).from_buffer(self._transmit_buffer)
+
+            with self.handle as hDevice:
+                _io_control(IOCTL_IR_TRANSMIT, hDevice, inBuffer, outBuffer)
+
+            # the buffer can not grow while a view of it exists
+            del outBuffer
 
         return True
 
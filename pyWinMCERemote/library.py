@@ -0,0 +1,273 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of EventGhost.
+# Copyright © 2005-2019 EventGhost Project <http://www.eventghost.org/>
+#
+# EventGhost is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 2 of the License, or (at your option)
+# any later version.
+#
+# EventGhost is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with EventGhost. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This file is part of the **pyWinMCERemote**
+project https://github.com/kdschlosser/pyWinMCERemote
+
+:platform: Windows
+:license: GPL version 2 or newer
+:synopsis: learned code library lookups
+
+.. moduleauthor:: Kevin Schlosser @kdschlosser <kevin.g.schlosser@gmail.com>
+
+Learned codes are filed by frame length, carrier (in kHz) and a coarse
+signature. The signature is the rank of every timing among the groups of
+marks or spaces of the frame that are within the library tolerance of each
+other, so captures of the same button made at different times file under
+the same signature even though none of their timings are exactly the same.
+A lookup only compares the frame against the handful of codes filed in the
+same place, timing by timing with a tolerance, no matter how many codes the
+library has.
+"""
+
+import math
+import array
+from . import decoder
+from . import utils
+
+
+# percent a timing is allowed to be off from the learned one
+LIBRARY_TOLERANCE = 25.0
+
+# microseconds a timing is always allowed to be off, the receivers only
+# report in 50us steps
+LIBRARY_SLACK = 100
+
+
+def _get_timings(code, frequency):
+    if isinstance(code, decoder.DecodedCode):
+        if frequency is None:
+            frequency = code.frequency
+
+        code = code.rlc_code
+
+    timings = decoder.Frame(code)
+
+    # the gap after the frame is however long the remote waited
+    if timings and timings[-1] < -utils.FRAME_GAP:
+        timings = timings[:-1]
+
+    return timings, frequency or 0
+
+
+def get_signature(timings, tolerance=LIBRARY_TOLERANCE, slack=LIBRARY_SLACK):
+    """
+    Returns the coarse signature of a frame.
+
+    The marks and the spaces are put into groups. Going from short to long
+    a timing joins the group of the one before it unless it is more then
+    `tolerance` percent and `slack` microseconds longer. Marks are numbered
+    by their group starting at 0 for the shortest, spaces the same way
+    starting at -1. Jitter moves timings around inside their group, it
+    does not change the signature.
+    """
+    high_threshold = 1.0 + (tolerance / 100.0)
+    ranks = {}
+
+    for sign in (1, -1):
+        rank = 0
+        last = None
+
+        for value in sorted(set(t * sign for t in timings if t * sign > 0)):
+            if (
+                last is not None and
+                value > max(last * high_threshold, last + slack)
+            ):
+                rank += 1
+
+            last = value
+
+            if sign == 1:
+                ranks[value] = rank
+            else:
+                ranks[-value] = -rank - 1
+
+    return array.array('h', [ranks[t] for t in timings]).tobytes()
+
+
+class CodeLibrary(object):
+    """
+    Index of learned codes for telling which one a received frame is.
+
+    Codes are added with :meth:`add`, either decoded codes (the
+    ``rlc_code`` and ``frequency`` get used) or timing lists, along with the
+    value :meth:`find` hands back for them.
+    """
+
+    def __init__(
+        self,
+        tolerance=LIBRARY_TOLERANCE,
+        slack=LIBRARY_SLACK,
+        frequency_tolerance=2000
+    ):
+        self.tolerance = tolerance
+        self.slack = slack
+        self.frequency_tolerance = frequency_tolerance
+        # (length, signature) ->
+        #     {carrier kHz: [(timings, frequency, value, order)]}
+        self._buckets = {}
+        # length -> [(timings, frequency, value, order)]
+        self._lengths = {}
+        self._count = 0
+        self._order = 0
+
+    def __len__(self):
+        return self._count
+
+    def clear(self):
+        self._buckets.clear()
+        self._lengths.clear()
+        self._count = 0
+
+    def add(self, code, value=None, frequency=None):
+        """
+        Adds a learned code, `value` defaults to the code.
+        """
+        if value is None:
+            value = code
+
+        timings, frequency = _get_timings(code, frequency)
+        entry = (timings, frequency, value, self._order)
+        self._order += 1
+
+        carriers = self._buckets.setdefault(
+            (len(timings), self.get_signature(timings)),
+            {}
+        )
+        carriers.setdefault(int(round(frequency / 1000.0)), []).append(entry)
+        self._lengths.setdefault(len(timings), []).append(entry)
+        self._count += 1
+
+    def remove(self, value):
+        """
+        Removes every code that was added with `value`.
+        """
+        for key, carriers in list(self._buckets.items()):
+            for carrier, entries in list(carriers.items()):
+                entries[:] = [e for e in entries if e[2] != value]
+
+                if not entries:
+                    del carriers[carrier]
+
+            if not carriers:
+                del self._buckets[key]
+
+        for length, entries in list(self._lengths.items()):
+            count = len(entries)
+            entries[:] = [e for e in entries if e[2] != value]
+            self._count -= count - len(entries)
+
+            if not entries:
+                del self._lengths[length]
+
+    def _get_candidates(self, timings, frequency):
+        carriers = self._buckets.get(
+            (len(timings), self.get_signature(timings)),
+            {}
+        )
+
+        if not frequency:
+            for entries in carriers.values():
+                for entry in entries:
+                    yield entry
+            return
+
+        carrier = int(round(frequency / 1000.0))
+        span = int(math.ceil(self.frequency_tolerance / 1000.0))
+
+        # codes learned without a carrier match any carrier
+        for entry in carriers.get(0, ()):
+            yield entry
+
+        for i in range(max(1, carrier - span), carrier + span + 1):
+            for entry in carriers.get(i, ()):
+                yield entry
+
+    def get_signature(self, timings):
+        return get_signature(timings, self.tolerance, self.slack)
+
+    def get_distance(self, timings, learned):
+        """
+        Returns the sum of the differences between two frames of the same
+        length or ``-1`` if a timing is off by more then the tolerance.
+        """
+        tolerance = self.tolerance / 100.0
+        slack = self.slack
+        distance = 0
+
+        for a, b in zip(timings, learned):
+            if (a < 0) != (b < 0):
+                return -1
+
+            diff = abs(a - b)
+            if diff > max(abs(b) * tolerance, slack):
+                return -1
+
+            distance += diff
+
+        return distance
+
+    def find(self, code, frequency=None, exhaustive=False):
+        """
+        Returns the value of the learned code closest to `code` or ``None``.
+        If codes are the same distance away the one added first wins.
+
+        Only the codes with the same signature are looked at unless
+        `exhaustive` is set, then the codes of the same length are checked
+        if none of those match.
+        """
+        timings, frequency = _get_timings(code, frequency)
+
+        best = None
+
+        for entry in self._get_candidates(timings, frequency):
+            best = self._compare(timings, entry, best)
+
+        if best is None and exhaustive:
+            frequency_tolerance = self.frequency_tolerance
+
+            for entry in self._lengths.get(len(timings), ()):
+                learned_frequency = entry[1]
+
+                if (
+                    frequency and
+                    learned_frequency and
+                    abs(frequency - learned_frequency) > frequency_tolerance
+                ):
+                    continue
+
+                best = self._compare(timings, entry, best)
+
+        if best is not None:
+            return best[2]
+
+    def _compare(self, timings, entry, best):
+        # returns (distance, order, value) of whichever is closer
+        distance = self.get_distance(timings, entry[0])
+
+        if distance == -1:
+            return best
+
+        res = (distance, entry[3], entry[2])
+
+        if best is None or res[:2] < best[:2]:
+            return res
+
+        return best
@@ -27,8 +27,13 @@ project https://github.com/kdschlosser/pyWinMCERemote
 .. moduleauthor:: Kevin Schlosser @kdschlosser <kevin.g.schlosser@gmail.com>
 """
 
+from __future__ import print_function
 
+import array
+import struct
+import binascii
 from struct import pack
+from . import utils
 
 pronto_clock = 0.241246
 SignalFree = 10000
@@ -36,6 +41,15 @@ SignalFreeRC6 = 2700
 RC6Start = [2700, -900, 450, -900, 450, -450, 450, -450, 450, -450]
 RC6AStart = [3150, -900, 450, -450, 450, -450, 450, -900, 450]
 
+# the same few hundred codes get converted over and over, the conversions
+# in both directions are cached
+PRONTO_CACHE_SIZE = 512
+
+# (pronto, repeat_count) -> (freq, timings)
+to_ir_cache = utils.LRUCache(PRONTO_CACHE_SIZE)
+# (freq, timings) -> pronto
+to_pronto_cache = utils.LRUCache(PRONTO_CACHE_SIZE)
+
 #
 # def pronto_raw_to_ir(code):
 #     code = code.split(' ')
@@ -54,7 +68,44 @@ RC6AStart = [3150, -900, 450, -450, 450, -450, 450, -900, 450]
 #         raw += [step]
 #
 #
+def parse_pronto(pronto):
+    """
+    Returns the words of a pronto string as a list of ints.
+    """
+    tokens = pronto.split()
+    digits = ''.join(tokens)
+
+    if len(digits) != len(tokens) * 4:
+        # not every word is 4 digits, do it the slow way
+        return [int(v, 16) for v in tokens]
+
+    try:
+        data = binascii.unhexlify(digits)
+    except (TypeError, binascii.Error):
+        raise ValueError('Invalid pronto code %r' % pronto)
+
+    return list(struct.unpack('>%dH' % len(tokens), data))
+
+
+def format_pronto(words):
+    """
+    Returns the pronto string of a sequence of words.
+    """
+    return ' '.join(['%04X'] * len(words)) % tuple(words)
+
+
 def ir_to_pronto_raw(freq, data):
+    key = (freq, tuple(data))
+    out = to_pronto_cache.get(key)
+
+    if out is None:
+        out = _ir_to_pronto_raw(freq, data)
+        to_pronto_cache.put(key, out)
+
+    return out
+
+
+def _ir_to_pronto_raw(freq, data):
     if freq <= 0:
         freq = 36000
 
@@ -62,25 +113,23 @@ def ir_to_pronto_raw(freq, data):
     carrier = pronto_carrier * pronto_clock
 
     pronto_data = [0x0000, pronto_carrier, 0x0000, 0x0000]
-
-    for val in data:
-        duration = abs(val)
-        pronto_data.append(round(duration / carrier))
+    pronto_data.extend([int(round(abs(val) / carrier)) for val in data])
 
     if len(pronto_data) % 2 != 0:
         pronto_data.append(SignalFree)
 
-    pronto_data[3] = (len(pronto_data) - 4) / 2
-
-    out = '%04X' % int(pronto_data[0])
+    pronto_data[3] = (len(pronto_data) - 4) // 2
 
-    for v in pronto_data[1:]:
-        out += ' %04X' % int(v)
+    return format_pronto(pronto_data)
 
-    return out
 
+def pronto_raw_to_ir(pronto_data, repeat_count=0):
+    """
+    Expands a raw pronto code.
 
-def pronto_raw_to_ir(pronto_data, repeat_count):  # repeat_count is ignored for Raw
+    The once sequence is followed by the repeat sequence, which is sent
+    `repeat_count` + 1 times.
+    """
     if len(pronto_data) < 6 or pronto_data[0] not in (0x0000, 0x0100):
         raise Exception("Invalid Raw data %s" % str(pronto_data))
 
@@ -91,94 +140,178 @@ def pronto_raw_to_ir(pronto_data, repeat_count):  # repeat_count is ignored for
     pw = pronto_carrier * pronto_clock
     firstSeq = 2 * pronto_data[2]
     repeatSeq = 2 * pronto_data[3]
-    pulse = True
-    repeatCount = 0
-    start = 4
-    done = False
-    index = start
-    sequence = firstSeq
-
-    if firstSeq == 0:
-        if repeatSeq == 0:
-            return None
-
-        sequence = repeatSeq
-        repeatCount = 1
-
-    timingData = []
-    while not done:
-        time = int(pronto_data[index] * pw)
-
-        if pulse:
-            timingData.append(time)
-        else:
-            timingData.append(-time)
-        index += 1
-        pulse = not pulse
-
-        if index == start + sequence:
-            if repeatCount == 0:
-                if repeatSeq != 0:
-                    start += firstSeq
-                    sequence = repeatSeq
-                    index = start
-                    pulse = True
-                    repeatCount += 1
-                else:
-                    done = True
-            elif repeatCount == 1:
-                done = True
-            else:
-                index = start
-                pulse = True
-                repeatCount += 1
+
+    if firstSeq == 0 and repeatSeq == 0:
+        return None
+
+    if len(pronto_data) < 4 + firstSeq + repeatSeq:
+        raise Exception("Invalid Raw data %s" % str(pronto_data))
+
+    timings = [int(value * pw) for value in pronto_data[4:4 + firstSeq + repeatSeq]]
+
+    # every sequence starts with a mark and has an even length, so the
+    # spaces are every other timing across both of them
+    timings[1::2] = [-value for value in timings[1::2]]
+
+    # the repeats are block copies of the one repeat sequence
+    timingData = array.array('i', timings[:firstSeq])
+    timingData.extend(array.array('i', timings[firstSeq:]) * (repeat_count + 1))
 
     freq = int(1000000 / (pronto_carrier * pronto_clock))
     return freq, timingData
 
 
-def encode_bits(data, start, stop, s_false, s_true):
-    out = ""
+# half bits of a manchester coded bit, most significant first. RC5 sends
+# a 1 as space-mark and RC6 as mark-space.
+RC5_ONE = 0x1
+RC5_ZERO = 0x2
+RC6_ONE = 0x2
+RC6_ZERO = 0x1
+
+# RC6 leader (6 half bit mark, 2 half bit space) followed by the start bit
+# and mode 0, RC6A is the same with a 7 half bit leader and mode 6
+RC6_LEADER = 0xFC95
+RC6_LEADER_BITS = 16
+RC6A_LEADER = 0x1FCA9
+RC6A_LEADER_BITS = 17
+
+
+def _build_manchester_table(one, zero):
+    # half bits of every byte value
+    table = []
+    for value in range(256):
+        res = 0
+        for i in range(7, -1, -1):
+            res = (res << 2) | (one if (value >> i) & 1 else zero)
+        table.append(res)
 
-    for i in range(start, stop - 1, -1):
-        if data & (1 << i) > 0:
-            out = out + s_true
+    return table
+
+
+RC5_MANCHESTER = _build_manchester_table(RC5_ONE, RC5_ZERO)
+RC6_MANCHESTER = _build_manchester_table(RC6_ONE, RC6_ZERO)
+
+
+def _manchester(value, num_bits, table):
+    # half bits of the num_bits low bits of value, msb first
+    res = 0
+    extra = -num_bits % 8
+
+    # pad to whole bytes and drop the half bits of the padding at the end
+    value = (value & ((1 << num_bits) - 1)) << extra
+
+    for shift in range(num_bits + extra - 8, -1, -8):
+        res = (res << 16) | table[(value >> shift) & 0xFF]
+
+    return res >> (extra * 2)
+
+
+_run_tables = {}
+
+
+def _get_run_table(delay):
+    # the mark/space durations of every 8 half bits as (first, rest)
+    try:
+        return _run_tables[delay]
+    except KeyError:
+        pass
+
+    table = []
+    for value in range(256):
+        runs = []
+        for i in range(7, -1, -1):
+            duration = delay if (value >> i) & 1 else -delay
+
+            if runs and (runs[-1] > 0) == (duration > 0):
+                runs[-1] += duration
+            else:
+                runs.append(duration)
+
+        table.append((runs[0], tuple(runs[1:])))
+
+    _run_tables[delay] = table
+    return table
+
+
+def _half_bits_to_timings(frames, delay, period=0):
+    """
+    Turns ``(half_bits, count)`` frames into mark/space timings.
+
+    Leading spaces are dropped. The gap after a frame pads it out to
+    `period` microseconds when another frame follows, the last frame ends
+    with a SignalFree gap.
+    """
+    table = _get_run_table(delay)
+    # the runs get merged in a list, array item access is a lot slower
+    timings = []
+    last = len(frames) - 1
+
+    for i, (half_bits, count) in enumerate(frames):
+        # padded with spaces to whole bytes, they get taken off again at
+        # the end
+        extra = -count % 8
+        half_bits <<= extra
+
+        for shift in range(count + extra - 8, -1, -8):
+            first, rest = table[(half_bits >> shift) & 0xFF]
+
+            if timings and (timings[-1] > 0) == (first > 0):
+                timings[-1] += first
+            elif timings or first > 0:
+                timings.append(first)
+
+            timings.extend(rest)
+
+        if i == last:
+            gap = SignalFree
         else:
-            out = out + s_false
+            gap = max(SignalFree, period - (count * delay))
 
-    return out
+        if timings[-1] < 0:
+            timings[-1] += extra * delay - gap
+        else:
+            timings.append(-gap)
 
+    return array.array('i', timings)
 
-def zero_one_sequences(String, Delay):
-    final_data = []
-    ind = 0
-    n = len(String)
 
-    while True:
-        countUp = 0
-        countDown = 0
-        while ind < n and String[ind] == "0":
-            ind += 1
+# a held button sends the code again every 64 RC5 bits (113.778ms) and
+# every 106.67ms for RC6
+RC5_FRAME_TIME = 113778
+RC6_FRAME_TIME = 106667
 
-        while ind < n and String[ind] == "1":
-            countUp += 1
-            ind += 1
 
-        while ind < n and String[ind] == "0":
-            countDown += 1
-            ind += 1
+def _rc5_frame(system, command, toggle, data=None):
+    # the second start bit is the inverted 7th command bit (RC5X)
+    value = (2 if command > 63 else 3) << 12
+    value |= toggle << 11
+    value |= (system & 0x1F) << 6
 
-        final_data.extend([Delay * countUp, -Delay * countDown])
+    if data is None:
+        value |= command & 0x3F
+        return _manchester(value, 14, RC5_MANCHESTER), 28
 
-        if ind >= n:
-            break
+    # RC5X has a 2 bit space between the system and the command
+    half_bits = _manchester(value >> 6, 8, RC5_MANCHESTER) << 4
+    half_bits = (half_bits << 24) | _manchester(
+        ((command & 0x3F) << 6) | (data & 0x3F),
+        12,
+        RC5_MANCHESTER
+    )
 
-    if final_data[-1] == 0:
-        final_data[-1] = -10000
-    else:
-        final_data[-1] -= 10000
+    return half_bits, 44
+
+
+def _rc6_frame(leader, leader_bits, toggle, value, num_bits):
+    # the trailer bit is twice as long as the other bits
+    half_bits = (leader << 4) | (0xC if toggle else 0x3)
+    half_bits = (half_bits << (num_bits * 2)) | _manchester(
+        value,
+        num_bits,
+        RC6_MANCHESTER
+    )
 
-    return final_data
+    return half_bits, leader_bits + 4 + (num_bits * 2)
 
 
 def pronto_rc5_to_ir(pronto_data, repeat_count=0):
@@ -189,23 +322,12 @@ def pronto_rc5_to_ir(pronto_data, repeat_count=0):
     if pronto_carrier == 0x0000:
         pronto_carrier = int(1000000 / (36000 * pronto_clock))
 
-    rc5_string = ''
+    # the copies are a held button, they all have the same toggle bit
+    frames = [
+        _rc5_frame(pronto_data[4], pronto_data[5], 1)
+    ] * (repeat_count + 1)
 
-    for j in range(repeat_count + 1):
-        toggle = repeat_count % 2 == 0
-        if pronto_data[5] > 63:
-            rc5_string += encode_bits(2, 1, 0, '10', '01')
-        else:
-            rc5_string += encode_bits(3, 1, 0, '10', '01')
-        if toggle:
-            rc5_string += encode_bits(1, 0, 0, '10', '01')
-        else:
-            rc5_string += encode_bits(0, 0, 0, '10', '01')
-
-        rc5_string += encode_bits(pronto_data[4], 4, 0, '10', '01')
-        rc5_string += encode_bits(pronto_data[5], 5, 0, '10', '01')
-
-    final_data = zero_one_sequences(rc5_string, 900)
+    final_data = _half_bits_to_timings(frames, 900, RC5_FRAME_TIME)
 
     freq = int(1000000 / (pronto_carrier * pronto_clock))
     return freq, final_data
@@ -226,25 +348,11 @@ def pronto_rc5x_to_ir(pronto_data, repeat_count):
     if pronto_data[2] + pronto_data[3] != 2:
         raise Exception("Invalid RC5X data %s" % str(pronto_data))
 
-    rc5x_string = ''
-
-    for j in range(repeat_count + 1):
-        toggle = repeat_count % 2 == 0
-        if pronto_data[5] > 63:
-            rc5x_string += encode_bits(2, 1, 0, '10', '01')
-        else:
-            rc5x_string += encode_bits(3, 1, 0, '10', '01')
-        if toggle:
-            rc5x_string += encode_bits(1, 0, 0, '10', '01')
-        else:
-            rc5x_string += encode_bits(0, 0, 0, '10', '01')
-            
-        rc5x_string += encode_bits(pronto_data[4], 4, 0, '10', '01')
-        rc5x_string += '0000'
-        rc5x_string += encode_bits(pronto_data[5], 5, 0, '10', '01')
-        rc5x_string += encode_bits(pronto_data[6], 5, 0, '10', '01')
+    frames = [
+        _rc5_frame(pronto_data[4], pronto_data[5], 1, pronto_data[6])
+    ] * (repeat_count + 1)
 
-    final_data = zero_one_sequences(rc5x_string, 900)
+    final_data = _half_bits_to_timings(frames, 900, RC5_FRAME_TIME)
 
     freq = int(1000000 / (pronto_carrier * pronto_clock))
     return freq, final_data
@@ -261,19 +369,13 @@ def pronto_rc6_to_ir(pronto_data, repeat_count):
     if pronto_data[2] + pronto_data[3] != 1:
         raise Exception("Invalid RC6 data %s" % str(pronto_data))
 
-    rc6_string = ""
-    for j in range(repeat_count + 1):
-        toggle = repeat_count % 2 == 0
-        rc6_string += '1111110010010101'
-        if toggle:
-            rc6_string += '1100'
-        else:
-            rc6_string += '0011'
-            
-        rc6_string += encode_bits(pronto_data[4], 7, 0, '01', '10')
-        rc6_string += encode_bits(pronto_data[5], 7, 0, '01', '10')
+    value = ((pronto_data[4] & 0xFF) << 8) | (pronto_data[5] & 0xFF)
+
+    frames = [
+        _rc6_frame(RC6_LEADER, RC6_LEADER_BITS, 1, value, 16)
+    ] * (repeat_count + 1)
 
-    final_data = zero_one_sequences(rc6_string, 450)
+    final_data = _half_bits_to_timings(frames, 450, RC6_FRAME_TIME)
 
     freq = int(1000000 / (pronto_carrier * pronto_clock))
     return freq, final_data
@@ -290,30 +392,83 @@ def pronto_rc6a_to_ir(pronto_data, repeat_count):
     if pronto_data[2] + pronto_data[3] != 2:
         raise Exception("Invalid RC6A data %s" % str(pronto_data))
 
-    rc6a_string = ""
-    for j in range(repeat_count + 1):
-        toggle = repeat_count % 2 == 0
-        rc6a_string += '11111110010101001'
-        if toggle:
-            rc6a_string += '1100'
-        else:
-            rc6a_string += '0011'
-            
-        if pronto_data[4] > 127:
-            rc6a_string += encode_bits(1, 0, 0, '01', '10')
-            rc6a_string += encode_bits(pronto_data[4], 14, 0, '01', '10')
-        else:
-            rc6a_string += encode_bits(0, 0, 0, '01', '10')
-            rc6a_string += encode_bits(pronto_data[4], 6, 0, '01', '10')
-        rc6a_string += encode_bits(pronto_data[5], 7, 0, '01', '10')
-        rc6a_string += encode_bits(pronto_data[6], 7, 0, '01', '10')
+    # customer codes over 127 are 15 bits long with the top bit set
+    if pronto_data[4] > 127:
+        value = 0x8000 | (pronto_data[4] & 0x7FFF)
+        num_bits = 32
+    else:
+        value = pronto_data[4] & 0x7F
+        num_bits = 24
+
+    value = (value << 16) | ((pronto_data[5] & 0xFF) << 8) | (pronto_data[6] & 0xFF)
+
+    frames = [
+        _rc6_frame(RC6A_LEADER, RC6A_LEADER_BITS, 1, value, num_bits)
+    ] * (repeat_count + 1)
 
-    final_data = zero_one_sequences(rc6a_string, 450)
+    final_data = _half_bits_to_timings(frames, 450, RC6_FRAME_TIME)
 
     freq = int(1000000 / (pronto_carrier * pronto_clock))
     return freq, final_data
 
 
+# {38k,564}<1,-1|1,-3>(16,-8,D:8,S:8,F:8,~F:8,1,^108m,(16,-4,1,^108m)*)
+NEC_UNIT = 564
+NEC_FRAME_TIME = 108000
+
+
+def _build_nec_table():
+    # the marks and spaces of every byte, lsb first
+    table = []
+    for value in range(256):
+        timings = []
+        for i in range(8):
+            timings.append(NEC_UNIT)
+            timings.append(-NEC_UNIT * 3 if (value >> i) & 1 else -NEC_UNIT)
+
+        table.append(tuple(timings))
+
+    return table
+
+
+NEC_BYTES = _build_nec_table()
+NEC_REPEAT = (
+    NEC_UNIT * 16,
+    -NEC_UNIT * 4,
+    NEC_UNIT,
+    (NEC_UNIT * 21) - NEC_FRAME_TIME
+)
+
+
+def pronto_nec_to_ir(pronto_data, repeat_count=0):
+    if len(pronto_data) != 6 or pronto_data[0] != 0x900A:  # CodeType NEC
+        raise Exception("Invalid NEC data %s" % str(pronto_data))
+
+    pronto_carrier = pronto_data[1]
+    if pronto_carrier == 0x0000:
+        pronto_carrier = int(1000000 / (38000 * pronto_clock))
+
+    # the byte that gets sent first is the high byte of the device and
+    # the command words. The low byte of the device word is the inverted
+    # device or the sub device, for the command it is the inverted command.
+    device = pronto_data[4]
+    command = pronto_data[5]
+
+    timings = [NEC_UNIT * 16, -NEC_UNIT * 8]
+    timings.extend(NEC_BYTES[(device >> 8) & 0xFF])
+    timings.extend(NEC_BYTES[device & 0xFF])
+    timings.extend(NEC_BYTES[(command >> 8) & 0xFF])
+    timings.extend(NEC_BYTES[command & 0xFF])
+    timings.append(NEC_UNIT)
+
+    # every frame starts 108ms after the one before it
+    timings.append(sum(abs(t) for t in timings) - NEC_FRAME_TIME)
+    timings.extend(NEC_REPEAT * repeat_count)
+
+    freq = int(1000000 / (pronto_carrier * pronto_clock))
+    return freq, array.array('i', timings)
+
+
 handlers = {
     0x0: pronto_raw_to_ir,
     0x0100: pronto_raw_to_ir,
@@ -321,11 +476,47 @@ handlers = {
     0x5001: pronto_rc5x_to_ir,
     0x6000: pronto_rc6_to_ir,
     0x6001: pronto_rc6a_to_ir,
+    0x900A: pronto_nec_to_ir,
 }
 
 
+def register_handler(code_type, handler):
+    """
+    Adds or replaces the handler of a pronto format.
+
+    `handler` is called with the words of the pronto code and the repeat
+    count and returns ``(freq, timings)``.
+    """
+    handlers[code_type] = handler
+    # codes of that type that are in the cache may come out different now
+    to_ir_cache.clear()
+
+
+def unregister_handler(code_type):
+    if handlers.pop(code_type, None) is not None:
+        to_ir_cache.clear()
+
+
+def get_handler(code_type):
+    return handlers.get(code_type)
+
+
 def pronto_to_mce(pronto, repeat_count=0):
-    pronto_data = list(int(v, 16) for v in pronto.split(" "))
+    key = (pronto, repeat_count)
+    res = to_ir_cache.get(key)
+
+    # the caller is free to change the list
+    if res is None:
+        freq, timings = _pronto_to_mce(pronto, repeat_count)
+        timings = list(timings)
+        to_ir_cache.put(key, (freq, tuple(timings)))
+        return freq, timings
+
+    return res[0], list(res[1])
+
+
+def _pronto_to_mce(pronto, repeat_count):
+    pronto_data = parse_pronto(pronto)
     try:
         handler = handlers[pronto_data[0]]
     except:
@@ -333,18 +524,64 @@ def pronto_to_mce(pronto, repeat_count=0):
             "Don't have a decoder for pronto format %s" % hex(pronto_data[0])[2:].upper()
         )
 
-    freq, timings = handler(pronto_data, repeat_count)
+    return handler(pronto_data, repeat_count)
+
+
+def clear_cache():
+    to_ir_cache.clear()
+    to_pronto_cache.clear()
+
+
+# the hardware works in 50us steps
+TRANSMIT_GRID = 50
+
+# IR_TRANSMIT_CHUNK: OffsetToNextChunk, RepeatCount and ByteCount are
+# ULONG_PTR and are followed by the LONG timings. A chunk is padded to a
+# whole ULONG_PTR.
+TRANSMIT_CHUNK_HEADER = struct.Struct('PPP')
+_POINTER_SIZE = struct.calcsize('P')
+
 
-    return freq, timings
+def _round_timings(timing_data):
+    grid = float(TRANSMIT_GRID)
+    return [TRANSMIT_GRID * round(v / grid) for v in timing_data]
 
 
 def round_and_pack_timings(timing_data):
-    out = ""
-    for v in timing_data:
-        newVal = 50 * int(round(v / 50))
-        out += pack("i", newVal)
+    timing_data = _round_timings(timing_data)
+    return pack('%di' % len(timing_data), *timing_data)
 
-    return out
+
+def pack_transmit_chunk(timing_data, repeat_count=0, buffer=None):
+    """
+    Rounds the timings to the 50us grid and packs them into an
+    IR_TRANSMIT_CHUNK.
+
+    `buffer` is a bytearray from an earlier call, it gets used again if it
+    is large enough. Returns the buffer and the number of bytes of it the
+    chunk takes up, the buffer can be handed to the driver as is.
+    `repeat_count` is the number of extra times the driver sends the
+    timings.
+    """
+    count = len(timing_data)
+    end = TRANSMIT_CHUNK_HEADER.size + (count * 4)
+    size = end + (-end % _POINTER_SIZE)
+
+    if buffer is None or len(buffer) < size:
+        buffer = bytearray(size)
+
+    TRANSMIT_CHUNK_HEADER.pack_into(buffer, 0, 0, repeat_count + 1, count * 4)
+    struct.pack_into(
+        '%di' % count,
+        buffer,
+        TRANSMIT_CHUNK_HEADER.size,
+        *_round_timings(timing_data)
+    )
+
+    if size != end:
+        buffer[end:size] = b'\x00' * (size - end)
+
+    return buffer, size
 
 
 if __name__ == '__main__':
@@ -353,9 +590,9 @@ if __name__ == '__main__':
     transmit_code = round_and_pack_timings(transmit_values)
     header = pack(7 * "q", 2, int(1000000. / freq), 0, 0, 0, 1, len(transmit_code))
 
-    print repr(header)
-    print repr(transmit_code)
-    print transmit_values
+    print(repr(header))
+    print(repr(transmit_code))
+    print(transmit_values)
 
     import ctypes
 
@@ -366,28 +603,28 @@ if __name__ == '__main__':
     for i in range(len(transmit_code)):
         result += [ptr[i]]
 
-    print result
+    print(result)
 
 
-    print
-    print
+    print()
+    print()
     ptr = ctypes.cast((ctypes.c_char * 8)('\x02', '\x00', '\x00', '\x00', '\x00', '\x00', '\x00', '\x00'), ctypes.POINTER(ctypes.c_ulonglong))
-    print ptr.contents.value
+    print(ptr.contents.value)
     ptr = ctypes.cast((ctypes.c_char * 8)('\x18', '\x00', '\x00', '\x00', '\x00', '\x00', '\x00', '\x00'), ctypes.POINTER(ctypes.c_ulonglong))
-    print ptr.contents.value
+    print(ptr.contents.value)
     ptr = ctypes.cast((ctypes.c_char * 8)('\x00', '\x00', '\x00', '\x00', '\x00', '\x00', '\x00', '\x00'), ctypes.POINTER(ctypes.c_ulonglong))
-    print ptr.contents.value
+    print(ptr.contents.value)
     ptr = ctypes.cast((ctypes.c_char * 8)('\x00', '\x00', '\x00', '\x00', '\x00', '\x00', '\x00', '\x00'), ctypes.POINTER(ctypes.c_ulonglong))
-    print ptr.contents.value
+    print(ptr.contents.value)
 
-    print
+    print()
     ptr = ctypes.cast((ctypes.c_char * 8)('\x00', '\x00', '\x00', '\x00', '\x00', '\x00', '\x00', '\x00'), ctypes.POINTER(ctypes.c_ulonglong))
-    print ptr.contents.value
+    print(ptr.contents.value)
     ptr = ctypes.cast((ctypes.c_char * 8)('\x01', '\x00', '\x00', '\x00', '\x00', '\x00', '\x00', '\x00'), ctypes.POINTER(ctypes.c_ulonglong))
-    print ptr.contents.value
+    print(ptr.contents.value)
     ptr = ctypes.cast((ctypes.c_char * 8)('h', '\x00', '\x00', '\x00', '\x00', '\x00', '\x00', '\x00'), ctypes.POINTER(ctypes.c_ulonglong))
-    print ptr.contents.value
-    print
+    print(ptr.contents.value)
+    print()
 
-    print int(1000000. / freq)
-    print len(transmit_code)
\ No newline at end of file
+    print(int(1000000. / freq))
+    print(len(transmit_code))
\ No newline at end of file
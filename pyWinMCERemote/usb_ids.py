@@ -0,0 +1,434 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of EventGhost.
+# Copyright © 2005-2019 EventGhost Project <http://www.eventghost.org/>
+#
+# EventGhost is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 2 of the License, or (at your option)
+# any later version.
+#
+# EventGhost is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with EventGhost. If not, see <http://www.gnu.org/licenses/>.
+
+"""
+This file is part of the **pyWinMCERemote**
+project https://github.com/kdschlosser/pyWinMCERemote
+
+:platform: Windows
+:license: GPL version 2 or newer
+:synopsis: offline USB vendor/product name database
+
+.. moduleauthor:: Kevin Schlosser @kdschlosser <kevin.g.schlosser@gmail.com>
+
+The linux-usb.org ``usb.ids`` file is not shipped with the package. It is
+located on disk (the file pointed to by the ``PYWINMCEREMOTE_USB_IDS``
+environment variable, a copy fetched with :func:`update` or one of the usual
+system locations) and compiled once into a small binary index file in the
+user cache directory. Nothing is read until the first lookup. After that the
+index is memory mapped and searched with bisect, so only the handful of pages
+a lookup touches ever get loaded.
+
+The cache directory is ``%LOCALAPPDATA%\\pyWinMCERemote`` on Windows and
+``$XDG_CACHE_HOME/pyWinMCERemote`` (``~/.cache/pyWinMCERemote``) everywhere
+else. :func:`update` downloads ``usb.ids`` into that directory.
+
+Windows has no system copy of ``usb.ids``. When no copy can be found the
+first lookup downloads one from linux-usb.org into the cache directory, the
+way older versions did at import, unless :data:`DOWNLOAD_MISSING` is set to
+``False``. That only ever happens once, later lookups use the cached copy.
+If the download fails the lookups return ``None`` and
+:class:`pyWinMCERemote.ioctl.IRDevice` uses the names the driver reports.
+"""
+
+import os
+import sys
+import mmap
+import array
+import struct
+import bisect
+import threading
+
+
+USB_IDS_URL = 'http://www.linux-usb.org/usb.ids'
+
+# download usb.ids on the first lookup if there is no copy on disk
+DOWNLOAD_MISSING = True
+
+# seconds to wait for linux-usb.org
+DOWNLOAD_TIMEOUT = 10
+
+SEARCH_PATHS = [
+    '/usr/share/hwdata/usb.ids',
+    '/usr/share/misc/usb.ids',
+    '/usr/share/usb.ids',
+    '/var/lib/usbutils/usb.ids',
+]
+
+# magic, byte order, vendor count, product count, string count,
+# blob size, source file size, source file mtime
+_HEADER = struct.Struct('<4sBIIIIqq')
+_MAGIC = b'UIDX'
+_BYTE_ORDER = 0 if sys.byteorder == 'little' else 1
+
+_lock = threading.Lock()
+_index = None
+
+
+def _get_cache_path():
+    if sys.platform.startswith('win'):
+        base = os.environ.get('LOCALAPPDATA', os.path.expanduser('~'))
+    else:
+        base = os.environ.get(
+            'XDG_CACHE_HOME',
+            os.path.join(os.path.expanduser('~'), '.cache')
+        )
+
+    return os.path.join(base, 'pyWinMCERemote')
+
+
+def _find_source():
+    path = os.environ.get('PYWINMCEREMOTE_USB_IDS')
+    if path and os.path.isfile(path):
+        return path
+
+    # a copy fetched with update() wins over the system copies
+    cached = os.path.join(_get_cache_path(), 'usb.ids')
+
+    for path in [cached] + SEARCH_PATHS:
+        if os.path.isfile(path):
+            return path
+
+
+def _parse(source_path):
+    vendors = {}
+    products = {}
+
+    with open(source_path, 'rb') as f:
+        vid = None
+
+        for line in f:
+            if not line.strip() or line.startswith(b'#'):
+                continue
+
+            # interfaces (and the sub entries of the class sections)
+            if line.startswith(b'\t\t'):
+                continue
+
+            if line.startswith(b'\t'):
+                if vid is None:
+                    continue
+
+                id_, _, name = line.strip().partition(b' ')
+                try:
+                    pid = int(id_, 16)
+                except ValueError:
+                    continue
+
+                products[(vid << 16) | pid] = name.strip()
+            else:
+                id_, _, name = line.strip().partition(b' ')
+
+                # the class, language and HID sections at the end of the
+                # file are not vendors. They start with a non hex id.
+                try:
+                    vid = int(id_, 16)
+                except ValueError:
+                    vid = None
+                    continue
+
+                vendors[vid] = name.strip()
+
+    return vendors, products
+
+
+def compile_index(source_path, index_path):
+    """
+    Compiles a usb.ids file into the binary index used for lookups.
+    """
+    vendors, products = _parse(source_path)
+
+    strings = []
+    offsets = array.array('I', [0])
+    blob = bytearray()
+
+    def add_string(value):
+        blob.extend(value)
+        offsets.append(len(blob))
+        strings.append(value)
+        return len(strings) - 1
+
+    vendor_keys = array.array('I', sorted(vendors))
+    vendor_names = array.array(
+        'I',
+        [add_string(vendors[key]) for key in vendor_keys]
+    )
+
+    product_keys = array.array('I', sorted(products))
+    product_names = array.array(
+        'I',
+        [add_string(products[key]) for key in product_keys]
+    )
+
+    stat = os.stat(source_path)
+    header = _HEADER.pack(
+        _MAGIC,
+        _BYTE_ORDER,
+        len(vendor_keys),
+        len(product_keys),
+        len(strings),
+        len(blob),
+        stat.st_size,
+        int(stat.st_mtime)
+    )
+
+    directory = os.path.dirname(index_path)
+    if directory and not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    temp_path = index_path + '.%d.tmp' % os.getpid()
+
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(header)
+            # pad so every array starts on a 4 byte boundary
+            f.write(b'\x00' * (-_HEADER.size % 4))
+            f.write(vendor_keys.tobytes())
+            f.write(vendor_names.tobytes())
+            f.write(product_keys.tobytes())
+            f.write(product_names.tobytes())
+            f.write(offsets.tobytes())
+            f.write(bytes(blob))
+
+        _replace(temp_path, index_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def _replace(source_path, destination_path):
+    try:
+        replace = os.replace
+    except AttributeError:
+        # Python 2, os.rename does not overwrite on Windows
+        if os.path.exists(destination_path):
+            os.remove(destination_path)
+
+        os.rename(source_path, destination_path)
+    else:
+        replace(source_path, destination_path)
+
+
+class _Index(object):
+
+    def __init__(self, index_path):
+        self._file = open(index_path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        (
+            _,
+            _,
+            vendor_count,
+            product_count,
+            string_count,
+            _,
+            _,
+            _
+        ) = _HEADER.unpack_from(self._map, 0)
+
+        view = self._view = memoryview(self._map)
+        offset = _HEADER.size + (-_HEADER.size % 4)
+
+        def get_array(count):
+            start = offset
+            return view[start:start + (count * 4)].cast('I'), start + (count * 4)
+
+        self.vendor_keys, offset = get_array(vendor_count)
+        self.vendor_names, offset = get_array(vendor_count)
+        self.product_keys, offset = get_array(product_count)
+        self.product_names, offset = get_array(product_count)
+        self.offsets, offset = get_array(string_count + 1)
+        self.blob = view[offset:]
+
+    def close(self):
+        """
+        Unmaps the index file and closes it.
+
+        Windows does not allow a mapped file to be replaced, this has to be
+        done before the index gets compiled again.
+        """
+        # the map can only be closed once nothing points into it
+        for view in (
+            self.vendor_keys,
+            self.vendor_names,
+            self.product_keys,
+            self.product_names,
+            self.offsets,
+            self.blob,
+            self._view
+        ):
+            view.release()
+
+        self._map.close()
+        self._file.close()
+
+    def _get_string(self, index):
+        start = self.offsets[index]
+        end = self.offsets[index + 1]
+        return bytes(self.blob[start:end]).decode('utf-8', 'replace')
+
+    @staticmethod
+    def _search(keys, key):
+        index = bisect.bisect_left(keys, key)
+        if index < len(keys) and keys[index] == key:
+            return index
+
+        return -1
+
+    def get_vendor(self, vid):
+        index = self._search(self.vendor_keys, vid)
+        if index != -1:
+            return self._get_string(self.vendor_names[index])
+
+    def get_product(self, vid, pid):
+        index = self._search(self.product_keys, (vid << 16) | pid)
+        if index != -1:
+            return self._get_string(self.product_names[index])
+
+
+def _is_current(index_path, source_path):
+    try:
+        with open(index_path, 'rb') as f:
+            header = f.read(_HEADER.size)
+
+        (
+            magic,
+            byte_order,
+            _,
+            _,
+            _,
+            _,
+            source_size,
+            source_mtime
+        ) = _HEADER.unpack(header)
+
+    except (IOError, OSError, struct.error):
+        return False
+
+    if magic != _MAGIC or byte_order != _BYTE_ORDER:
+        return False
+
+    stat = os.stat(source_path)
+    return source_size == stat.st_size and source_mtime == int(stat.st_mtime)
+
+
+def _load():
+    source_path = _find_source()
+    index_path = os.path.join(_get_cache_path(), 'usb.ids.idx')
+
+    if source_path is None and DOWNLOAD_MISSING:
+        try:
+            source_path = _download(USB_IDS_URL)
+        except (IOError, OSError, ValueError):
+            # no network, the names the driver reports get used
+            source_path = None
+
+    if source_path is not None and not _is_current(index_path, source_path):
+        try:
+            compile_index(source_path, index_path)
+        except (IOError, OSError):
+            # read only cache directory or the index is mapped by another
+            # process. a stale index is still better then no index.
+            pass
+
+    if not os.path.isfile(index_path):
+        return None
+
+    try:
+        return _Index(index_path)
+    except (IOError, OSError, ValueError, struct.error):
+        return None
+
+
+def _get_index():
+    global _index
+
+    if _index is None:
+        with _lock:
+            if _index is None:
+                _index = _load() or False
+
+    return _index
+
+
+def get_vendor_name(vid):
+    """
+    Returns the vendor name for a USB vendor id or ``None``.
+    """
+    index = _get_index()
+    if index:
+        return index.get_vendor(vid)
+
+
+def get_product_name(vid, pid):
+    """
+    Returns the product name for a USB vendor/product id pair or ``None``.
+    """
+    index = _get_index()
+    if index:
+        return index.get_product(vid, pid)
+
+
+def _download(url):
+    try:
+        from urllib.request import urlopen
+    except ImportError:
+        from urllib2 import urlopen
+
+    cache_path = _get_cache_path()
+    if not os.path.isdir(cache_path):
+        os.makedirs(cache_path)
+
+    response = urlopen(url, timeout=DOWNLOAD_TIMEOUT)
+    try:
+        data = response.read()
+    finally:
+        response.close()
+
+    source_path = os.path.join(cache_path, 'usb.ids')
+    temp_path = source_path + '.%d.tmp' % os.getpid()
+
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+
+        _replace(temp_path, source_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+    return source_path
+
+
+def update(url=USB_IDS_URL):
+    """
+    Downloads a fresh copy of usb.ids into the cache directory.
+
+    The index gets compiled again on the next lookup.
+    """
+    global _index
+
+    source_path = _download(url)
+
+    with _lock:
+        if _index:
+            _index.close()
+
+        _index = None
+
+    return source_path
@@ -1,132 +1,376 @@
+import threading
+from collections import Counter, OrderedDict
+
+
+def _snap(value):
+    # normalize to a 50us grid
+    dif = value % 50
+
+    if dif < 25:
+        return value - dif
+
+    return value + 50 - dif
+
+
+def _build_cluster_table(counts, low_threshold, high_threshold):
+    """
+    Clusters (absolute) timings.
+
+    `counts` maps each distinct timing to the number of times it was seen.
+    Returns a dict that maps every timing to the value it should be
+    replaced with.
+    """
+    table = {}
+
+    if not counts:
+        return table
+
+    values = sorted(counts)
+
+    # split the sorted timings where the gap to the previous timing is
+    # larger then the tolerance. the sums and counts are kept as we go.
+    groups = []
+    start = 0
+    total = 0
+    count = 0
+    last = values[0]
+
+    for i, value in enumerate(values):
+        if value > int(last * high_threshold):
+            groups.append([start, i, total, count])
+            start = i
+            total = 0
+            count = 0
+
+        total += value * counts[value]
+        count += counts[value]
+        last = value
+
+    groups.append([start, len(values), total, count])
+
+    # double check the groups for any possible straglers. Only neighbours
+    # can be close enough to merge because the groups are sorted.
+    means = [group[2] // group[3] for group in groups]
+    merged = [groups[0]]
+
+    for i in range(1, len(groups)):
+        if means[i - 1] >= int(means[i] * low_threshold):
+            merged[-1][1] = groups[i][1]
+            merged[-1][2] += groups[i][2]
+            merged[-1][3] += groups[i][3]
+        else:
+            merged.append(groups[i])
+
+    for start, end, total, count in merged:
+        snapped = _snap(total // count)
+        low = int(snapped * low_threshold)
+        high = int(snapped * high_threshold)
+
+        for i in range(start, end):
+            value = values[i]
+
+            if low <= value <= high:
+                table[value] = snapped
+            else:
+                table[value] = value
+
+    return table
+
 
 def clean_code(ir_code, threshold):
     low_threshold = 1.0 - (threshold / 100.0)
     high_threshold = 1.0 + (threshold / 100.0)
-    marks = []
-    spaces = []
+
+    marks = {}
+    spaces = {}
+
+    for timing in ir_code:
+        if timing < 0:
+            spaces[-timing] = spaces.get(-timing, 0) + 1
+        else:
+            marks[timing] = marks.get(timing, 0) + 1
+
+    mark_table = _build_cluster_table(marks, low_threshold, high_threshold)
+    space_table = _build_cluster_table(spaces, low_threshold, high_threshold)
+
     cleaned_code = []
 
     for timing in ir_code:
         if timing < 0:
-            for space in spaces:
-                avg = sum(space) / len(space)
-
-                low = int(avg * high_threshold)
-                high = int(avg * low_threshold)
-                if low <= timing <= high:
-                    space += [timing]
-                    break
-            else:
-                spaces += [[timing]]
+            cleaned_code.append(-space_table[-timing])
         else:
-            for mark in marks:
-                avg = sum(mark) / len(mark)
+            cleaned_code.append(mark_table[timing])
+
+    return cleaned_code
+
+
+# anything longer then this is the gap between frames
+FRAME_GAP = 6500
+HYSTERESIS = 10
+
+
+class _Cluster(object):
+    __slots__ = ('mean', 'count', 'last_seen', 'snapped')
+
+    def __init__(self, mean, count, frame):
+        self.mean = mean
+        self.count = count
+        self.last_seen = frame
+        self.snapped = _snap(int(mean))
+
+
+class TimingNormalizer(object):
+    """
+    Incremental version of :func:`clean_code`.
+
+    Keeps the mark and space clusters it has seen from one frame to the
+    next. A remote always sends the same handful of durations so once the
+    clusters are known every timing gets snapped with a single dict lookup
+    and only timings that do not fit a known cluster go through the
+    clustering again. The cluster centroids are running averages so a
+    noisy frame only moves them a little, and clusters that have not been
+    seen for `max_age` frames get dropped.
+
+    Use one instance per source (an IRDevice, a capture file, a protocol).
+    """
+
+    def __init__(self, threshold, max_age=100, weight=32):
+        self.threshold = threshold
+        self.max_age = max_age
+        self.weight = weight
+        self._low_threshold = 1.0 - (threshold / 100.0)
+        self._high_threshold = 1.0 + (threshold / 100.0)
+        self._frame = 0
+        self._marks = []
+        self._spaces = []
+        # timing -> (cluster, sign) for every timing seen since the last
+        # time the clusters changed
+        self._lookup = {}
 
-                high = int(avg * high_threshold)
-                low = int(avg * low_threshold)
+    def reset(self):
+        self._frame = 0
+        del self._marks[:]
+        del self._spaces[:]
+        self._lookup.clear()
 
-                if low <= timing <= high:
-                    mark += [timing]
-                    break
+    def _find(self, clusters, value):
+        for cluster in clusters:
+            if (
+                int(cluster.mean * self._low_threshold) <=
+                value <=
+                int(cluster.mean * self._high_threshold)
+            ):
+                return cluster
+
+    def _add_clusters(self, clusters, counts):
+        table = _build_cluster_table(
+            counts,
+            self._low_threshold,
+            self._high_threshold
+        )
+
+        grouped = {}
+        for value, count in counts.items():
+            key = table[value]
+            total, num = grouped.get(key, (0, 0))
+            grouped[key] = (total + (value * count), num + count)
+
+        for total, count in grouped.values():
+            clusters.append(_Cluster(float(total) / count, count, self._frame))
+
+        self._merge(clusters)
+
+    def _merge(self, clusters):
+        # clusters can end up close enough to each other to be the same
+        # duration, fold them together.
+        clusters.sort(key=lambda c: c.mean)
+        merged = False
+
+        i = 1
+        while i < len(clusters):
+            prev = clusters[i - 1]
+            cluster = clusters[i]
+
+            if prev.mean >= int(cluster.mean * self._low_threshold):
+                count = prev.count + cluster.count
+                prev.mean = (
+                    (prev.mean * prev.count) + (cluster.mean * cluster.count)
+                ) / count
+                prev.count = min(count, self.weight)
+                prev.snapped = _snap(int(prev.mean))
+                prev.last_seen = max(prev.last_seen, cluster.last_seen)
+                del clusters[i]
+                merged = True
             else:
-                marks += [[timing]]
-                
-    marks2 = []
-    spaces2 = []
-
-    # double check the groups for any possible straglers
-    while marks:
-        mark = marks.pop(0)
-        avg_mark = sum(mark) / len(mark)
-        for m in marks:
-            avg = sum(m) / len(m)
-            high = int(avg * high_threshold)
-            low = int(avg * low_threshold)
-            if low <= avg_mark <= high:
-                m.extend(mark[:])
-                break
-        else:
-            for m in marks2:
-                avg = sum(m) / len(m)
-                high = int(avg * high_threshold)
-                low = int(avg * low_threshold)
+                i += 1
+
+        return merged
 
-                if low <= avg_mark <= high:
+    def _get_cluster(self, timing):
+        cluster = self._lookup.get(timing)
 
-                    m.extend(mark[:])
-                    break
+        if cluster is None:
+            if timing < 0:
+                cluster = self._find(self._spaces, -timing)
             else:
-                marks2 += [mark[:]]
-
-    while spaces:
-        space = spaces.pop(0)
-        avg_space = sum(space) / len(space)
-        for s in spaces:
-            avg = sum(s) / len(s)
-            high = int(avg * high_threshold)
-            low = int(avg * low_threshold)
-
-            if low <= avg_space <= high:
-                s.extend(space[:])
-                break
-        else:
-            for s in spaces2:
-                avg = sum(s) / len(s)
-                high = int(avg * high_threshold)
-                low = int(avg * low_threshold)
-
-                if low <= avg_space <= high:
-                    s.extend(space[:])
-                    break
+                cluster = self._find(self._marks, timing)
+
+            if cluster is not None:
+                self._lookup[timing] = cluster
+
+        return cluster
+
+    def normalize(self, ir_code):
+        self._frame += 1
+        frame = self._frame
+
+        counts = Counter(ir_code)
+
+        # cluster -> [sum, count] for the timings of this frame
+        seen = {}
+        new_marks = {}
+        new_spaces = {}
+
+        for timing, count in counts.items():
+            # the gap at the end of a frame is not a part of the remotes
+            # timings, it only gets rounded.
+            if timing <= -FRAME_GAP or timing >= FRAME_GAP:
+                continue
+
+            cluster = self._get_cluster(timing)
+
+            if cluster is None:
+                if timing < 0:
+                    new_spaces[-timing] = count
+                else:
+                    new_marks[timing] = count
+
             else:
-                spaces2 += [space[:]]
+                stats = seen.get(cluster)
+                if stats is None:
+                    seen[cluster] = [abs(timing) * count, count]
+                else:
+                    stats[0] += abs(timing) * count
+                    stats[1] += count
 
-    del marks[:]
-    del spaces[:]
+        changed = False
 
-    # normalize the marks and spaces to a 50us tolerance
-    for mark in marks2:
-        mark = sum(mark) / len(mark)
+        # move the centroids of the clusters that were seen
+        for cluster, (total, count) in seen.items():
+            cluster.last_seen = frame
+            weight = cluster.count + count
+            cluster.mean = ((cluster.mean * cluster.count) + total) / weight
+            cluster.count = min(weight, self.weight)
 
-        dif = mark % 50
+            # only move to another point on the grid once the centroid is
+            # clearly past the half way mark, this keeps a centroid that
+            # sits close to the middle from flipping back and forth.
+            if abs(cluster.mean - cluster.snapped) > 25 + HYSTERESIS:
+                cluster.snapped = _snap(int(cluster.mean))
+                changed = True
 
-        # print dif, mark
-        if dif < 25:
-            dif = -dif
-        else:
-            dif = 50 - dif
+        if seen:
+            if self._merge(self._marks):
+                changed = True
+            if self._merge(self._spaces):
+                changed = True
 
-        mark += dif
-        marks += [mark]
+        if new_marks:
+            self._add_clusters(self._marks, new_marks)
+            changed = True
 
-    for space in spaces2:
-        space = sum(space) / len(space)
+        if new_spaces:
+            self._add_clusters(self._spaces, new_spaces)
+            changed = True
 
-        dif = space % 50
+        # drop the clusters that have gone stale
+        oldest = frame - self.max_age
+        for clusters in (self._marks, self._spaces):
+            stale = [c for c in clusters if c.last_seen < oldest]
+            if stale:
+                for cluster in stale:
+                    clusters.remove(cluster)
+                changed = True
 
-        if dif > 25:
-            dif = 50 - dif
-        else:
-            dif = -dif
+        if changed:
+            self._lookup.clear()
 
-        space += dif
-        spaces += [space]
+        table = {}
 
-    for timing in ir_code:
-        for mark in marks:
-            low = int(mark * low_threshold)
-            high = int(mark * high_threshold)
-            if low <= timing <= high:
-                cleaned_code += [mark]
-                break
-        else:
-            for space in spaces:
-                high = int(space * low_threshold)
-                low = int(space * high_threshold)
-                if low <= timing <= high:
-                    cleaned_code += [space]
-                    break
+        for timing in counts:
+            if timing <= -FRAME_GAP:
+                table[timing] = -_snap(-timing)
+                continue
+
+            if timing >= FRAME_GAP:
+                table[timing] = _snap(timing)
+                continue
+
+            cluster = self._get_cluster(timing)
+
+            if cluster is None:
+                table[timing] = timing
+            elif timing < 0:
+                table[timing] = -cluster.snapped
             else:
-                cleaned_code += [timing]
+                table[timing] = cluster.snapped
 
-    return cleaned_code
+        return [table[timing] for timing in ir_code]
+
+
+# marks a key that is not in a LRUCache, None can be a cached value
+_MISSING = object()
+
+
+class LRUCache(object):
+    """
+    Thread safe, bounded least recently used cache with hit counters.
+    """
+
+    def __init__(self, size):
+        if size < 1:
+            raise ValueError('size has to be at least 1')
+
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            value = self._entries.pop(key, _MISSING)
+
+            if value is _MISSING:
+                self.misses += 1
+                return default
+
+            # reinserting moves the entry to the young end
+            self._entries[key] = value
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = value
+
+            while len(self._entries) > self.size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        if not total:
+            return 0.0
+
+        return float(self.hits) / total
+
+    def __len__(self):
+        return len(self._entries)
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of EventGhost.
+# Copyright © 2005-2019 EventGhost Project <http://www.eventghost.org/>
+#
+# EventGhost is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 2 of the License, or (at your option)
+# any later version.
+#
+# EventGhost is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with EventGhost. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This file is part of the **pyWinMCERemote**
+project https://github.com/kdschlosser/pyWinMCERemote
+
+:platform: any
+:license: GPL version 2 or newer
+:synopsis: encode and decode helpers shared by the tests
+
+.. moduleauthor:: Kevin Schlosser @kdschlosser <kevin.g.schlosser@gmail.com>
+"""
+
+from pyWinMCERemote import decoder
+from pyWinMCERemote import hold
+from pyWinMCERemote import pronto
+from pyWinMCERemote import utils
+
+
+def encode(code, repeat_count=0):
+    """
+    Returns the carrier and the timings of every copy of a pronto code.
+    """
+    frequency, timings = pronto.pronto_to_mce(code, repeat_count)
+
+    frames = []
+    frame = []
+    for timing in timings:
+        frame.append(timing)
+
+        if timing <= -utils.FRAME_GAP:
+            frames.append(frame)
+            frame = []
+
+    assert not frame
+    assert len(frames) == repeat_count + 1
+
+    return frequency, frames
+
+
+def decode(frequency, code, tracker=None):
+    """
+    Decodes a frame, with a tracker of its own if none is given.
+    """
+    if tracker is None:
+        tracker = hold.HoldTracker()
+
+    return decoder.decode(frequency, list(code), tracker=tracker)
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of EventGhost.
+# Copyright © 2005-2019 EventGhost Project <http://www.eventghost.org/>
+#
+# EventGhost is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 2 of the License, or (at your option)
+# any later version.
+#
+# EventGhost is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with EventGhost. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This file is part of the **pyWinMCERemote**
+project https://github.com/kdschlosser/pyWinMCERemote
+
+:platform: any
+:license: GPL version 2 or newer
+:synopsis: RC5/RC5X pronto encode -> decode round trips
+
+.. moduleauthor:: Kevin Schlosser @kdschlosser <kevin.g.schlosser@gmail.com>
+"""
+
+import random
+
+import pytest
+
+from benchmarks import corpus
+from pyWinMCERemote import decoder
+from pyWinMCERemote import hold
+from pyWinMCERemote import pronto
+
+from .helpers import decode
+from .helpers import encode
+
+
+@pytest.mark.parametrize('system', [0x00, 0x05, 0x1F])
+@pytest.mark.parametrize('command', [0x00, 0x0C, 0x3F, 0x40, 0x7F])
+def test_rc5_round_trip(system, command):
+    frequency, frames = encode(
+        '5000 0073 0000 0001 %04X %04X' % (system, command)
+    )
+    ir_code = decode(frequency, frames[0])
+
+    assert isinstance(ir_code, decoder.RC5IRCode)
+    assert ir_code.protocol == 'RC5'
+    assert ir_code.system == system
+    assert ir_code.command == command
+    assert ir_code.data is None
+    assert not ir_code.repeat
+    assert str(ir_code) == 'RC5.%02X.%02X' % (system, command)
+
+
+@pytest.mark.parametrize('system', [0x00, 0x14, 0x1F])
+@pytest.mark.parametrize('command', [0x00, 0x2A, 0x40, 0x7F])
+@pytest.mark.parametrize('data', [0x00, 0x15, 0x3F])
+def test_rc5x_round_trip(system, command, data):
+    frequency, frames = encode(
+        '5001 0073 0000 0002 %04X %04X %04X' % (system, command, data)
+    )
+    ir_code = decode(frequency, frames[0])
+
+    assert isinstance(ir_code, decoder.RC5IRCode)
+    assert ir_code.protocol == 'RC5X'
+    assert ir_code.system == system
+    assert ir_code.command == command
+    assert ir_code.data == data
+    assert str(ir_code) == 'RC5X.%02X.%02X.%02X' % (system, command, data)
+
+
+@pytest.mark.parametrize(
+    'code',
+    [
+        '5000 0073 0000 0001 0005 0023',
+        '5001 0073 0000 0002 0005 0023 0011'
+    ]
+)
+def test_toggle_bit(code):
+    # the copies of a code sent in one go are a held button
+    frequency, frames = encode(code, repeat_count=3)
+    toggles = [decode(frequency, frame).toggle for frame in frames]
+
+    assert toggles == [1, 1, 1, 1]
+
+
+@pytest.mark.parametrize(
+    'code, name',
+    [
+        ('5000 0073 0000 0001 0005 0023', 'RC5.05.23'),
+        ('5001 0073 0000 0002 0005 0023 0011', 'RC5X.05.23.11')
+    ]
+)
+def test_repeat_is_held(code, name):
+    frequency, frames = encode(code, repeat_count=2)
+    now = [0.0]
+    tracker = hold.HoldTracker(clock=lambda: now[0])
+
+    names = []
+    for frame in frames:
+        names.append(str(decode(frequency, frame, tracker)))
+        # the next copy starts when this one and its gap are over
+        now[0] += sum(abs(timing) for timing in frame) / 1000000.0
+
+    assert names == [name, name + '.Held', name + '.Held']
+
+    # copies are sent once per RC5 frame period
+    period = sum(abs(timing) for timing in frames[0]) / 1000.0
+    assert period == pytest.approx(pronto.RC5_FRAME_TIME / 1000.0, abs=1)
+    assert period < decoder.RC5_TIMEOUT
+
+
+def test_toggle_tells_held_from_pressed():
+    frequency, frames = encode('5000 0073 0000 0001 0005 0023')
+    tracker = hold.HoldTracker(clock=lambda: 0.0)
+
+    first = decode(frequency, frames[0], tracker)
+    held = decode(frequency, frames[0], tracker)
+
+    # the remote flips the toggle bit when the button is pressed again
+    code = pronto._half_bits_to_timings(
+        [pronto._rc5_frame(0x05, 0x23, 0)],
+        900
+    )
+    pressed = decode(frequency, code, tracker)
+
+    assert not first.repeat
+    assert held.repeat
+    assert str(held) == 'RC5.05.23.Held'
+    assert not pressed.repeat
+    assert pressed.toggle != first.toggle
+
+
+def test_round_trip_with_jitter():
+    rnd = random.Random(0)
+
+    for system in range(32):
+        for command in range(0, 128, 7):
+            frequency, frames = encode(
+                '5000 0073 0000 0001 %04X %04X' % (system, command)
+            )
+            ir_code = decode(frequency, corpus.add_jitter(frames[0], 60, rnd))
+
+            assert isinstance(ir_code, decoder.RC5IRCode)
+            assert (ir_code.system, ir_code.command) == (system, command)
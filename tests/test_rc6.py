@@ -0,0 +1,130 @@
+# -*- coding: utf-8 -*-
+#
+# This file is part of EventGhost.
+# Copyright © 2005-2019 EventGhost Project <http://www.eventghost.org/>
+#
+# EventGhost is free software: you can redistribute it and/or modify it under
+# the terms of the GNU General Public License as published by the Free
+# Software Foundation, either version 2 of the License, or (at your option)
+# any later version.
+#
+# EventGhost is distributed in the hope that it will be useful, but WITHOUT
+# ANY WARRANTY; without even the implied warranty of MERCHANTABILITY or
+# FITNESS FOR A PARTICULAR PURPOSE. See the GNU General Public License for
+# more details.
+#
+# You should have received a copy of the GNU General Public License along
+# with EventGhost. If not, see <http://www.gnu.org/licenses/>.
+
+
+"""
+This file is part of the **pyWinMCERemote**
+project https://github.com/kdschlosser/pyWinMCERemote
+
+:platform: any
+:license: GPL version 2 or newer
+:synopsis: RC6 names and MCE toggle handling
+
+.. moduleauthor:: Kevin Schlosser @kdschlosser <kevin.g.schlosser@gmail.com>
+"""
+
+import pytest
+
+from pyWinMCERemote import decoder
+from pyWinMCERemote import hold
+from pyWinMCERemote import pronto
+
+from .helpers import decode
+from .helpers import encode
+
+
+def _rc6(device, command):
+    frequency, timings = pronto.pronto_to_mce(
+        '6000 0073 0000 0001 %04X %04X' % (device, command)
+    )
+    return frequency, list(timings)
+
+
+def _mce(command):
+    frequency, timings = pronto.pronto_to_mce(
+        '6001 0073 0000 0002 %04X %04X %04X 0000' % (
+            decoder.MCE_CODE,
+            command >> 8,
+            command & 0xFF
+        )
+    )
+    timings = list(timings)
+    # the RC6A encoder uses a 7 half bit leader, MCE remotes send 6
+    timings[0] = decoder.HEADER_MARK
+    return frequency, timings
+
+
+def test_legacy_names():
+    assert str(decode(*_rc6(0x04, 0x99))) == '04.99.'
+    assert str(decode(*_rc6(0x04, 0x00))) == '04.Number.0'
+
+    frequency, code = _rc6(0x04, 0x99)
+    ir_code = decoder.RC6IRCode(code, (3, 0, 0x04, 0x99, 16))
+    assert str(ir_code) == '%02X.04.99.'
+
+
+def test_names(monkeypatch):
+    monkeypatch.setattr(decoder, 'LEGACY_RC6_NAMES', False)
+
+    assert str(decode(*_rc6(0x04, 0x99))) == '04.99'
+    assert str(decode(*_rc6(0x04, 0x00))) == '04.Number.0'
+
+    frequency, code = _rc6(0x04, 0x99)
+    ir_code = decoder.RC6IRCode(code, (3, 0, 0x04, 0x99, 16))
+    assert str(ir_code) == '03.04.99'
+
+
+@pytest.mark.parametrize('toggle', [0, 1])
+def test_mce_toggle(toggle):
+    command = 0x0400 | (toggle << 15)
+    ir_code = decode(*_mce(command))
+
+    assert isinstance(ir_code, decoder.RC6IRCode)
+    assert ir_code.device == decoder.MCE_CODE
+    assert ir_code.toggle == toggle
+    assert ir_code.command == 0x0400
+    assert str(ir_code) == 'MCE.Number.0'
+
+
+def test_mce_held():
+    tracker = hold.HoldTracker(clock=lambda: 0.0)
+    frequency, code = _mce(0x8400)
+
+    first = decode(frequency, code, tracker)
+    held = decode(frequency, code, tracker)
+
+    assert not first.repeat
+    assert held.repeat
+    assert str(held) == 'MCE.Number.0.Held'
+    assert held.command == first.command
+
+
+@pytest.mark.parametrize(
+    'code, name',
+    [
+        ('6000 0073 0000 0001 0004 0099', '04.99.'),
+        ('6001 0073 0000 0002 800F 0084 0000 0000', 'MCE.Number.0')
+    ]
+)
+def test_repeat_is_held(code, name):
+    frequency, frames = encode(code, repeat_count=2)
+    now = [0.0]
+    tracker = hold.HoldTracker(clock=lambda: now[0])
+
+    names = []
+    for frame in frames:
+        names.append(str(decode(frequency, frame, tracker)))
+        # the next copy starts when this one and its gap are over
+        now[0] += sum(abs(timing) for timing in frame) / 1000000.0
+
+    assert names == [name, name + '.Held', name + '.Held']
+
+    # copies are sent once per RC6 frame period
+    period = sum(abs(timing) for timing in frames[0]) / 1000.0
+    assert period == pytest.approx(pronto.RC6_FRAME_TIME / 1000.0, abs=1)
+    assert period < decoder.RC6_TIMEOUT